@@ -0,0 +1,111 @@
+import sys
+sys.path.append("..")
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src_python.AsyncFetchEngine import AimdConcurrencyLimit, AsyncFetchEngine
+
+
+# Compare the former fixed ThreadPoolExecutor(max_workers=20) fetch (results collected in submission
+# order) with AsyncFetchEngine against a local fake data source.  The fake source serves `capacity`
+# requests at a time at `base_latency`; beyond that every extra request in flight slows all of them
+# down and beyond 1.5 x capacity requests start failing (as a rate-limited API would).  A few symbols
+# are pathologically slow.
+
+class FakeDataSource:
+    def __init__(self, capacity: int = 8, base_latency: float = 0.05, slow_ratio: float = 0.01, slow_latency: float = 1.0, seed: int = 0):
+        self.capacity = capacity
+        self.base_latency = base_latency
+        self.slow_ratio = slow_ratio
+        self.slow_latency = slow_latency
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.errors = 0
+
+    def fetch(self, symbol: str):
+        with self.lock:
+            self.in_flight += 1
+            in_flight = self.in_flight
+            is_slow = self.random.random() < self.slow_ratio
+            fails = in_flight > 1.5 * self.capacity and self.random.random() < 0.5
+        try:
+            overload = max(0, in_flight - self.capacity) / self.capacity
+            time.sleep((self.slow_latency if is_slow else self.base_latency) * (1.0 + 2.0 * overload))
+            if fails:
+                with self.lock:
+                    self.errors += 1
+                raise RuntimeError(f"429 Too Many Requests for {symbol}")
+            return symbol
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+def runFixedPool(source: FakeDataSource, symbols):
+    completed_at = {}
+    delivered_at = {}
+
+    def fetch(symbol):
+        try:
+            return source.fetch(symbol)
+        except Exception:
+            return None
+        finally:
+            completed_at[symbol] = time.time()
+
+    with ThreadPoolExecutor(max_workers=20) as executor:
+        futures = [executor.submit(fetch, symbol) for symbol in symbols]
+        results = []
+        for symbol, future in zip(symbols, futures):
+            results.append(future.result())
+            delivered_at[symbol] = time.time()
+    return results, completed_at, delivered_at
+
+
+def runEngine(source: FakeDataSource, symbols, deadline_seconds=None):
+    completed_at = {}
+    delivered_at = {}
+
+    def fetch(symbol):
+        try:
+            return source.fetch(symbol)
+        finally:
+            completed_at[symbol] = time.time()
+
+    engine = AsyncFetchEngine(fetch, limit=AimdConcurrencyLimit(initial=10, maximum=20))
+    results = engine.fetchAll([(symbol,) for symbol in symbols], deadline_seconds=deadline_seconds,
+                              on_result=lambda index, result: delivered_at.__setitem__(symbols[index], time.time()))
+    engine.shutdown()
+    return results, completed_at, delivered_at, engine.getStats()
+
+
+def report(name, start_time, results, completed_at, delivered_at, source, extra=""):
+    delays = [delivered_at[symbol] - completed_at[symbol] for symbol in delivered_at if symbol in completed_at]
+    print(f"{name:>24}: {time.time() - start_time:6.2f} s, {sum(result is not None for result in results)}/{len(results)} ok, "
+          f"{source.errors} source errors, delivery lag p50 {np.median(delays) * 1000:7.1f} ms / max {max(delays) * 1000:7.1f} ms {extra}")
+
+
+if __name__ == "__main__":
+    symbol_count = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    symbols = [f"S{i:04d}" for i in range(symbol_count)]
+    print(f"Fetching {symbol_count} fake symbols")
+
+    source = FakeDataSource()
+    start_time = time.time()
+    results, completed_at, delivered_at = runFixedPool(source, symbols)
+    report("fixed pool (20 threads)", start_time, results, completed_at, delivered_at, source)
+
+    source = FakeDataSource()
+    start_time = time.time()
+    results, completed_at, delivered_at, stats = runEngine(source, symbols)
+    report("AIMD engine", start_time, results, completed_at, delivered_at, source, f"final limit {stats['concurrency_limit']}")
+
+    source = FakeDataSource()
+    start_time = time.time()
+    results, completed_at, delivered_at, stats = runEngine(source, symbols, deadline_seconds=2.0)
+    report("AIMD engine, 2 s deadline", start_time, results, completed_at, delivered_at, source, f"{stats['timeouts']} abandoned")
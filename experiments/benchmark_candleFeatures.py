@@ -0,0 +1,84 @@
+import sys
+sys.path.append("..")
+import os
+import time
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from src_python.CandleFeatures import CandleFeatureStore
+from src_python.YfinanceCacheTools import (
+    getYfinanceCacheFolder,
+    listSymbolDirectories,
+    readLatestSymbolFrame,
+    sliceDateIndexedFrame,
+    toDateIndexedFrame,
+)
+
+
+# Compare the per-day metrics of ChaseHoundMain._fetchSymbolsData computed the former way
+# (slice, copy + 20-day rolling columns, true range twice, tail means / std) with lookups in
+# CandleFeatures precomputed once per symbol.  Default tunable parameters.
+
+SHORT_TERM_DAYS, TURNOVER_LONG_TERM_DAYS, ATR_LONG_TERM_DAYS, STD_LONG_TERM_DAYS = 5, 60, 20, 60
+
+
+def trueRange(df: pd.DataFrame) -> pd.Series:
+    prev_close = df["close"].shift(1)
+    return pd.concat([df["high"] - df["low"], (df["high"] - prev_close).abs(), (df["low"] - prev_close).abs()], axis=1).max(axis=1)
+
+
+def metricsBySlicing(frame: pd.DataFrame, from_date, to_date):
+    data = sliceDateIndexedFrame(frame, from_date, to_date).copy()
+    if len(data) == 0:
+        return None
+    data["volumeAvg20d"] = data["volume"].rolling(window=20).mean()
+    data["ma_20"] = data["close"].rolling(window=20).mean()
+    return (
+        data["turnover"].tail(SHORT_TERM_DAYS).mean(), data["turnover"].tail(TURNOVER_LONG_TERM_DAYS).mean(),
+        trueRange(data).tail(SHORT_TERM_DAYS).mean(), trueRange(data).tail(ATR_LONG_TERM_DAYS).mean(),
+        data["close"].tail(SHORT_TERM_DAYS).std(), data["close"].tail(STD_LONG_TERM_DAYS).std(),
+    )
+
+
+def metricsByFeatures(store: CandleFeatureStore, symbol: str, frame: pd.DataFrame, from_date, to_date):
+    features = store.getFeaturesOf(symbol, frame)
+    start, end = features.windowOf(from_date, to_date)
+    if end <= start:
+        return None
+    features.candlesOf(start, end)
+    return (
+        features.turnoverMean(start, end, SHORT_TERM_DAYS), features.turnoverMean(start, end, TURNOVER_LONG_TERM_DAYS),
+        features.atrMean(start, end, SHORT_TERM_DAYS), features.atrMean(start, end, ATR_LONG_TERM_DAYS),
+        features.closeStd(start, end, SHORT_TERM_DAYS), features.closeStd(start, end, STD_LONG_TERM_DAYS),
+    )
+
+
+if __name__ == "__main__":
+    cache_folder = getYfinanceCacheFolder()
+    symbols = listSymbolDirectories(cache_folder)
+    symbol_count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+
+    frames = {symbol: readLatestSymbolFrame(os.path.join(cache_folder, symbol)) for symbol in symbols[:symbol_count]}
+    frames = {symbol: toDateIndexedFrame(frame) for symbol, frame in frames.items() if frame is not None and len(frame) > 0 and "turnover" in frame.columns}
+    last_date = min(frame.index[-1] for frame in frames.values())
+    virtual_dates = [last_date - timedelta(days=i) for i in range(days)]
+    print(f"Benchmarking {len(frames)} symbols x {len(virtual_dates)} virtual dates")
+
+    results = {}
+    store = CandleFeatureStore()
+    for name, compute in [("slicing", lambda symbol, frame, f, t: metricsBySlicing(frame, f, t)),
+                          ("features", lambda symbol, frame, f, t: metricsByFeatures(store, symbol, frame, f, t))]:
+        start_time = time.time()
+        results[name] = [
+            compute(symbol, frame, virtual_date - timedelta(days=60), virtual_date - timedelta(days=1))
+            for virtual_date in virtual_dates for symbol, frame in frames.items()
+        ]
+        execution_time = time.time() - start_time
+        print(f"{name:>9}: {execution_time:.2f} seconds ({execution_time / len(results[name]) * 1e6:.1f} us per symbol and day)")
+
+    pairs = [(a, b) for a, b in zip(results["slicing"], results["features"]) if a is not None]
+    np.testing.assert_allclose(np.array([b for _, b in pairs], dtype=float), np.array([a for a, _ in pairs], dtype=float), rtol=1e-8, equal_nan=True)
+    print("metrics match")
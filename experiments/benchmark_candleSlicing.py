@@ -0,0 +1,65 @@
+import sys
+sys.path.append("..")
+import os
+import time
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from src_python.YfinanceCacheTools import (
+    getYfinanceCacheFolder,
+    listSymbolDirectories,
+    readLatestSymbolFrame,
+    sliceDateIndexedFrame,
+    toDateIndexedFrame,
+)
+
+
+# Compare the two ways of cutting the backtest window out of a cached symbol:
+# the former boolean masks on the "date" column and the binary search on the sorted DatetimeIndex.
+# Every symbol is cut once per virtual date, like ChaseHoundMain._fetchSymbolsData does.
+
+def extractWithMasks(from_date, to_date, cacheData: pd.DataFrame):
+    if cacheData["date"].min() <= from_date and cacheData["date"].max() >= to_date:
+        cacheData = cacheData[cacheData["date"] >= from_date]
+        cacheData = cacheData[cacheData["date"] <= to_date]
+        return cacheData
+    return None
+
+
+def extractWithSearchSorted(from_date, to_date, cacheData: pd.DataFrame):
+    if len(cacheData) > 0 and cacheData.index[0] <= from_date and cacheData.index[-1] >= to_date:
+        return sliceDateIndexedFrame(cacheData, from_date, to_date)
+    return None
+
+
+if __name__ == "__main__":
+    cache_folder = getYfinanceCacheFolder()
+    symbols = listSymbolDirectories(cache_folder)
+    symbol_count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+
+    frames = [readLatestSymbolFrame(os.path.join(cache_folder, symbol)) for symbol in symbols[:symbol_count]]
+    frames = [frame.reset_index(drop=True) for frame in frames if frame is not None and len(frame) > 0]
+    indexed_frames = [toDateIndexedFrame(frame) for frame in frames]
+
+    last_date = min(frame["date"].max() for frame in frames)
+    virtual_dates = [last_date - timedelta(days=i) for i in range(days)]
+    print(f"Benchmarking {len(frames)} symbols x {len(virtual_dates)} virtual dates "
+          f"({int(np.mean([len(frame) for frame in frames]))} rows per symbol on average)")
+
+    results = {}
+    for name, extract, candidates in [("boolean masks", extractWithMasks, frames), ("searchsorted", extractWithSearchSorted, indexed_frames)]:
+        start_time = time.time()
+        rows = 0
+        for virtual_date in virtual_dates:
+            for frame in candidates:
+                sliced = extract(virtual_date - timedelta(days=60), virtual_date - timedelta(days=1), frame)
+                rows += 0 if sliced is None else len(sliced)
+        execution_time = time.time() - start_time
+        results[name] = rows
+        calls = len(virtual_dates) * len(candidates)
+        print(f"{name:>14}: {execution_time:.2f} seconds for {calls} slices ({execution_time / calls * 1e6:.1f} us per slice, {rows} rows)")
+
+    assert len(set(results.values())) == 1, "both methods should return the same rows"
@@ -0,0 +1,115 @@
+import sys
+sys.path.append("..")
+import os
+import resource
+import subprocess
+import time
+from datetime import timedelta
+
+import numpy as np
+
+from src_python.CandleFeatures import CandleFeatureStore
+from src_python.ChaseHoundBase import ChaseHoundBase
+from src_python.ChaseHoundConfig import ChaseHoundConfig, ChaseHoundTunableParams
+from src_python.FilterBase import FilterBase
+from src_python.InvestmentTarget import InvestmentTarget
+from src_python.RightSideFilters import BreakOutDetectionFilter, StructureConfirmationFilter
+from src_python.YfinanceCacheTools import getYfinanceCacheFolder, listSymbolDirectories, readLatestSymbolFrame, toDateIndexedFrame
+
+
+# Memory of the targets of a day over the whole cached universe: the former
+# InvestmentTarget (a ChaseHoundBase with its logger, an instance dict and a copy of
+# its candle window) against the slotted one reading the shared CandleFeatures through
+# a CandleWindow.  Each representation runs in its own process, for its own peak RSS:
+# the days are run as the loop does, the targets of a day kept alive until the next.
+
+DAYS = 5
+
+
+class FormerInvestmentTarget(ChaseHoundBase):
+    # the InvestmentTarget before __slots__: logger set up by ChaseHoundBase, candles owned
+    def __init__(self, symbol, previousDayClosePrice, previousDayVolume, latestMarketCap, previousDayTurnover, candles,
+                 turnoverShortTerm=None, turnoverLongTerm=None, atrShortTerm=None, atrLongTerm=None, priceStdShortTerm=None, priceStdLongTerm=None):
+        super().__init__()
+        self.symbol = symbol
+        self.previousDayClosePrice = previousDayClosePrice
+        self.previousDayVolume = previousDayVolume
+        self.latestMarketCap = latestMarketCap
+        self.previousDayTurnover = previousDayTurnover
+        self.candles = candles
+        self.turnoverShortTerm = turnoverShortTerm
+        self.turnoverLongTerm = turnoverLongTerm
+        self.atrShortTerm = atrShortTerm
+        self.atrLongTerm = atrLongTerm
+        self.priceStdShortTerm = priceStdShortTerm
+        self.priceStdLongTerm = priceStdLongTerm
+        self.additional_info = {}
+
+    @property
+    def candleWindow(self):
+        return self.candles
+
+
+def currentRssMegabytes() -> float:
+    with open("/proc/self/statm") as file:
+        return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def peakRssMegabytes() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+
+
+def runDays(representation: str):
+    cache_folder = getYfinanceCacheFolder()
+    params = ChaseHoundTunableParams()
+    config = ChaseHoundConfig(tunableParams=params)
+    store = CandleFeatureStore()
+    frames = {symbol: readLatestSymbolFrame(os.path.join(cache_folder, symbol)) for symbol in listSymbolDirectories(cache_folder)}
+    frames = {symbol: toDateIndexedFrame(frame) for symbol, frame in frames.items() if frame is not None and len(frame) > 0}
+    features_of = {symbol: store.getFeaturesOf(symbol, frame) for symbol, frame in frames.items()}
+    last_date = min(frame.index[-1] for frame in frames.values())
+    virtual_dates = [last_date - timedelta(days=7 * day) for day in range(DAYS)]
+    right_side_filters = [BreakOutDetectionFilter(config), StructureConfirmationFilter(config)]
+
+    loaded_rss, loaded_peak = currentRssMegabytes(), peakRssMegabytes()
+    original_targets, held = [], []
+    start_time = time.time()
+    for virtual_date in virtual_dates:
+        original_targets = None
+        targets = []
+        for symbol, features in features_of.items():
+            start, end = features.windowOf(virtual_date - timedelta(days=params.lowest_avg_turnover_days * 3), virtual_date - timedelta(days=1))
+            if end <= start:
+                continue
+            metrics = dict(
+                turnoverShortTerm=features.turnoverMean(start, end, params.turnoverShortTermDays),
+                turnoverLongTerm=features.turnoverMean(start, end, params.turnoverLongTermDays),
+                atrShortTerm=features.atrMean(start, end, params.atrShortTermDays),
+                atrLongTerm=features.atrMean(start, end, params.atrLongTermDays),
+                priceStdShortTerm=features.closeStd(start, end, params.priceStdShortTermDays),
+                priceStdLongTerm=features.closeStd(start, end, params.priceStdLongTermDays),
+            )
+            prices = (features.close[end - 1], features.volume[end - 1], 1e9, features.turnover[end - 1])
+            if representation == "former":
+                targets.append(FormerInvestmentTarget(symbol, *prices, features.candlesOf(start, end), **metrics))
+            else:
+                targets.append(InvestmentTarget(symbol, *prices, candle_window=features.windowAt(start, end), **metrics))
+        original_targets = targets.copy()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for current in right_side_filters:
+                current.evaluate(FilterBase.tableOf(targets, current.COLUMNS))
+        held.append(currentRssMegabytes() - loaded_rss)
+    execution_time = time.time() - start_time
+    print(
+        f"{representation:>8}: {len(original_targets)} targets per day, {execution_time / DAYS:.2f} seconds per day, "
+        f"held by a day's targets {max(held):.1f} MB, peak RSS {peakRssMegabytes():.1f} MB "
+        f"(+{peakRssMegabytes() - loaded_peak:.1f} MB over the loaded cache, {loaded_peak:.1f} MB)"
+    )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        runDays(sys.argv[1])
+    else:
+        for representation in ("former", "slotted"):
+            subprocess.run([sys.executable, __file__, representation], check=True)
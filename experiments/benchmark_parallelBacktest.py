@@ -0,0 +1,61 @@
+import sys
+sys.path.append("..")
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from src_python.ChaseHoundConfig import ChaseHoundConfig, ChaseHoundTunableParams
+from src_python.CrossSectionalEngine import CrossSectionalEngine
+from src_python.DailyResultsWriter import DailyResultsWriter
+from src_python.ParallelBacktest import ParallelBacktest
+from src_python.YfinanceCacheTools import getYfinanceCacheFolder, listSymbolDirectories, readLatestSymbolFrame, toDateIndexedFrame
+
+
+# Wall time of the vectorized backtest over the cached universe, serially and across
+# 1, 2, 4, ... worker processes sharing the memory-mapped panel.  Business days stand in
+# for the market calendar.
+
+if __name__ == "__main__":
+    cache_folder = getYfinanceCacheFolder()
+    symbol_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    day_count = int(sys.argv[2]) if len(sys.argv) > 2 else 250
+    max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 1)
+
+    histories = {}
+    for symbol in listSymbolDirectories(cache_folder)[:symbol_count] + ["^SPX"]:
+        frame = readLatestSymbolFrame(os.path.join(cache_folder, symbol)) if os.path.isdir(os.path.join(cache_folder, symbol)) else None
+        if frame is not None and len(frame) > 0:
+            histories[symbol] = toDateIndexedFrame(frame)
+    universe = pd.DataFrame({"symbol": [symbol for symbol in histories if symbol != "^SPX"], "marketCap": 1e9})
+    last_date = max(frame.index[-1] for frame in histories.values())
+    calendar = pd.bdate_range(end=last_date, periods=day_count + 1)
+    virtual_dates = [date.to_pydatetime() for date in calendar[1:][::-1]]
+    previous_dates = [calendar[calendar < date][-1].to_pydatetime() for date in virtual_dates]
+    fill_performance = [True] * len(virtual_dates)
+
+    config = ChaseHoundConfig(tunableParams=ChaseHoundTunableParams())
+    start_time = time.time()
+    engine = CrossSectionalEngine(config, universe, histories)
+    print(f"Panel of {len(universe)} symbols built in {time.time() - start_time:.2f} seconds, {len(virtual_dates)} virtual dates")
+
+    results_folder = tempfile.mkdtemp()
+    try:
+        writer = DailyResultsWriter(results_folder)
+        start_time = time.time()
+        for day in engine.run(virtual_dates, previous_dates, fill_performance):
+            writer.writeDay(day)
+        serial_time = time.time() - start_time
+        print(f"   serial: {serial_time:.2f} seconds")
+
+        workers = 1
+        while workers <= max_workers:
+            start_time = time.time()
+            ParallelBacktest(engine, workers=workers).run(virtual_dates, previous_dates, fill_performance, results_folder)
+            execution_time = time.time() - start_time
+            print(f"{workers:>2} workers: {execution_time:.2f} seconds (x{serial_time / execution_time:.2f})")
+            workers *= 2
+    finally:
+        shutil.rmtree(results_folder)
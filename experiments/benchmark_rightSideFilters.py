@@ -0,0 +1,70 @@
+import sys
+sys.path.append("..")
+import os
+import time
+from datetime import timedelta
+
+import numpy as np
+
+from src_python.CandleFeatures import CandleFeatureStore
+from src_python.ChaseHoundConfig import ChaseHoundConfig, ChaseHoundTunableParams
+from src_python.FilterBase import FilterBase
+from src_python.InvestmentTarget import InvestmentTarget
+from src_python.RightSideFilters import BreakOutDetectionFilter, StructureConfirmationFilter
+from src_python.YfinanceCacheTools import getYfinanceCacheFolder, listSymbolDirectories, readLatestSymbolFrame, toDateIndexedFrame
+
+
+# Right-side filters over the whole cached universe for one virtual date: the former
+# iterrows loop, the per-target adapter (apply) and the batch mode (every lookback window
+# in one array).  Default tunable parameters, 60-day windows as in _fetchSymbolsData.
+
+def breakoutByRows(candles, params):
+    for index, raw in candles.iloc[-params.breakoutDetectionDaysLookback:].iterrows():
+        if (raw["close"] > raw["open"]
+                or (raw["close"] - raw["open"]) / raw["open"] >= params.breakoutDetectionPriceRatioThreshold
+                or raw["volume"] > raw["volumeAvg20d"] * params.breakoutDetectionVolumeAugmentationRatioThreshold):
+            return True
+    return False
+
+
+def structureByRows(candles, params):
+    for index, raw in candles.iloc[-params.structureConfirmationDaysLookback:].iterrows():
+        if raw["close"] < raw["ma_20"] * params.structureConfirmationMaTolerance:
+            return False
+    return True
+
+
+if __name__ == "__main__":
+    cache_folder = getYfinanceCacheFolder()
+    symbols = listSymbolDirectories(cache_folder)
+    symbol_count = int(sys.argv[1]) if len(sys.argv) > 1 else len(symbols)
+
+    params = ChaseHoundTunableParams()
+    config = ChaseHoundConfig(tunableParams=params)
+    store = CandleFeatureStore()
+    frames = {symbol: readLatestSymbolFrame(os.path.join(cache_folder, symbol)) for symbol in symbols[:symbol_count]}
+    frames = {symbol: toDateIndexedFrame(frame) for symbol, frame in frames.items() if frame is not None and len(frame) > 0}
+    virtual_date = min(frame.index[-1] for frame in frames.values())
+    targets = []
+    for symbol, frame in frames.items():
+        features = store.getFeaturesOf(symbol, frame)
+        start, end = features.windowOf(virtual_date - timedelta(days=params.lowest_avg_turnover_days * 3), virtual_date - timedelta(days=1))
+        if end > start:
+            targets.append(InvestmentTarget(symbol, 0.0, 0.0, 0.0, 0.0, features.candlesOf(start, end)))
+    print(f"Benchmarking {len(targets)} symbols on {virtual_date.strftime('%Y-%m-%d')}")
+
+    breakout_filter, structure_filter = BreakOutDetectionFilter(config), StructureConfirmationFilter(config)
+    results = {}
+    for name, compute in [
+        ("iterrows", lambda: [(breakoutByRows(target.candles, params), structureByRows(target.candles, params)) for target in targets]),
+        ("apply", lambda: [(breakout_filter.apply(target), structure_filter.apply(target)) for target in targets]),
+        ("batch", lambda: list(zip(*(current.evaluate(FilterBase.tableOf(targets, current.COLUMNS)) for current in (breakout_filter, structure_filter))))),
+    ]:
+        start_time = time.time()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            results[name] = [tuple(bool(flag) for flag in flags) for flags in compute()]
+        execution_time = time.time() - start_time
+        print(f"{name:>9}: {execution_time:.3f} seconds ({execution_time / len(targets) * 1e6:.1f} us per symbol)")
+
+    assert results["apply"] == results["iterrows"] and results["batch"] == results["iterrows"]
+    print(f"flags match ({sum(flags[0] for flags in results['batch'])} breakouts, {sum(flags[1] for flags in results['batch'])} confirmed structures)")
@@ -0,0 +1,48 @@
+import sys
+sys.path.append("..")
+import os
+import shutil
+import tempfile
+import time
+
+from src_python.CacheHandlable import CacheHandlable
+from src_python.YfinanceCacheTools import getYfinanceCacheFolder, listSymbolDirectories
+
+
+# Compare cold-load time and bytes on disk of the csv cache against its parquet / arrow copies.
+# The latest file of every symbol is copied into a temporary tree once per backend, then every
+# tree is loaded the way YfinanceHandler._loadCache does it.
+
+if __name__ == "__main__":
+    cache_folder = getYfinanceCacheFolder()
+    symbols = listSymbolDirectories(cache_folder)
+    if len(sys.argv) > 1:
+        symbols = symbols[: int(sys.argv[1])]
+
+    latest_files = []
+    for symbol in symbols:
+        files = sorted(f for f in os.listdir(os.path.join(cache_folder, symbol)) if f.endswith(".csv"))
+        if files:
+            latest_files.append(os.path.join(cache_folder, symbol, files[-1]))
+    print(f"Benchmarking {len(latest_files)} symbols")
+
+    work_dir = tempfile.mkdtemp(prefix="chasehound_cache_benchmark_")
+    try:
+        for extension in [".csv", ".parquet", ".arrow"]:
+            paths = []
+            for csv_path in latest_files:
+                data = CacheHandlable._readDataFrameFile(csv_path, date_columns=("date",))
+                path = os.path.join(work_dir, os.path.basename(csv_path)[: -len(".csv")] + extension)
+                CacheHandlable._writeDataFrameFile(path, data)
+                paths.append(path)
+            total_bytes = sum(os.path.getsize(path) for path in paths)
+
+            start_time = time.time()
+            rows = 0
+            for path in paths:
+                rows += len(CacheHandlable._readDataFrameFile(path, date_columns=("date",)))
+            execution_time = time.time() - start_time
+            print(f"{extension:>8}: {total_bytes / 1e6:8.1f} MB on disk, loaded {rows} rows in {execution_time:.2f} seconds "
+                  f"({execution_time / len(paths) * 1000:.2f} ms per symbol)")
+    finally:
+        shutil.rmtree(work_dir)
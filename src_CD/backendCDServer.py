@@ -24,6 +24,12 @@ import pandas as pd
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 
+from src_python.Submodules import updateSubmodules
+
+# the server process updates the submodules before importing the modules reading them
+# (not its spawned backtest workers, see updateSubmodules)
+updateSubmodules()
+
 from src_python.ChaseHoundConfig import ChaseHoundConfig, ChaseHoundTunableParams
 from src_python.ChaseHoundMain import ChaseHoundMain
 
@@ -98,6 +104,7 @@ def run_chasehound_sync(tunable_params: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "status": "completed",
         "execution_time": elapsed,
+        "from_cache": engine.didHitResultCache,
         "generated": datetime.utcnow().isoformat(),
         "results_count": sum(len(r.get("records", [])) for r in results),
         "results": results,
@@ -142,6 +149,7 @@ def run_chasehound():
         {
             "status": "completed",
             "execution_time": elapsed,
+            "from_cache": engine.didHitResultCache,
             "generated": datetime.utcnow().isoformat(),
             "results_count": sum(len(r.get("records", [])) for r in results),
             "results": results,
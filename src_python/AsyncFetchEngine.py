@@ -0,0 +1,186 @@
+from src_python.ChaseHoundBase import ChaseHoundBase
+from src_python.FetchPolicies import NegativeCache, RetryPolicy, TokenBucketRateLimiter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+import asyncio
+import threading
+import time
+
+
+class AimdConcurrencyLimit:
+    """Additive-increase / multiplicative-decrease limit on the number of requests in flight.
+
+    Every successful request whose latency stays within ``latency_tolerance`` times the
+    usual latency (an exponential moving average) raises the limit by ``1 / limit``, i.e.
+    by one per window of ``limit`` requests.  A failed request or a latency spike
+    multiplies it by ``decrease_factor``, at most once per usual latency so that a burst
+    of failures of requests sent together is counted once.
+    """
+
+    def __init__(self, initial: int = 10, minimum: int = 1, maximum: int = 20, latency_tolerance: float = 2.0, decrease_factor: float = 0.5):
+        assert 1 <= minimum <= initial <= maximum
+        self.limit: float = float(initial)
+        self.minimum: int = minimum
+        self.maximum: int = maximum
+        self.latency_tolerance: float = latency_tolerance
+        self.decrease_factor: float = decrease_factor
+        self.usual_latency: Optional[float] = None
+        self._last_decrease_time: float = float("-inf")
+
+    @property
+    def current(self) -> int:
+        return int(self.limit)
+
+    def onResult(self, latency: float, succeeded: bool, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        is_congested = not succeeded or (self.usual_latency is not None and latency > self.usual_latency * self.latency_tolerance)
+        if succeeded:
+            self.usual_latency = latency if self.usual_latency is None else 0.95 * self.usual_latency + 0.05 * latency
+
+        if is_congested:
+            if now - self._last_decrease_time >= (self.usual_latency or 0.0):
+                self.limit = max(float(self.minimum), self.limit * self.decrease_factor)
+                self._last_decrease_time = now
+        else:
+            self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+
+
+class AsyncFetchEngine(ChaseHoundBase):
+    """Runs blocking fetch calls from an asyncio loop under an adaptive concurrency limit.
+
+    ``fetch_function(*request)`` is executed in a thread pool (the TradingView client is
+    synchronous); it returns the data or raises.  A raised exception counts as an error
+    for the limit and the request is retried according to ``retry_policy``; once the
+    attempts are exhausted it yields None and its key (``negative_key(request)``) enters
+    the negative cache, which answers None for it without any call until the entry expires.
+    Every attempt first takes a token from ``rate_limiter``.  Results are delivered as
+    they complete, and requests still running when the per-batch deadline expires are
+    abandoned with None.
+    """
+
+    def __init__(
+        self,
+        fetch_function: Callable[..., Any],
+        limit: Optional[AimdConcurrencyLimit] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+        rate_limiter: Optional[TokenBucketRateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        negative_cache: Optional[NegativeCache] = None,
+        negative_key: Callable[[Tuple], Hashable] = lambda request: request,
+    ):
+        super().__init__()
+        self.fetch_function: Callable[..., Any] = fetch_function
+        self.limit: AimdConcurrencyLimit = limit or AimdConcurrencyLimit()
+        self._executor: ThreadPoolExecutor = executor or ThreadPoolExecutor(max_workers=self.limit.maximum)
+        self.rate_limiter: Optional[TokenBucketRateLimiter] = rate_limiter
+        self.retry_policy: RetryPolicy = retry_policy or RetryPolicy(max_attempts=1)
+        self.negative_cache: Optional[NegativeCache] = negative_cache
+        self.negative_key: Callable[[Tuple], Hashable] = negative_key
+        self.stats: Dict[str, float] = {"requests": 0, "attempts": 0, "retries": 0, "errors": 0, "timeouts": 0, "negative_cache_skips": 0, "total_latency": 0.0}
+
+    # MARK: - Public Methods
+
+    async def asCompleted(self, requests: Sequence[Tuple], deadline_seconds: Optional[float] = None) -> AsyncIterator[Tuple[int, Any]]:
+        """Yield ``(request_index, result)`` in completion order.
+
+        When *deadline_seconds* elapse, the requests not finished yet are yielded with None.
+        """
+        in_flight = 0
+        condition = asyncio.Condition()
+
+        async def attempt(request: Tuple) -> Tuple[bool, Any]:
+            nonlocal in_flight
+            if self.rate_limiter is not None:
+                await asyncio.sleep(self.rate_limiter.reserve())
+            async with condition:
+                await condition.wait_for(lambda: in_flight < self.limit.current)
+                in_flight += 1
+            start_time = time.monotonic()
+            succeeded, result = True, None
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(self._executor, self.fetch_function, *request)
+            except Exception:
+                succeeded = False
+            latency = time.monotonic() - start_time
+            async with condition:
+                in_flight -= 1
+                self.limit.onResult(latency, succeeded)
+                self.stats["attempts"] += 1
+                self.stats["total_latency"] += latency
+                condition.notify_all()
+            return succeeded, result
+
+        async def run(index: int, request: Tuple) -> Tuple[int, Any]:
+            self.stats["requests"] += 1
+            if self.negative_cache is not None and self.negative_cache.contains(self.negative_key(request)):
+                self.stats["negative_cache_skips"] += 1
+                return index, None
+            for attempt_number in range(self.retry_policy.max_attempts):
+                if attempt_number > 0:
+                    self.stats["retries"] += 1
+                    await asyncio.sleep(self.retry_policy.getDelay(attempt_number - 1))
+                succeeded, result = await attempt(request)
+                if succeeded:
+                    return index, result
+            self.stats["errors"] += 1
+            if self.negative_cache is not None:
+                self.negative_cache.add(self.negative_key(request))
+            return index, None
+
+        tasks = {asyncio.ensure_future(run(index, request)): index for index, request in enumerate(requests)}
+        pending = set(tasks)
+        deadline = None if deadline_seconds is None else time.monotonic() + deadline_seconds
+        try:
+            while pending:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+        finally:
+            # the blocking calls already started keep running in their threads, their results are dropped
+            for task in pending:
+                task.cancel()
+
+        self.stats["timeouts"] += len(pending)
+        if len(pending) > 0:
+            self.log_warning(f"Fetch deadline of {deadline_seconds}s reached, {len(pending)} of {len(tasks)} requests abandoned")
+        for task in sorted(pending, key=tasks.get):
+            yield tasks[task], None
+
+    def fetchAll(self, requests: Sequence[Tuple], deadline_seconds: Optional[float] = None, on_result: Optional[Callable[[int, Any], None]] = None) -> List[Any]:
+        """Blocking helper: results in request order, *on_result* is called as each one completes."""
+        async def collect() -> List[Any]:
+            results: List[Any] = [None] * len(requests)
+            async for index, result in self.asCompleted(requests, deadline_seconds):
+                results[index] = result
+                if on_result is not None:
+                    on_result(index, result)
+            return results
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(collect())
+        # called from inside a running event loop (e.g. the backend server): use a loop of our own in another thread
+        output: Dict[str, Any] = {}
+        thread = threading.Thread(target=lambda: output.update(results=asyncio.run(collect())))
+        thread.start()
+        thread.join()
+        return output["results"]
+
+    def getStats(self) -> Dict[str, Any]:
+        """Counters of the engine plus those of its rate limiter and negative cache."""
+        attempts = self.stats["attempts"]
+        stats: Dict[str, Any] = {key: value for key, value in self.stats.items() if key != "total_latency"}
+        stats["mean_latency"] = self.stats["total_latency"] / attempts if attempts else 0.0
+        stats["concurrency_limit"] = self.limit.current
+        if self.rate_limiter is not None:
+            stats["rate_limiter"] = self.rate_limiter.getStats()
+        if self.negative_cache is not None:
+            stats["negative_cache"] = self.negative_cache.getStats()
+        return stats
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait)
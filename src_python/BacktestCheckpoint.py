@@ -0,0 +1,105 @@
+from src_python.ChaseHoundBase import ChaseHoundBase
+from src_python.ChaseHoundConfig import ChaseHoundTunableParams
+from datetime import datetime
+from typing import Dict, List, Optional
+import hashlib
+import json
+import os
+
+
+class BacktestCheckpoint(ChaseHoundBase):
+    """Completed virtual dates of a backtest, so that a restarted run can skip them.
+
+    Stored as ``_checkpoint.json`` in the results folder (``temp``)::
+
+        {"runKey": <hash of the tunable params>, "dataSnapshot": <data version>,
+         "days": {"20250630": {"20250630_results.csv": {"size": ..., "sha1": ...}, ...}}}
+
+    A checkpoint can be resumed when it was written for the same parameters and the
+    cached data has not changed since its last completed day.  A day counts as done
+    only if every file recorded for it is still there, unchanged; a day interrupted
+    half-way is simply computed again (its files are overwritten).  The file is
+    replaced atomically after each day.
+    """
+
+    FILE_NAME: str = "_checkpoint.json"
+
+    def __init__(self, folder_path: str, run_key: str):
+        super().__init__()
+        self.folder_path: str = folder_path
+        self.run_key: str = run_key
+        self._days: Dict[str, Dict[str, Dict]] = {}
+        self._data_snapshot: Optional[str] = None
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.folder_path, BacktestCheckpoint.FILE_NAME)
+
+    @staticmethod
+    def hashParams(params: ChaseHoundTunableParams) -> str:
+        """Digest of every tunable parameter (dates included)."""
+        return params.canonicalHash()
+
+    # MARK: - Public Methods
+
+    def resume(self, data_snapshot: str) -> bool:
+        """Load the stored checkpoint; False (nothing loaded) if it belongs to another run or data snapshot."""
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                stored = json.load(file)
+        except (OSError, ValueError) as e:
+            self.log_warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return False
+        if stored.get("runKey") != self.run_key or stored.get("dataSnapshot") != data_snapshot:
+            return False
+        self._days = stored.get("days", {})
+        self._data_snapshot = data_snapshot
+        return True
+
+    def start(self, data_snapshot: str):
+        """Begin a new checkpoint (the results folder is expected to be empty)."""
+        self._days = {}
+        self._data_snapshot = data_snapshot
+        self._save()
+
+    def isDayComplete(self, virtual_date: datetime) -> bool:
+        files = self._days.get(BacktestCheckpoint._keyOf(virtual_date))
+        if files is None:
+            return False
+        for file_name, expected in files.items():
+            path = os.path.join(self.folder_path, file_name)
+            if not os.path.exists(path) or os.path.getsize(path) != expected["size"] or BacktestCheckpoint._sha1Of(path) != expected["sha1"]:
+                return False
+        return True
+
+    def markDayComplete(self, virtual_date: datetime, file_paths: List[str], data_snapshot: str):
+        """Record the files written for *virtual_date* (those which exist) and the data they were computed on."""
+        self._days[BacktestCheckpoint._keyOf(virtual_date)] = {
+            os.path.basename(path): {"size": os.path.getsize(path), "sha1": BacktestCheckpoint._sha1Of(path)}
+            for path in file_paths if os.path.exists(path)
+        }
+        self._data_snapshot = data_snapshot
+        self._save()
+
+    def getCompletedDayCount(self) -> int:
+        return len(self._days)
+
+    # MARK: - Private Methods
+
+    def _save(self):
+        os.makedirs(self.folder_path, exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"runKey": self.run_key, "dataSnapshot": self._data_snapshot, "days": self._days}, file, indent=2)
+        os.replace(temp_path, self.path)
+
+    @staticmethod
+    def _keyOf(virtual_date: datetime) -> str:
+        return virtual_date.strftime("%Y%m%d")
+
+    @staticmethod
+    def _sha1Of(path: str) -> str:
+        with open(path, "rb") as file:
+            return hashlib.sha1(file.read()).hexdigest()
@@ -2,12 +2,36 @@ from src_python.ChaseHoundBase import ChaseHoundBase
 import os
 import json
 from datetime import datetime
+import numpy as np
 import pandas as pd
 import pickle
-from typing import Optional
+from typing import Optional, Sequence
+
+# Optional columnar backend (Parquet / Arrow IPC)
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+    _HAS_PYARROW = True
+except ImportError:
+    pa = feather = pq = None
+    _HAS_PYARROW = False
+
 
 class CacheHandlable(ChaseHoundBase):
-    def __init__(self):
+    # MARK: - Class Properties
+    # extension used for each supported dataframe backend
+    CACHE_FORMAT_EXTENSIONS: dict = {
+        "csv": ".csv",
+        "parquet": ".parquet",
+        "arrow": ".arrow",
+    }
+    DATAFRAME_EXTENSIONS: tuple = (".csv", ".parquet", ".arrow")
+    # columns that can be stored as float32 / int64 without losing any value
+    FLOAT32_COLUMNS: tuple = ("open", "low", "high", "close")
+    INT64_COLUMNS: tuple = ("volume",)
+
+    def __init__(self, cache_format: Optional[str] = None):
         super().__init__()
         self.__cache_folder_path = os.path.join(self.project_root, "cache")
         if not os.path.exists(self.__cache_folder_path):
@@ -17,15 +41,24 @@ class CacheHandlable(ChaseHoundBase):
         if not os.path.exists(self.class_cache_folder_path):
             os.makedirs(self.class_cache_folder_path)
 
+        self.cache_format: str = self._resolveCacheFormat(cache_format)
+
+    @property
+    def cache_extension(self) -> str:
+        return CacheHandlable.CACHE_FORMAT_EXTENSIONS[self.cache_format]
+
     def _readFromCache(self, cache_key: str):
         cache_file_path = self._getCacheFilePath(cache_key)
+        if cache_key.endswith(".parquet") or cache_key.endswith(".arrow"):
+            return CacheHandlable._readDataFrameFile(cache_file_path)
+        if cache_key.endswith(".pkl"):
+            with open(cache_file_path, 'rb') as file:
+                return pickle.load(file)
         with open(cache_file_path, 'r', encoding='utf-8') as file:
             if cache_key.endswith(".json"):
                 return json.load(file)
             elif cache_key.endswith(".csv"):
                 return pd.read_csv(file)
-            elif cache_key.endswith(".pkl"):
-                return pickle.load(file)
             else:
                 self.logger.error(f"Unsupported cache file type: {cache_key}")
                 return None
@@ -34,8 +67,8 @@ class CacheHandlable(ChaseHoundBase):
         if os.path.exists(self._getCacheFilePath(cache_key)):
             os.remove(self._getCacheFilePath(cache_key))
 
-        if cache_key.endswith(".csv"):
-            cache_data.to_csv(self._getCacheFilePath(cache_key), index=False)
+        if cache_key.endswith(".csv") or cache_key.endswith(".parquet") or cache_key.endswith(".arrow"):
+            CacheHandlable._writeDataFrameFile(self._getCacheFilePath(cache_key), cache_data)
         elif cache_key.endswith(".json"):
             with open(self._getCacheFilePath(cache_key), 'w', encoding='utf-8') as file:
                 json.dump(cache_data, file)
@@ -78,3 +111,74 @@ class CacheHandlable(ChaseHoundBase):
         return self._getSavedTimeFromCacheName(cache_key1) < self._getSavedTimeFromCacheName(cache_key2)
     
     # MARK: - Private Methods
+
+    def _resolveCacheFormat(self, cache_format: Optional[str]) -> str:
+        """Pick the dataframe backend: the requested one, else arrow when pyarrow is installed, else csv."""
+        if cache_format is None:
+            cache_format = os.getenv("CHASEHOUND_CACHE_FORMAT", "arrow" if _HAS_PYARROW else "csv")
+        cache_format = cache_format.lower()
+        if cache_format not in CacheHandlable.CACHE_FORMAT_EXTENSIONS:
+            raise ValueError(f"Unsupported cache format: {cache_format}")
+        if cache_format != "csv" and not _HAS_PYARROW:
+            self.log_warning(f"pyarrow is not installed, falling back to csv cache instead of {cache_format}")
+            return "csv"
+        return cache_format
+
+    @staticmethod
+    def _readDataFrameFile(file_path: str, date_columns: Sequence[str] = ()) -> pd.DataFrame:
+        """Read a dataframe stored as csv / parquet / arrow, chosen by the file extension.
+
+        Columnar files keep their typed columns and native datetimes, so only csv
+        needs ``date_columns`` to be parsed.  Narrow float32 columns are widened
+        back to float64 so that downstream arithmetic is independent of the backend.
+        """
+        if file_path.endswith(".parquet"):
+            table = pq.read_table(file_path)
+        elif file_path.endswith(".arrow"):
+            table = feather.read_table(file_path)
+        else:
+            data = pd.read_csv(file_path)
+            for column in date_columns:
+                if column in data.columns:
+                    data[column] = pd.to_datetime(data[column])
+            return data
+
+        widened_schema = pa.schema([
+            pa.field(field.name, pa.float64() if field.type == pa.float32() else field.type)
+            for field in table.schema
+        ])
+        return table.cast(widened_schema).to_pandas()
+
+    @staticmethod
+    def _writeDataFrameFile(file_path: str, data: pd.DataFrame):
+        """Write *data* as csv / parquet / arrow, chosen by the file extension."""
+        extension = os.path.splitext(file_path)[1]
+        if extension == ".csv":
+            data.to_csv(file_path, index=False)
+            return
+
+        data = CacheHandlable._toColumnarDtypes(data.reset_index(drop=True))
+        if extension == ".parquet":
+            data.to_parquet(file_path, index=False, compression="zstd")
+        elif extension == ".arrow":
+            feather.write_feather(data, file_path, compression="zstd")
+        else:
+            raise ValueError(f"Unsupported dataframe file type: {file_path}")
+
+    @staticmethod
+    def _toColumnarDtypes(data: pd.DataFrame) -> pd.DataFrame:
+        """Narrow price columns to float32 and volume to int64 when it does not change any value."""
+        data = data.copy()
+        for column in CacheHandlable.FLOAT32_COLUMNS:
+            if column not in data.columns or data[column].dtype != np.float64:
+                continue
+            narrowed = data[column].to_numpy().astype(np.float32)
+            if np.array_equal(narrowed.astype(np.float64), data[column].to_numpy(), equal_nan=True):
+                data[column] = narrowed
+        for column in CacheHandlable.INT64_COLUMNS:
+            if column not in data.columns or data[column].dtype == np.int64:
+                continue
+            values = data[column].to_numpy()
+            if np.issubdtype(values.dtype, np.number) and np.all(np.isfinite(values)) and np.all(values == np.round(values)):
+                data[column] = values.astype(np.int64)
+        return data
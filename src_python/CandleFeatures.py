@@ -0,0 +1,202 @@
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+
+class CandleFeatures:
+    """Derived indicators of one symbol's whole candle history, computed once.
+
+    The daily loop used to slice the history of every symbol for every virtual date
+    and recompute turnover / ATR / close std tails and the 20-day rolling columns on
+    the slice.  Here they are computed over the full (date-indexed) history in a few
+    vectorised passes, so that the metrics of any window are O(1) lookups:
+
+    - means (turnover, true range) come from NaN-aware prefix sums,
+    - the close std of every ``k``-row window of the history is computed at once (two
+      passes over a sliding window view), once per distinct tail length ``k``: prefix
+      sums of squares, or pandas' running ``rolling(k).std()``, drift on flat stretches,
+    - the rolling columns (``volumeAvg20d``, ``ma_20``) are computed once and masked so
+      that a window sees them defined where a rolling on the window would be.
+
+    Every lookup is what the loop computed on ``candles.loc[from_date:to_date]``
+    (``tail(n)`` of a window shorter than ``n`` uses the whole window, the first true
+    range of a window has no previous close), up to the rounding of the prefix sums and
+    rolling means: they run from the first row of the history instead of the window's,
+    so means may differ from the slice-based ones in the last digits.
+    """
+
+    ROLLING_WINDOW: int = 20
+    # derived column -> source column, the 20-day averages the right-side filters read
+    ROLLING_COLUMNS: Dict[str, str] = {"volumeAvg20d": "volume", "ma_20": "close"}
+
+    def __init__(self, candles: pd.DataFrame):
+        """*candles* must be indexed by sorted, unique dates (see ``toDateIndexedFrame``)."""
+        self.candles: pd.DataFrame = candles
+        self.dates: np.ndarray = candles.index.to_numpy(dtype="datetime64[ns]")
+
+        self.close: np.ndarray = candles["close"].to_numpy(dtype=np.float64)
+        self.volume: np.ndarray = candles["volume"].to_numpy()
+        if "turnover" in candles.columns:
+            self.turnover: np.ndarray = candles["turnover"].to_numpy(dtype=np.float64)
+        else:
+            self.turnover = candles["volume"].to_numpy(dtype=np.float64) * self.close
+
+        high = candles["high"].to_numpy(dtype=np.float64)
+        low = candles["low"].to_numpy(dtype=np.float64)
+        previous_close = np.concatenate(([np.nan], self.close[:-1]))
+        # the true range of the first row of a window, which has no previous close
+        self.high_low_range: np.ndarray = high - low
+        with np.errstate(invalid="ignore"):
+            self.true_range: np.ndarray = np.fmax(np.fmax(self.high_low_range, np.abs(high - previous_close)), np.abs(low - previous_close))
+
+        self._turnover_sums: Tuple[np.ndarray, np.ndarray] = CandleFeatures.prefixSums(self.turnover)
+        self._true_range_sums: Tuple[np.ndarray, np.ndarray] = CandleFeatures.prefixSums(self.true_range)
+        self._close_stds: Dict[int, np.ndarray] = {}
+        # columns already present in the candles are used as they are, like the loop did
+        self._rolling_columns: Dict[str, np.ndarray] = {
+            column: candles[source].rolling(window=CandleFeatures.ROLLING_WINDOW).mean().to_numpy()
+            for column, source in CandleFeatures.ROLLING_COLUMNS.items()
+            if column not in candles.columns
+        }
+        # window frames are assembled from column arrays, much cheaper than copying and assigning to a slice
+        self._columns: Dict[str, np.ndarray] = {column: candles[column].to_numpy() for column in candles.columns}
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    # MARK: - Windows
+
+    def windowOf(self, from_date: datetime, to_date: datetime) -> Tuple[int, int]:
+        """Row range ``[start, end)`` of the candles on ``[from_date, to_date]`` (same bounds as ``sliceDateIndexedFrame``)."""
+        start = int(self.dates.searchsorted(np.datetime64(from_date, "ns"), side="left"))
+        end = int(self.dates.searchsorted(np.datetime64(to_date, "ns"), side="right"))
+        return start, end
+
+    def candlesOf(self, start: int, end: int) -> pd.DataFrame:
+        """The window's candles with the columns the right-side filters read (``volumeAvg20d``, ``ma_20``)."""
+        if len(self._rolling_columns) == 0:
+            return self.candles.iloc[start:end]
+        columns = {column: self.columnOf(column, start, end) for column in list(self._columns) + list(self._rolling_columns)}
+        return pd.DataFrame(columns, index=self.candles.index[start:end])
+
+    def columnOf(self, column: str, start: int, end: int) -> np.ndarray:
+        """``candlesOf(start, end)[column]``, a view of the history unless it is a rolling column."""
+        if column not in self._rolling_columns:
+            return self._columns[column][start:end]
+        # a rolling mean computed on the window is undefined on its first ROLLING_WINDOW - 1 rows
+        is_defined = np.arange(start, end) >= start + CandleFeatures.ROLLING_WINDOW - 1
+        return np.where(is_defined, self._rolling_columns[column][start:end], np.nan)
+
+    def windowAt(self, start: int, end: int) -> "CandleWindow":
+        return CandleWindow(self, start, end)
+
+    # MARK: - Metrics
+
+    def turnoverMean(self, start: int, end: int, n: int) -> float:
+        """``candles["turnover"].tail(n).mean()`` of the window."""
+        return CandleFeatures._windowMean(self._turnover_sums, max(start, end - n), end)
+
+    def atrMean(self, start: int, end: int, n: int) -> float:
+        """Mean of the last *n* true ranges of the window (the true range of the sliced candles, ``tail(n).mean()``)."""
+        tail_start = max(start, end - n)
+        sums, counts = self._true_range_sums
+        total = sums[end] - sums[tail_start]
+        count = counts[end] - counts[tail_start]
+        if tail_start == start and end > start:
+            # the first row of the window is ranged without the close preceding the window
+            for value, sign in ((self.true_range[start], -1), (self.high_low_range[start], 1)):
+                if not np.isnan(value):
+                    total += sign * value
+                    count += sign
+        return total / count if count > 0 else np.nan
+
+    def closeStd(self, start: int, end: int, n: int) -> float:
+        """``candles["close"].tail(n).std()`` of the window."""
+        k = min(n, end - start)
+        if k < 2:
+            return np.nan
+        if k not in self._close_stds:
+            self._close_stds[k] = CandleFeatures._rollingStds(self.close, k)
+        return self._close_stds[k][end - 1]
+
+    # MARK: - Helpers
+
+    @staticmethod
+    def prefixSums(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Running sums and counts of the non-NaN values along the last axis, starting with 0 (one more column)."""
+        is_valid = ~np.isnan(values)
+        zeros = np.zeros(values.shape[:-1] + (1,))
+        sums = np.concatenate((zeros, np.cumsum(np.where(is_valid, values, 0.0), axis=-1)), axis=-1)
+        counts = np.concatenate((zeros.astype(np.int64), np.cumsum(is_valid, axis=-1)), axis=-1)
+        return sums, counts
+
+    @staticmethod
+    def windowStds(windows: np.ndarray) -> np.ndarray:
+        """``Series.std()`` of each window along the last axis (NaN skipped): two-pass variance."""
+        is_valid = ~np.isnan(windows)
+        counts = is_valid.sum(axis=-1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(is_valid, windows, 0.0).sum(axis=-1) / counts
+            squares = np.where(is_valid, (means[..., None] - windows) ** 2, 0.0).sum(axis=-1)
+            return np.where(counts > 1, np.sqrt(squares / (counts - 1)), np.nan)
+
+    @staticmethod
+    def _rollingStds(values: np.ndarray, k: int) -> np.ndarray:
+        """``Series.std()`` of the *k* values ending at each row (NaN skipped, fewer at the start)."""
+        return CandleFeatures.windowStds(np.lib.stride_tricks.sliding_window_view(np.concatenate((np.full(k - 1, np.nan), values)), k))
+
+    @staticmethod
+    def _windowMean(prefix_sums: Tuple[np.ndarray, np.ndarray], start: int, end: int) -> float:
+        sums, counts = prefix_sums
+        count = counts[end] - counts[start]
+        return (sums[end] - sums[start]) / count if count > 0 else np.nan
+
+
+class CandleWindow:
+    """Rows ``[start, end)`` of a symbol's ``CandleFeatures``, without a frame of its own.
+
+    ``window[column]`` reads the column as ``candlesOf(start, end)[column]`` would;
+    ``toFrame`` builds that frame.
+    """
+
+    __slots__ = ("features", "start", "end")
+
+    def __init__(self, features: CandleFeatures, start: int, end: int):
+        self.features: CandleFeatures = features
+        self.start: int = start
+        self.end: int = end
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.features.columnOf(column, self.start, self.end)
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def toFrame(self) -> pd.DataFrame:
+        return self.features.candlesOf(self.start, self.end)
+
+
+class CandleFeatureStore:
+    """Symbol → ``CandleFeatures``, rebuilt only when the symbol's history frame changes.
+
+    The handler replaces a symbol's cached frame when fetched rows are merged into it
+    (or reloads it after an eviction), so the features are keyed by the frame object.
+    """
+
+    def __init__(self):
+        self._features: Dict[str, CandleFeatures] = {}
+        self.builds: int = 0
+
+    def getFeaturesOf(self, symbol: str, candles: Optional[pd.DataFrame]) -> Optional[CandleFeatures]:
+        if candles is None or len(candles) == 0:
+            return None
+        features = self._features.get(symbol)
+        if features is None or features.candles is not candles:
+            features = CandleFeatures(candles)
+            self._features[symbol] = features
+            self.builds += 1
+        return features
+
+    def clear(self):
+        self._features.clear()
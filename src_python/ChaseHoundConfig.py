@@ -1,5 +1,7 @@
 from src_python.ChaseHoundBase import ChaseHoundBase
 from datetime import datetime
+import hashlib
+import json
 
 class ChaseHoundTunableParams:
     def __init__(self):
@@ -39,6 +41,22 @@ class ChaseHoundTunableParams:
         self.structureConfirmationMaTolerance: float = 0.97
 
         self.bestTargetsN: int = 30
+
+    def toCanonicalDict(self) -> dict:
+        """Parameters with equal meanings mapped to equal values (``2`` / ``2.0``, ``"2024-07-01"`` / ``datetime``)."""
+        canonical = {}
+        for key, value in sorted(vars(self).items()):
+            if isinstance(value, datetime):
+                value = value.strftime("%Y-%m-%d") if value == datetime(value.year, value.month, value.day) else value.isoformat()
+            elif isinstance(value, float) and value.is_integer():
+                value = int(value)
+            canonical[key] = value
+        return canonical
+
+    def canonicalHash(self) -> str:
+        """Digest of ``toCanonicalDict``: equal for parameter sets producing the same backtest."""
+        payload = json.dumps(self.toCanonicalDict(), sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
         
 
 
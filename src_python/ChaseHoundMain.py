@@ -1,35 +1,30 @@
-# update submodules
-import shutil
-import subprocess
-import os
-import stat
-if os.path.exists("submodules"):
-    def _handle_remove_readonly(func, path, exc_info):
-        try:
-            os.chmod(path, stat.S_IWRITE)
-            func(path)
-        except Exception:
-            raise
-    shutil.rmtree("submodules", onerror=_handle_remove_readonly)
-os.makedirs("submodules", exist_ok=True)
-subprocess.run(["git", "clone", "--single-branch", "--branch", "main_lightweight", "--depth", "1", "https://github.com/huyuu/LLMTrader.git", "submodules/LLMTrader"])
-subprocess.run(["git", "clone", "--depth", "1", "https://github.com/rreichel3/US-Stock-Symbols.git", "submodules/us_stock_symbols"])
-
+# update submodules first: YfinanceHandler imports from the LLMTrader clone
+if __name__ == "__main__":
+    from src_python.Submodules import updateSubmodules
+    updateSubmodules()
 
 from src_python.ChaseHoundBase import ChaseHoundBase
 from src_python.ChaseHoundConfig import ChaseHoundConfig, ChaseHoundTunableParams
 from src_python.UsSymbolsHandler import UsSymbolsHandler
 from src_python.YfinanceHandler import YfinanceHandler
 from src_python.InvestmentTarget import InvestmentTarget
-from src_python.FoundamentalFilters import MarketGapFilter, TurnoverFilter, PriceFilter, LastReportDateFilter
-from src_python.VolatilityFilters import TurnoverSpikeFilter, AtrSpikeFilter, PriceStdSpikeFilter
-from src_python.RightSideFilters import BreakOutDetectionFilter, StructureConfirmationFilter
+from src_python.FilterPipeline import FilterPipeline, PipelineResult
+from src_python.FilterStages import buildFilterStages
+from src_python.CandleFeatures import CandleFeatureStore
 from src_python.PostAnalysis import PostAnalysis
+from src_python.DailyResultsWriter import DailyResultsWriter
+from src_python.CrossSectionalEngine import CrossSectionalEngine
+from src_python.ParallelBacktest import ParallelBacktest
+from src_python.BacktestCheckpoint import BacktestCheckpoint
+from src_python.ResultCache import ResultCache
+from src_python.DayArtifactStore import DayArtifactStore
 from typing import List, Optional
 import pandas as pd
-from time import sleep
 from datetime import timedelta, datetime
+import hashlib
 import os
+import shutil
+
 
 class ChaseHoundMain(ChaseHoundBase):
     def __init__(self, config: ChaseHoundConfig):
@@ -39,26 +34,27 @@ class ChaseHoundMain(ChaseHoundBase):
 
         self.usSymbolsHandler: UsSymbolsHandler = UsSymbolsHandler(config)
         self.yfinanceHandler: YfinanceHandler = YfinanceHandler()
+        # turnover / ATR / std / rolling columns of every symbol, computed once over its whole history
+        self.candleFeatureStore: CandleFeatureStore = CandleFeatureStore()
 
-        # fundamental filters
-        self.market_gap_filter: MarketGapFilter = MarketGapFilter(config)
-        self.turnover_filter: TurnoverFilter = TurnoverFilter(config)
-        self.price_filter: PriceFilter = PriceFilter(config)
-        self.last_report_date_filter: LastReportDateFilter = LastReportDateFilter(config)
-
-        # volatility filters
-        self.turnover_spike_filter: TurnoverSpikeFilter = TurnoverSpikeFilter(config)
-        self.atr_spike_filter: AtrSpikeFilter = AtrSpikeFilter(config)
-        self.price_std_spike_filter: PriceStdSpikeFilter = PriceStdSpikeFilter(config)
-
-        # right-side filters
-        self.breakout_detection_filter: BreakOutDetectionFilter = BreakOutDetectionFilter(config)
-        self.structure_confirmation_filter: StructureConfirmationFilter = StructureConfirmationFilter(config)
+        # the filter stages, by their droppedOutAtFilter names (see buildFilterStages)
+        self.filterPipeline: FilterPipeline = FilterPipeline(buildFilterStages(config))
 
         # post analysis
         self.postAnalysis: PostAnalysis = PostAnalysis(config)
+        # per-day csv files, shared by both backtest engines
+        self.resultsWriter: DailyResultsWriter = DailyResultsWriter()
+        # completed days of the run, for resuming an interrupted backtest (see _preprocessing)
+        self.checkpoint: BacktestCheckpoint = BacktestCheckpoint(ChaseHoundBase.temp_folder, BacktestCheckpoint.hashParams(config.tunableParams))
+        # whole outputs of previous runs, by parameters and data version
+        self.resultCache: ResultCache = ResultCache()
+        self.didHitResultCache: bool = False
 
         self._targets: List[InvestmentTarget] = []
+        # filtering of the day: drop-out stages, flags written for the exported targets only
+        self._filtering: Optional[PipelineResult] = None
+        # digest of the symbols universe, set by _preprocessing
+        self._universe_digest: str = ""
 
         # preprocessing
         if isinstance(self.config.tunableParams.start_date, str):
@@ -71,28 +67,52 @@ class ChaseHoundMain(ChaseHoundBase):
             self.end_date = self.config.tunableParams.end_date
 
 
-    def run(self, verbose: bool = False):
+    def run(self, verbose: bool = False, engine: Optional[str] = None, workers: Optional[int] = None):
+        """Backtest every market open date from ``end_date`` back to ``start_date``.
+
+        *engine* (default: ``CHASEHOUND_BACKTEST_ENGINE``, else ``"vectorized"``) selects
+        ``"vectorized"``, the cross-sectional engine writing the same csv files from the
+        cache secured by ``_preprocessing`` and reusing the per-day artifacts of earlier
+        runs (``DayArtifactStore``), or ``"loop"``, the day-by-day loop, which fetches
+        the candles missing from the cache but recomputes every day.  With more than one
+        of *workers* (default: ``CHASEHOUND_BACKTEST_WORKERS``, else 1) the vectorized
+        engine splits the dates across a process pool (``ParallelBacktest``).
+        """
+        engine = engine or os.environ.get("CHASEHOUND_BACKTEST_ENGINE", "vectorized")
+        assert engine in ("loop", "vectorized"), f"Unknown backtest engine: {engine}"
+
         self._preprocessing()
 
-        virtual_date = self.end_date
-        while virtual_date >= self.start_date:
+        # the same parameters on the same data: the stored outputs are copied to temp
+        if self._restoreCachedResults():
+            self.yfinanceHandler.shutdown()
+            return
+
+        if engine == "vectorized":
+            self._runVectorized(workers=workers or int(os.environ.get("CHASEHOUND_BACKTEST_WORKERS", "1")))
+        else:
+            self._runLoop()
+
+        self._postAnalysisForAllDays()
+        self._storeResultsInCache()
+
+        self.yfinanceHandler.shutdown()
+
+    def _runLoop(self):
+        for virtual_date in self._virtualDates():
+            if self.checkpoint.isDayComplete(virtual_date):
+                print(f"Skipping {virtual_date.strftime('%Y-%m-%d')}: already completed by a previous run")
+                continue
             # Stage 1: Initialize investment targets
             # Stage 1-1: Monitor symbols list
             self._targets: List[InvestmentTarget] = self._fetchSymbolsData(virtual_date=virtual_date)
             self._targets = self._preprocessAfterFetchingSymbolsData(self._targets)
             original_targets: List[InvestmentTarget] = self._targets.copy()
 
-            # Stage 2: Filter investment targets
-            # Stage 2-1: Filter with fundamental filters
-            self._targets = self._filterWithFoundamentalFilters(self._targets)
-            # Stage 2-2: Filter with volatility filters
-            self._targets = self._filterWithVolatilityFilters(self._targets)
-            # Stage 2-3: Filter with right-side filters
-            self._targets = self._filterWithRightSideFilters(self._targets)
-
-            # Stage 3: Filter with agents
-            # self._runVolumeProfileAgent(self._targets)
-
+            # Stage 2-3: Filter investment targets, through the stages of filterPipeline
+            print(f"Before filtering: {len(self._targets)} targets")
+            self._filtering = self.filterPipeline.run(self._targets)
+            self._targets = self._filtering.passed
 
             # stage 5-1: fill the recorded performance (if in close-loop-simulation mode)
             self._targets = self._fillRecordedPerformance(self._targets, virtual_date)
@@ -103,7 +123,10 @@ class ChaseHoundMain(ChaseHoundBase):
             # calculate the most n targets which have the highest currentDayPriceChangePercentage
             best_n_targets = self._calculateMostNTargets(all_targets, n=self.config.tunableParams.bestTargetsN)
 
-            # pass the best n targets through the filters and find out in which filter they dropped
+            # the filter flags of the exported targets, in the order the filters are declared
+            self._filtering.exportFlags(self._targets + best_n_targets)
+
+            # find out in which filter the best n targets dropped, as recorded by the filtering above
             best_n_targets_dropped_out_at = self._findTheFilterWhereItDroppedOut(best_n_targets)
 
             # stage 5-2: find and store sp500 avg. Sp500 could be retrieved by ^SPX symbol in yf
@@ -113,31 +136,101 @@ class ChaseHoundMain(ChaseHoundBase):
             self._printAndStoreResults([sp500_target], virtual_date, profix="sp500Avg")
             best_n_targets_df = self._printAndStoreResultsForBestNTargets(best_n_targets, virtual_date, best_n_targets_dropped_out_at, profix="bestTargetsOfTheDay")
             self._printAndStoreResultsForMainTargets(self._targets, virtual_date, best_n_targets_df, profix="results")
+            self._markDayComplete(virtual_date)
 
             self._postAnalysisForDay(virtual_date)
 
+    def _virtualDates(self):
+        virtual_date = self.end_date
+        while virtual_date is not None and virtual_date >= self.start_date:
+            yield virtual_date
             virtual_date = self.usSymbolsHandler.getPreviousMarketOpenDate(virtual_date)
-            
-        self._postAnalysisForAllDays()
 
-        self.yfinanceHandler.shutdown()
+    def _runVectorized(self, workers: int = 1):
+        nasdaq_symbols: pd.DataFrame = self.usSymbolsHandler.getNasdaqSymbols()
+        # only read if some day misses its stored artifacts
+        histories = lambda: {
+            symbol: self.yfinanceHandler.getCachedHistoryOf(symbol)
+            for symbol in nasdaq_symbols["symbol"].tolist() + [CrossSectionalEngine.INDEX_SYMBOL]
+        }
+        artifacts = None
+        if os.environ.get("CHASEHOUND_DAY_ARTIFACTS", "1") != "0":
+            artifacts = DayArtifactStore(self._dataSnapshot())
+            artifacts.prune()
+        engine = CrossSectionalEngine(self.config, nasdaq_symbols, histories, artifacts=artifacts)
+        virtual_dates = [virtual_date for virtual_date in self._virtualDates() if not self.checkpoint.isDayComplete(virtual_date)]
+        previous_market_dates = [self.usSymbolsHandler.getPreviousMarketOpenDate(virtual_date) for virtual_date in virtual_dates]
+        fill_performance = [not self.usSymbolsHandler.doesDateReferToPrediction(virtual_date) for virtual_date in virtual_dates]
+        if workers > 1:
+            ParallelBacktest(engine, workers=workers).run(
+                virtual_dates, previous_market_dates, fill_performance, self.resultsWriter.folder_path,
+                on_days_written=lambda summaries: [self._markDayComplete(summary["virtual_date"]) for summary in summaries],
+            )
+            # the plots read every file written so far: once all the days are written
+            if len(virtual_dates) > 0:
+                self._postAnalysisForDay(virtual_dates[-1])
+        else:
+            for day in engine.run(virtual_dates, previous_market_dates, fill_performance):
+                self.resultsWriter.writeDay(day)
+                self._markDayComplete(day.virtual_date)
+                self._postAnalysisForDay(day.virtual_date)
 
     def _preprocessing(self):
-        # set up temp folder
-        if os.path.exists(ChaseHoundBase.temp_folder):
-            shutil.rmtree(ChaseHoundBase.temp_folder)
-        os.makedirs(ChaseHoundBase.temp_folder, exist_ok=True)
-
         nasdaq_symbols: pd.DataFrame = self.usSymbolsHandler.getNasdaqSymbols()
         retrieve_end_date = self.end_date + timedelta(days=min(7, (self.absolute_current_date_in_eastern - self.start_date).days))
-        # secure cache
+        # secure cache, from the window of the first day (the vectorized engine does not fetch)
+        lookback_days = int(self.config.tunableParams.lowest_avg_turnover_days) * 3
         self.yfinanceHandler.loadFromRamOrAsyncFetchHistoryPricesOf(
             nasdaq_symbols["symbol"].tolist() + ["^SPX"], 
-            self.start_date - timedelta(days=7), 
+            self.start_date - timedelta(days=lookback_days + 7), 
             retrieve_end_date, 
             "1d"
         )
 
+        universe = nasdaq_symbols[["symbol", "marketCap"]].to_csv(index=False)
+        self._universe_digest = hashlib.sha256(universe.encode("utf-8")).hexdigest()[:16]
+
+        # set up temp folder, kept if it holds the checkpoint of the same run on the same data
+        # (CHASEHOUND_BACKTEST_RESUME=0 always starts over)
+        should_resume = os.environ.get("CHASEHOUND_BACKTEST_RESUME", "1") != "0"
+        if should_resume and self.checkpoint.resume(self._dataSnapshot()):
+            print(f"Resuming the backtest: {self.checkpoint.getCompletedDayCount()} days already completed")
+            return
+        if os.path.exists(ChaseHoundBase.temp_folder):
+            shutil.rmtree(ChaseHoundBase.temp_folder)
+        os.makedirs(ChaseHoundBase.temp_folder, exist_ok=True)
+        self.checkpoint.start(self._dataSnapshot())
+
+    def _dataSnapshot(self) -> str:
+        # the cached candles and the symbols universe the results are computed from
+        return f"{self.yfinanceHandler.getDataVersion()}-{self._universe_digest}"
+
+    def _markDayComplete(self, virtual_date: datetime):
+        self.checkpoint.markDayComplete(virtual_date, self.resultsWriter.pathsOfDay(virtual_date), self._dataSnapshot())
+
+    def _restoreCachedResults(self) -> bool:
+        self.didHitResultCache = self._isResultCacheEnabled() and self.resultCache.restore(
+            ResultCache.keyOf(self.config.tunableParams, self._dataSnapshot()), ChaseHoundBase.temp_folder
+        )
+        if self.didHitResultCache:
+            print("Same parameters and data as a cached run: results restored from the result cache")
+        return self.didHitResultCache
+
+    def _storeResultsInCache(self):
+        if not self._isResultCacheEnabled():
+            return
+        # keyed by the data at the end of the run (the loop may have fetched), which a repeated request finds
+        data_snapshot = self._dataSnapshot()
+        self.resultCache.put(
+            ResultCache.keyOf(self.config.tunableParams, data_snapshot),
+            ChaseHoundBase.temp_folder,
+            metadata={"params": self.config.tunableParams.toCanonicalDict(), "dataSnapshot": data_snapshot},
+        )
+
+    def _isResultCacheEnabled(self) -> bool:
+        # CHASEHOUND_RESULT_CACHE=0 always runs the backtest
+        return os.environ.get("CHASEHOUND_RESULT_CACHE", "1") != "0"
+
     def _fetchSymbolsData(self, virtual_date: datetime) -> List[InvestmentTarget]:
         # 1-1. Fetch NASDAQ symbols list
         nasdaq_symbols: pd.DataFrame = self.usSymbolsHandler.getNasdaqSymbols()
@@ -166,60 +259,10 @@ class ChaseHoundMain(ChaseHoundBase):
             if data is None or data.empty:
                 continue
 
-            # Add derived columns required by RightSide filters
-            data_enhanced = self._enhance_candle_dataframe(data)
-
-            # Calculate volatility-related metrics
-            # Turnover metrics
-            turnoverShortTerm = turnoverLongTerm = atrShortTerm = atrLongTerm = priceStdShortTerm = priceStdLongTerm = None
-            assert all(
-                hasattr(self.config.tunableParams, attr)
-                for attr in [
-                    "turnoverShortTermDays",
-                    "turnoverLongTermDays",
-                    "turnoverSpikeThreshold",
-                ]
-            )
-
-            turnoverShortTerm = data_enhanced["turnover"].tail(self.config.tunableParams.turnoverShortTermDays).mean()
-            turnoverLongTerm = data_enhanced["turnover"].tail(self.config.tunableParams.turnoverLongTermDays).mean()
-
-            # ATR metrics
-            assert all(
-                hasattr(self.config.tunableParams, attr)
-                for attr in ["atrShortTermDays", "atrLongTermDays", "atrSpikeThreshold"]
-            )
-            atrShortTerm = self._calculate_true_range(data_enhanced).tail(self.config.tunableParams.atrShortTermDays).mean()
-            atrLongTerm = self._calculate_true_range(data_enhanced).tail(self.config.tunableParams.atrLongTermDays).mean()
-
-            # Price Std metrics
-            assert all(
-                hasattr(self.config.tunableParams, attr)
-                for attr in [
-                    "priceStdShortTermDays",
-                    "priceStdLongTermDays",
-                    "priceStdSpikeThreshold",
-                ]
-            )
-            priceStdShortTerm = data_enhanced["close"].tail(self.config.tunableParams.priceStdShortTermDays).std()
-            priceStdLongTerm = data_enhanced["close"].tail(self.config.tunableParams.priceStdLongTermDays).std()
-
-            target = InvestmentTarget(
-                symbol=symbol,
-                previousDayClosePrice=data_enhanced.iloc[-1]["close"],
-                previousDayVolume=data_enhanced.iloc[-1]["volume"],
-                latestMarketCap=marketCap,
-                previousDayTurnover=data_enhanced.iloc[-1]["turnover"],
-                candles=data_enhanced,
-                turnoverShortTerm=turnoverShortTerm,
-                turnoverLongTerm=turnoverLongTerm,
-                atrShortTerm=atrShortTerm,
-                atrLongTerm=atrLongTerm,
-                priceStdShortTerm=priceStdShortTerm,
-                priceStdLongTerm=priceStdLongTerm,
-            )
-
-            investment_targets.append(target)
+            # metrics are looked up in the features precomputed over the symbol's whole history
+            target = self._buildInvestmentTarget(symbol, marketCap, earliest_date, virtual_date - timedelta(days=1))
+            if target is not None:
+                investment_targets.append(target)
 
         return investment_targets
 
@@ -227,69 +270,47 @@ class ChaseHoundMain(ChaseHoundBase):
     # Private helper methods
     # ------------------------------------------------------------------
 
-    def _enhance_candle_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Ajoute les colonnes nécessaires pour les filtres Right-Side."""
-        df = df.copy()
-        if "volumeAvg20d" not in df.columns:
-            df["volumeAvg20d"] = df["volume"].rolling(window=20).mean()
-        if "ma_20" not in df.columns:
-            df["ma_20"] = df["close"].rolling(window=20).mean()
-        return df
-
-    @staticmethod
-    def _calculate_true_range(df: pd.DataFrame) -> pd.Series:
-        prev_close = df["close"].shift(1)
-        tr = pd.concat(
-            [
-                df["high"] - df["low"],
-                (df["high"] - prev_close).abs(),
-                (df["low"] - prev_close).abs(),
-            ],
-            axis=1,
-        ).max(axis=1)
-        return tr
-
-        
-    def _filterWithFoundamentalFilters(self, targets: List[InvestmentTarget]) -> List[InvestmentTarget]:
-        # market gap, turnover, price, last_report_date, 
-        print(f"Before filtering: {len(targets)} targets")
-        filtered_targets = list(filter(self.market_gap_filter.apply, targets))
-        print(f"After market gap filter: {len(filtered_targets)} targets")
-        filtered_targets = list(filter(self.turnover_filter.apply, filtered_targets))
-        print(f"After turnover filter: {len(filtered_targets)} targets")
-        filtered_targets = list(filter(self.price_filter.apply, filtered_targets))
-        print(f"After price filter: {len(filtered_targets)} targets")
-        filtered_targets = list(filter(self.last_report_date_filter.apply, filtered_targets))
-        print(f"After last report date filter: {len(filtered_targets)} targets")
-        return filtered_targets
-
-
-    def _filterWithVolatilityFilters(self, targets: List[InvestmentTarget]) -> List[InvestmentTarget]:
-        assert self.config.tunableParams.volatilityFiltersPassingThreshold is not None
-        print(f"Before volatility filters: {len(targets)} targets")
-        result_targets = []
-        for target in targets:
-            turnoverSpikeDetected = self.turnover_spike_filter.apply(target)
-            atrSpikeDetected = self.atr_spike_filter.apply(target)
-            priceStdSpikeDetected = self.price_std_spike_filter.apply(target)
-            if sum([turnoverSpikeDetected, atrSpikeDetected, priceStdSpikeDetected]) >= self.config.tunableParams.volatilityFiltersPassingThreshold:
-                result_targets.append(target)
-        print(f"After volatility filters: {len(result_targets)} targets")
-        return result_targets
-
-
-    def _filterWithRightSideFilters(self, targets: List[InvestmentTarget]) -> List[InvestmentTarget]:
-        print(f"Before right-side filters: {len(targets)} targets")
-        filtered_targets = list(filter(self.breakout_detection_filter.apply, targets))
-        print(f"After breakout detection filter: {len(filtered_targets)} targets")
-        filtered_targets = list(filter(self.structure_confirmation_filter.apply, filtered_targets))
-        print(f"After structure confirmation filter: {len(filtered_targets)} targets")
-        return filtered_targets
+    def _buildInvestmentTarget(self, symbol: str, marketCap: float, from_date: datetime, to_date: datetime) -> Optional[InvestmentTarget]:
+        """Target of *symbol* with the volatility metrics of its candles on ``[from_date, to_date]``.
 
-        
-    def _filterWithSignalLayers(self, targets: List[InvestmentTarget]) -> List[InvestmentTarget]:
-        print(f"Before signal layers: {len(targets)} targets")
-        return targets
+        Same values as computing them with pandas on the sliced candles (20-day rolling
+        averages, true range, ``tail(n).mean()`` / ``std()``), read from ``CandleFeatures``.
+        """
+        features = self.candleFeatureStore.getFeaturesOf(symbol, self.yfinanceHandler.getCachedHistoryOf(symbol))
+        if features is None:
+            return None
+        start, end = features.windowOf(from_date, to_date)
+        if end <= start:
+            return None
+
+        assert all(
+            hasattr(self.config.tunableParams, attr)
+            for attr in [
+                "turnoverShortTermDays",
+                "turnoverLongTermDays",
+                "atrShortTermDays",
+                "atrLongTermDays",
+                "priceStdShortTermDays",
+                "priceStdLongTermDays",
+            ]
+        )
+        params = self.config.tunableParams
+        previous_day = end - 1
+        return InvestmentTarget(
+            symbol=symbol,
+            previousDayClosePrice=features.close[previous_day],
+            previousDayVolume=features.volume[previous_day],
+            latestMarketCap=marketCap,
+            previousDayTurnover=features.turnover[previous_day],
+            # the shared candles of the symbol, read through the window
+            candle_window=features.windowAt(start, end),
+            turnoverShortTerm=features.turnoverMean(start, end, params.turnoverShortTermDays),
+            turnoverLongTerm=features.turnoverMean(start, end, params.turnoverLongTermDays),
+            atrShortTerm=features.atrMean(start, end, params.atrShortTermDays),
+            atrLongTerm=features.atrMean(start, end, params.atrLongTermDays),
+            priceStdShortTerm=features.closeStd(start, end, params.priceStdShortTermDays),
+            priceStdLongTerm=features.closeStd(start, end, params.priceStdLongTermDays),
+        )
 
     def _fillRecordedPerformance(self, targets: List[InvestmentTarget], virtual_date: datetime) -> List[InvestmentTarget]:
         # skip this step if in close-loop-simulation mode
@@ -320,55 +341,16 @@ class ChaseHoundMain(ChaseHoundBase):
 
 
     def _printAndStoreResults(self, targets: List[InvestmentTarget], virtual_date: datetime, profix: str = "") -> pd.DataFrame:
-        # store targets to csv
-        result_df = pd.DataFrame()
-        for target in targets:
-            result_df = pd.concat([result_df, target.to_series().to_frame().T], ignore_index=True, axis=0)
-        if len(result_df) == 0:
-            return result_df
-        # sort by currentDayPriceChangePercentage
-        result_df = result_df.sort_values(by="currentDayPriceChangePercentage", ascending=False)
-        # add turnover ranking for the existing symbols
-        # result_df["turnoverRanking"] = result_df["previousDayTurnover"].rank(method="first", ascending=False)
-        path = os.path.join(self.project_root, "temp", f"{virtual_date.strftime('%Y%m%d')}_{profix}.csv")
-        
-        result_df.to_csv(path, index=False)
-        return result_df
+        # store targets to csv, sorted by currentDayPriceChangePercentage
+        return self.resultsWriter.writeResults([target.to_series() for target in targets], virtual_date, profix=profix)
 
     def _printAndStoreResultsForMainTargets(self, targets: List[InvestmentTarget], virtual_date: datetime, best_n_targets: pd.DataFrame, profix: str = "") -> pd.DataFrame:
-        # store targets to csv
-        result_df = pd.DataFrame()
-        for target in targets:
-            result_df = pd.concat([result_df, target.to_series().to_frame().T], ignore_index=True, axis=0)
-        if len(result_df) == 0:
-            return result_df
-        # sort by currentDayPriceChangePercentage
-        result_df = result_df.sort_values(by="currentDayPriceChangePercentage", ascending=False)
-        # add turnover ranking for the existing symbols
-        # result_df["turnoverRanking"] = result_df["previousDayTurnover"].rank(method="first", ascending=False)
-        # add isInBestNTargets
-        result_df["isInBestNTargets"] = result_df["symbol"].isin(best_n_targets["symbol"].tolist()).astype(bool)
-
-        path = os.path.join(self.project_root, "temp", f"{virtual_date.strftime('%Y%m%d')}_{profix}.csv")
-        result_df.to_csv(path, index=False)
-        return result_df
+        # store targets to csv, with isInBestNTargets
+        return self.resultsWriter.writeMainResults([target.to_series() for target in targets], virtual_date, best_n_targets, profix=profix)
 
     def _printAndStoreResultsForBestNTargets(self, targets: List[InvestmentTarget], virtual_date: datetime, dropped_out_at: List[str], profix: str = "") -> pd.DataFrame:
-        # store targets to csv
-        result_df = pd.DataFrame()
-        for target in targets:
-            result_df = pd.concat([result_df, target.to_series().to_frame().T], ignore_index=True, axis=0)
-        if len(result_df) == 0:
-            return result_df
-        # sort by currentDayPriceChangePercentage
-        result_df = result_df.sort_values(by="currentDayPriceChangePercentage", ascending=False)
-        # add turnover ranking for the existing symbols
-        # result_df["turnoverRanking"] = result_df["previousDayTurnover"].rank(method="first", ascending=False)
-        # add droppedOutAtFilter
-        result_df["droppedOutAtFilter"] = dropped_out_at
-        path = os.path.join(self.project_root, "temp", f"{virtual_date.strftime('%Y%m%d')}_{profix}.csv")
-        result_df.to_csv(path, index=False)
-        return result_df
+        # store targets to csv, with droppedOutAtFilter
+        return self.resultsWriter.writeBestNResults([target.to_series() for target in targets], virtual_date, dropped_out_at, profix=profix)
 
     def _postAnalysisForDay(self, virtual_date: datetime):
         self.postAnalysis.plotDistribution()
@@ -400,60 +382,34 @@ class ChaseHoundMain(ChaseHoundBase):
             shouldAbandonFetching=False
         )
         data = history_prices_list[0] if history_prices_list else None
+        # When data is unavailable, return a minimal placeholder to avoid
+        # breaking the caller.  Down-stream code will simply skip empty
+        # targets.
+        placeholder_target = InvestmentTarget(
+            symbol=symbol,
+            previousDayClosePrice=float("nan"),
+            previousDayVolume=float("nan"),
+            latestMarketCap=float("nan"),
+            previousDayTurnover=float("nan"),
+            candles=pd.DataFrame(),
+        )
         if data is None or data.empty:
             print(f"No data found for {symbol} at {virtual_date}")
-            # When data is unavailable, return a minimal placeholder to avoid
-            # breaking the caller.  Down-stream code will simply skip empty
-            # targets.
-            return InvestmentTarget(
-                symbol=symbol,
-                previousDayClosePrice=float("nan"),
-                previousDayVolume=float("nan"),
-                latestMarketCap=float("nan"),
-                previousDayTurnover=float("nan"),
-                candles=pd.DataFrame(),
-            )
+            return placeholder_target
 
         # ------------------------------------------------------------------
-        # 2. Enhance dataframe and compute metrics (turnover / ATR / price std)
+        # 2. Metrics (turnover / ATR / price std) from the precomputed features
         # ------------------------------------------------------------------
-        data_enhanced = self._enhance_candle_dataframe(data)
-
-        turnoverShortTerm = data_enhanced["turnover"].tail(
-            self.config.tunableParams.turnoverShortTermDays
-        ).mean()
-        turnoverLongTerm = data_enhanced["turnover"].tail(
-            self.config.tunableParams.turnoverLongTermDays
-        ).mean()
-
-        atr_series = self._calculate_true_range(data_enhanced)
-        atrShortTerm = atr_series.tail(self.config.tunableParams.atrShortTermDays).mean()
-        atrLongTerm = atr_series.tail(self.config.tunableParams.atrLongTermDays).mean()
-
-        priceStdShortTerm = data_enhanced["close"].tail(
-            self.config.tunableParams.priceStdShortTermDays
-        ).std()
-        priceStdLongTerm = data_enhanced["close"].tail(
-            self.config.tunableParams.priceStdLongTermDays
-        ).std()
-
-        # Previous-day snapshot (last row of the enhanced dataframe)
-        prev_candle = data_enhanced.iloc[-1]
-
-        sp500_target = InvestmentTarget(
-            symbol=symbol,
-            previousDayClosePrice=prev_candle["close"],
-            previousDayVolume=prev_candle["volume"],
-            latestMarketCap=float("nan"),  # not applicable for an index
-            previousDayTurnover=prev_candle["turnover"],
-            candles=data_enhanced,
-            turnoverShortTerm=turnoverShortTerm,
-            turnoverLongTerm=turnoverLongTerm,
-            atrShortTerm=atrShortTerm,
-            atrLongTerm=atrLongTerm,
-            priceStdShortTerm=priceStdShortTerm,
-            priceStdLongTerm=priceStdLongTerm,
+        sp500_target = self._buildInvestmentTarget(
+            symbol,
+            float("nan"),  # not applicable for an index
+            earliest_date,
+            virtual_date - timedelta(days=1),
         )
+        if sp500_target is None:
+            # the fetched candles are not in the cached history the features are built on
+            print(f"No cached candles for {symbol} at {virtual_date}")
+            return placeholder_target
 
         # ------------------------------------------------------------------
         # 3. Fill same-day performance metrics and store to CSV
@@ -470,57 +426,19 @@ class ChaseHoundMain(ChaseHoundBase):
     def _findTheFilterWhereItDroppedOut(self, targets: List[InvestmentTarget]) -> List[str]:
         """Determine at which filter stage each *target* was discarded.
 
-        The function sequentially re-applies all filters (fundamental →
-        volatility → right-side).  For every *target*, the first filter that
-        rejects it is recorded and returned.  If a target passes all filters,
-        the string ``"passed_all_filters"`` is returned instead.
+        Looks up the first failing stage recorded for every target of the day by
+        ``filterPipeline``; ``"passedAllFilters"`` if it passed them all.
 
         Side-effect: the result is also stored in
         ``target.additional_info["droppedOutAtFilter"]`` so that the
         information gets exported alongside other metrics when the target is
         converted to a ``pd.Series``.
         """
-
         dropped_out_list: List[str] = []
-
-        # ------------------------------------------------------------------
-        # Re-use the existing *batch* filter helpers to locate the stage where
-        # each target has been eliminated.  We compare the target lists after
-        # every stage to identify the first filter group that discarded it.
-        # ------------------------------------------------------------------
-
-        # 1. Initialise the reason map with the optimistic outcome
-        reason_map = {t.symbol: "passedAllFilters" for t in targets}
-
-        # 2. Fundamental filters ------------------------------------------------
-        after_foundamental = self._filterWithFoundamentalFilters(targets)
         for t in targets:
-            if t not in after_foundamental:
-                reason_map[t.symbol] = "foundamentalFilters"
-
-        # 3. Volatility filters -------------------------------------------------
-        after_volatility = self._filterWithVolatilityFilters(after_foundamental)
-        for t in after_foundamental:
-            if t not in after_volatility and reason_map[t.symbol] == "passedAllFilters":
-                reason_map[t.symbol] = "volatilityFilters"
-
-        # 4. Right-side filters --------------------------------------------------
-        after_right_side = self._filterWithRightSideFilters(after_volatility)
-        for t in after_volatility:
-            if t not in after_right_side and reason_map[t.symbol] == "passedAllFilters":
-                reason_map[t.symbol] = "rightSideFilters"
-
-        # 5. Signal layers (currently a pass-through, but kept for completeness)
-        after_signal_layers = self._filterWithSignalLayers(after_right_side)
-        for t in after_right_side:
-            if t not in after_signal_layers and reason_map[t.symbol] == "passedAllFilters":
-                reason_map[t.symbol] = "signalLayers"
-
-        # 6. Persist result on each target and build output list
-        for t in targets:
-            t.additional_info["droppedOutAtFilter"] = reason_map[t.symbol]
-            dropped_out_list.append(reason_map[t.symbol])
-
+            reason = self._filtering.droppedOutAt(t)
+            t.additional_info["droppedOutAtFilter"] = reason
+            dropped_out_list.append(reason)
         return dropped_out_list
 
     def _preprocessAfterFetchingSymbolsData(self, targets: List[InvestmentTarget]) -> List[InvestmentTarget]:
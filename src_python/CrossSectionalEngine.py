@@ -0,0 +1,565 @@
+from src_python.ChaseHoundBase import ChaseHoundBase
+from src_python.ChaseHoundConfig import ChaseHoundConfig, ChaseHoundTunableParams
+from src_python.YfinanceCacheTools import toDateIndexedFrame
+from src_python.DayArtifactStore import DayArtifactStore
+from src_python.CandleFeatures import CandleFeatures
+from src_python.FilterBase import FilterBase
+from src_python.FilterPipeline import FilterPipeline
+from src_python.FilterStages import buildFilterStages
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+
+
+class CrossSectionalDay:
+    """Rows of the three CSV files of one virtual date, as ``ChaseHoundMain.run`` builds them."""
+
+    def __init__(self, virtual_date: datetime, index_rows: List[pd.Series], best_rows: List[pd.Series], best_dropped_out_at: List[str], main_rows: List[pd.Series]):
+        self.virtual_date: datetime = virtual_date
+        # ^SPX  -> <date>_sp500Avg.csv
+        self.index_rows: List[pd.Series] = index_rows
+        # best n of the day -> <date>_bestTargetsOfTheDay.csv
+        self.best_rows: List[pd.Series] = best_rows
+        self.best_dropped_out_at: List[str] = best_dropped_out_at
+        # targets passing every filter -> <date>_results.csv
+        self.main_rows: List[pd.Series] = main_rows
+
+
+class CrossSectionalEngine(ChaseHoundBase):
+    """Vectorised alternative to the day-by-day loop of ``ChaseHoundMain.run``.
+
+    The candles of the whole universe (plus the index) are laid out once as
+    (symbols × rows) arrays, each symbol on its own trading rows, with a
+    (symbols × calendar dates) table of how many rows every symbol has before each
+    date.  The metrics of ``_fetchSymbolsData`` are then computed for all symbols
+    and a block of virtual dates at once, as ``CandleFeatures`` computes them:
+
+    - the window of a day (``[vd - 3 * lowest_avg_turnover_days, vd - 1]``) and its
+      ``tail(n)`` are row ranges read from the table,
+    - turnover / ATR means are differences of prefix sums over the whole history, the
+      close std a two-pass std of each tail, the 20-day averages rolled once over the
+      whole history.
+
+    The filters are those of the loop (``buildFilterStages``), evaluated with their
+    batch ``evaluate`` on a table of the (dates × symbols) cells; the filters reading
+    the candles get a ``PanelWindow`` per cell.  The stages, their dependencies and
+    the flags recorded for a target follow ``FilterPipeline`` / ``FilterScheduler``.
+    Only the rows of the CSV files (best n, targets passing every filter, index) are
+    built in Python, with the keys in the order the loop inserts them.
+
+    The files are the loop's up to the rounding of the running sums (see
+    ``CandleFeatures``).  Unlike the loop nothing is fetched: symbols whose cached
+    candles do not cover a day's window are skipped, as the loop does when the fetch
+    brings nothing new, so the cache should be secured first
+    (``ChaseHoundMain._preprocessing``).  Ties and NaN values in the turnover ranking
+    and the best n are ordered by a stable sort.
+
+    With a ``DayArtifactStore`` the per-day results of the two expensive stages (the
+    metrics table of every symbol, the flags of the filters reading the candles) are
+    stored and reused by later runs whose parameters only differ downstream; the
+    panel is only built if a day misses one of them.
+    """
+
+    INDEX_SYMBOL: str = "^SPX"
+    PERFORMANCE_KEYS: List[str] = [
+        "currentDayOpenPrice", "currentDayHighPrice", "currentDayLowPrice", "currentDayClosePrice",
+        "currentDayPriceChange", "currentDayPriceChangePercentage", "openingGapInPercentage",
+    ]
+    # virtual dates evaluated together, bounds the (dates × symbols) arrays
+    DAYS_PER_BLOCK: int = 64
+    # (dates × symbols) cells gathered together, bounds the (cells × rows) matrices of the tails
+    CELLS_PER_GATHER: int = 16384
+    # read-only arrays independent of the tunable parameters, shared by ``share`` / ``openShared``
+    SHARED_ARRAYS: List[str] = [
+        "calendar", "first_dates", "last_dates", "rows_before", "volume_is_integer",
+        "open", "high", "low", "close", "volume", "turnover", "high_low_range", "true_range",
+        "turnover_sums", "turnover_counts", "true_range_sums", "true_range_counts",
+    ] + list(CandleFeatures.ROLLING_COLUMNS)
+
+    def __init__(
+        self,
+        config: ChaseHoundConfig,
+        universe: pd.DataFrame,
+        histories: Union[Dict[str, Optional[pd.DataFrame]], Callable[[], Dict[str, Optional[pd.DataFrame]]]],
+        index_symbol: str = INDEX_SYMBOL,
+        artifacts: Optional[DayArtifactStore] = None,
+    ):
+        """
+        Args:
+            universe: ``symbol`` and ``marketCap`` columns, in the order of ``UsSymbolsHandler.getNasdaqSymbols``.
+            histories: whole cached candles of each symbol (``YfinanceHandler.getCachedHistoryOf``),
+                or a function returning them, only called when the panel is needed.
+            artifacts: per-day stage results to reuse and store.
+        """
+        super().__init__()
+        self._configure(config)
+        self.index_symbol: str = index_symbol
+        self.symbols: List[str] = universe["symbol"].tolist() + [index_symbol]
+        self.market_caps: List[float] = universe["marketCap"].tolist() + [float("nan")]
+        self.universe_size: int = len(self.symbols) - 1
+        self.artifacts: Optional[DayArtifactStore] = artifacts
+        self._histories = histories
+        self._is_panel_loaded: bool = False
+
+    # MARK: - Sharing
+
+    def share(self, folder_path: str):
+        """Write the panel and its parameter-independent features to *folder_path* (one ``.npy`` per array).
+
+        Written to a sibling folder and swapped in, like ``PricePanelStore.build``.
+        """
+        self._ensurePanel()
+        temp_folder_path = folder_path + ".tmp"
+        if os.path.exists(temp_folder_path):
+            shutil.rmtree(temp_folder_path)
+        os.makedirs(temp_folder_path)
+        for name in CrossSectionalEngine.SHARED_ARRAYS:
+            np.save(os.path.join(temp_folder_path, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(temp_folder_path, "index.json"), "w", encoding="utf-8") as file:
+            json.dump({"symbols": self.symbols, "marketCaps": self.market_caps, "indexSymbol": self.index_symbol}, file)
+        if os.path.exists(folder_path):
+            shutil.rmtree(folder_path)
+        os.replace(temp_folder_path, folder_path)
+
+    @classmethod
+    def openShared(cls, folder_path: str, config: ChaseHoundConfig, artifacts: Optional[DayArtifactStore] = None) -> "CrossSectionalEngine":
+        """Engine over a panel written by ``share``, memory-mapped read-only.
+
+        Processes opening the same folder share the pages of the panel.
+        """
+        engine = cls.__new__(cls)
+        ChaseHoundBase.__init__(engine)
+        engine._configure(config)
+        engine.artifacts = artifacts
+        with open(os.path.join(folder_path, "index.json"), "r", encoding="utf-8") as file:
+            index = json.load(file)
+        engine.symbols, engine.market_caps, engine.index_symbol = index["symbols"], index["marketCaps"], index["indexSymbol"]
+        engine.universe_size = len(engine.symbols) - 1
+        for name in CrossSectionalEngine.SHARED_ARRAYS:
+            setattr(engine, name, np.load(os.path.join(folder_path, f"{name}.npy"), mmap_mode="r"))
+        engine._histories = None
+        engine._is_panel_loaded = True
+        return engine
+
+    # MARK: - Public Methods
+
+    def run(self, virtual_dates: List[datetime], previous_market_dates: List[Optional[datetime]], fill_performance: List[bool]) -> Iterator[CrossSectionalDay]:
+        """Yield the rows of each virtual date, in the given order.
+
+        Args:
+            previous_market_dates: ``UsSymbolsHandler.getPreviousMarketOpenDate`` of each date.
+            fill_performance: False for the dates referring to a prediction (no recorded performance).
+        """
+        for block_start in range(0, len(virtual_dates), CrossSectionalEngine.DAYS_PER_BLOCK):
+            block = slice(block_start, block_start + CrossSectionalEngine.DAYS_PER_BLOCK)
+            days = self.evaluate(virtual_dates[block], previous_market_dates[block], fill_performance[block])
+            for t, virtual_date in enumerate(virtual_dates[block]):
+                yield self._buildDay(days, t, virtual_date)
+
+    def evaluate(
+        self,
+        virtual_dates: List[datetime],
+        previous_market_dates: List[Optional[datetime]],
+        fill_performance: List[bool],
+        stage_results: Optional[Dict[str, Dict[str, np.ndarray]]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Metrics, flags and performance of every (virtual date, symbol), as (dates × symbols) arrays.
+
+        Args:
+            stage_results: results of the stages on these same dates, by stage and parameters
+                (see ``DayArtifactStore.stageParamsOf``); filled with those evaluated here.
+        """
+        days: Dict[str, np.ndarray] = {}
+        for stage, evaluate in (("metrics", self._evaluateMetrics), ("rightSide", self._evaluateRightSide)):
+            key = json.dumps([stage, DayArtifactStore.stageParamsOf(stage, self.config.tunableParams)], sort_keys=True)
+            if stage_results is not None and key in stage_results:
+                days.update(stage_results[key])
+                continue
+            arrays = self._evaluateStage(stage, evaluate, virtual_dates, previous_market_dates, fill_performance)
+            if stage_results is not None:
+                stage_results[key] = arrays
+            days.update(arrays)
+        self._applyFilters(days)
+        return days
+
+    def setTunableParams(self, params: ChaseHoundTunableParams):
+        """Evaluate the following dates with *params*, on the same panel."""
+        self._configure(ChaseHoundConfig(tunableParams=params))
+
+    def columnOf(self, column: str, i: int, start: int, end: int) -> np.ndarray:
+        """Column of the candles of symbol *i* on rows ``[start, end)``, as ``CandleFeatures.columnOf`` reads it."""
+        if column not in CandleFeatures.ROLLING_COLUMNS:
+            return getattr(self, column)[i, start:end]
+        # a rolling mean computed on the window is undefined on its first ROLLING_WINDOW - 1 rows
+        is_defined = np.arange(start, end) >= start + CandleFeatures.ROLLING_WINDOW - 1
+        return np.where(is_defined, getattr(self, column)[i, start:end], np.nan)
+
+    # MARK: - Stages
+
+    def _evaluateStage(self, stage: str, evaluate, virtual_dates: List[datetime], previous_market_dates: List[Optional[datetime]], fill_performance: List[bool]) -> Dict[str, np.ndarray]:
+        """Arrays of one stage, read from the artifacts of the days stored by earlier runs and evaluated for the others.
+
+        Days referring to a prediction are never stored: their performance is not recorded yet.
+        """
+        if self.artifacts is None:
+            return evaluate(virtual_dates, previous_market_dates, fill_performance)
+        params = self.config.tunableParams
+        rows: List[Optional[Dict[str, np.ndarray]]] = [
+            self.artifacts.load(stage, params, virtual_date) if should_store else None
+            for virtual_date, should_store in zip(virtual_dates, fill_performance)
+        ]
+        missing = [t for t, row in enumerate(rows) if row is None]
+        if missing:
+            evaluated = evaluate([virtual_dates[t] for t in missing], [previous_market_dates[t] for t in missing], [fill_performance[t] for t in missing])
+            for k, t in enumerate(missing):
+                rows[t] = {key: values[k] for key, values in evaluated.items()}
+                if fill_performance[t]:
+                    self.artifacts.save(stage, params, virtual_dates[t], rows[t])
+        return {key: np.stack([row[key] for row in rows]) for key in rows[0]}
+
+    def _evaluateMetrics(self, virtual_dates: List[datetime], previous_market_dates: List[Optional[datetime]], fill_performance: List[bool]) -> Dict[str, np.ndarray]:
+        """The table of ``_fetchSymbolsData`` (previous day values, volatility metrics) and the day's performance."""
+        self._ensurePanel()
+        params = self.config.tunableParams
+        start, end = self._windowsOf(virtual_dates)
+        symbol_index = np.arange(len(self.symbols))[None, :]
+        previous_day = np.maximum(end - 1, 0)
+
+        days: Dict[str, np.ndarray] = {}
+        days["included"] = self._covers(*self._windowDatesOf(virtual_dates)) & (end > start)
+        days["previousDayClosePrice"] = self.close[symbol_index, previous_day]
+        days["previousDayTurnover"] = self.turnover[symbol_index, previous_day]
+        days["previousDayVolume"] = self.volume[symbol_index, previous_day]
+        days["volumeIsInteger"] = np.broadcast_to(self.volume_is_integer[None, :], start.shape)
+        days["turnoverShortTerm"] = self._turnoverMean(start, end, params.turnoverShortTermDays)
+        days["turnoverLongTerm"] = self._turnoverMean(start, end, params.turnoverLongTermDays)
+        days["atrShortTerm"] = self._atrMean(start, end, params.atrShortTermDays)
+        days["atrLongTerm"] = self._atrMean(start, end, params.atrLongTermDays)
+        days["priceStdShortTerm"] = self._closeStd(start, end, params.priceStdShortTermDays)
+        days["priceStdLongTerm"] = self._closeStd(start, end, params.priceStdLongTermDays)
+        self._evaluatePerformance(days, virtual_dates, previous_market_dates, fill_performance)
+        return days
+
+    def _evaluateRightSide(self, virtual_dates: List[datetime], previous_market_dates: List[Optional[datetime]], fill_performance: List[bool]) -> Dict[str, np.ndarray]:
+        """Flags of the filters reading the candles (the right-side filters), on the window of every cell."""
+        self._ensurePanel()
+        start, end = self._windowsOf(virtual_dates)
+        cells = np.flatnonzero(self._covers(*self._windowDatesOf(virtual_dates)) & (end > start))
+        windows = np.empty(len(cells), dtype=object)
+        for row, (i, first_row, end_row) in enumerate(zip((cells % len(self.symbols)).tolist(), start.flat[cells].tolist(), end.flat[cells].tolist())):
+            windows[row] = PanelWindow(self, i, first_row, end_row)
+        flags: Dict[str, np.ndarray] = {}
+        for current in self._candleFilters():
+            flags[current.FLAG] = np.zeros(start.shape, dtype=bool)
+            flags[current.FLAG].flat[cells] = current.evaluate({"candles": windows})
+        return flags
+
+    def _applyFilters(self, days: Dict[str, np.ndarray]):
+        """The filters of every stage, the stage each target reaches and drops out at, performance ratios."""
+        shape = days["included"].shape
+        with np.errstate(invalid="ignore", divide="ignore"):
+            days["turnoverRatio"] = days["turnoverShortTerm"] / days["turnoverLongTerm"]
+            days["atrRatio"] = days["atrShortTerm"] / days["atrLongTerm"]
+            days["priceStdRatio"] = days["priceStdShortTerm"] / days["priceStdLongTerm"]
+
+            days["currentDayPriceChange"] = days["currentDayClosePrice"] - days["previousDayClosePrice"]
+            days["currentDayPriceChangePercentage"] = days["currentDayPriceChange"] / days["previousDayClosePrice"]
+            # same expression as the loop (the division binds first)
+            days["openingGapInPercentage"] = days["currentDayOpenPrice"] - days["previousDayClosePrice"] / days["previousDayClosePrice"]
+
+        # the filters not evaluated by a stage of their own, on the cells of the loop's targets
+        cells = np.flatnonzero(days["included"])
+        for stage in self.filterPipeline.stages:
+            for current in stage.filters:
+                if current.FLAG in days:
+                    continue
+                days[current.FLAG] = np.zeros(shape, dtype=bool)
+                days[current.FLAG].flat[cells] = current.evaluate(self._tableOf(days, current.COLUMNS, cells))
+
+        # as FilterPipeline.run: a stage is run on the targets passing its dependencies, a target
+        # drops out at the first stage it reaches and fails
+        stages = self.filterPipeline.stages
+        passed: Dict[str, np.ndarray] = {}
+        dropped_out_stage = np.full(shape, len(stages), dtype=np.int8)
+        for index, stage in enumerate(stages):
+            reached = np.ones(shape, dtype=bool)
+            for name in stage.depends_on:
+                reached &= passed[name]
+            required_passes = len(stage.filters) if stage.required_passes is None else stage.required_passes
+            passes = np.zeros(shape, dtype=np.int64)
+            for current in stage.filters:
+                passes += days[current.FLAG]
+            passed[stage.name] = reached & (passes >= required_passes)
+            dropped_out_stage[reached & ~passed[stage.name] & (dropped_out_stage == len(stages))] = index
+            days[CrossSectionalEngine._reachedKeyOf(stage.name)] = reached
+        # index into the stage names, len(stages) for the targets passing every stage
+        days["droppedOutStage"] = dropped_out_stage
+        days["passedAllFilters"] = dropped_out_stage == len(stages)
+
+    def _tableOf(self, days: Dict[str, np.ndarray], columns: List[str], cells: np.ndarray) -> Dict[str, np.ndarray]:
+        """``FilterBase.tableOf`` of the targets at *cells* (flat indices of the (dates × symbols) arrays)."""
+        symbols = cells % len(self.symbols)
+        table: Dict[str, np.ndarray] = {}
+        for column in columns:
+            if column == "symbol":
+                table[column] = np.asarray(self.symbols)[symbols]
+            elif column == "latestMarketCap":
+                table[column] = np.asarray(self.market_caps, dtype=np.float64)[symbols]
+            else:
+                table[column] = days[column].flat[cells]
+        return table
+
+    def _candleFilters(self) -> List[FilterBase]:
+        return [current for stage in self.filterPipeline.stages for current in stage.filters if "candles" in current.COLUMNS]
+
+    def _configure(self, config: ChaseHoundConfig):
+        self.config: ChaseHoundConfig = config
+        # the loop's filters, bound to the parameters (only their stages and evaluate are used)
+        self.filterPipeline: FilterPipeline = FilterPipeline(buildFilterStages(config))
+        self._drop_out_stages: List[str] = self.filterPipeline.getDropOutStages()
+
+    @staticmethod
+    def _reachedKeyOf(stage_name: str) -> str:
+        return f"reached:{stage_name}"
+
+    # MARK: - Panel
+
+    def _ensurePanel(self):
+        if self._is_panel_loaded:
+            return
+        histories = self._histories() if callable(self._histories) else self._histories
+        self._loadPanel([histories.get(symbol) for symbol in self.symbols])
+        self._precomputePanelFeatures()
+        self._histories = None
+        self._is_panel_loaded = True
+
+    def _loadPanel(self, histories: List[Optional[pd.DataFrame]]):
+        histories = [None if history is None or len(history) == 0 else toDateIndexedFrame(history) for history in histories]
+        symbol_count = len(histories)
+        row_counts = np.array([0 if history is None else len(history) for history in histories], dtype=np.int64)
+        row_capacity = max(int(row_counts.max()) if symbol_count > 0 else 0, 1)
+        dates = [history.index.to_numpy(dtype="datetime64[ns]") for history in histories if history is not None]
+        self.calendar: np.ndarray = np.unique(np.concatenate(dates)) if dates else np.array([], dtype="datetime64[ns]")
+
+        self.open, self.high, self.low, self.close, self.turnover, self.volume = (np.full((symbol_count, row_capacity), np.nan) for _ in range(6))
+        # previousDayVolume is reported with the dtype of the cached column (int or float)
+        self.volume_is_integer: np.ndarray = np.zeros(symbol_count, dtype=bool)
+        self.first_dates: np.ndarray = np.full(symbol_count, np.datetime64("NaT"), dtype="datetime64[ns]")
+        self.last_dates: np.ndarray = np.full(symbol_count, np.datetime64("NaT"), dtype="datetime64[ns]")
+        # rows_before[i, d]: number of candles of symbol i dated before calendar[d]
+        self.rows_before: np.ndarray = np.zeros((symbol_count, len(self.calendar) + 1), dtype=np.int64)
+        calendar_positions = np.arange(len(self.calendar) + 1)
+        for i, history in enumerate(histories):
+            if history is None:
+                continue
+            row_count = len(history)
+            for field, values in (("open", self.open), ("high", self.high), ("low", self.low), ("close", self.close), ("volume", self.volume)):
+                values[i, :row_count] = history[field].to_numpy(dtype=np.float64)
+            if "turnover" in history.columns:
+                self.turnover[i, :row_count] = history["turnover"].to_numpy(dtype=np.float64)
+            else:
+                self.turnover[i, :row_count] = self.volume[i, :row_count] * self.close[i, :row_count]
+            self.volume_is_integer[i] = np.issubdtype(history["volume"].dtype, np.integer)
+            history_dates = history.index.to_numpy(dtype="datetime64[ns]")
+            self.first_dates[i], self.last_dates[i] = history_dates[0], history_dates[-1]
+            self.rows_before[i] = np.searchsorted(self.calendar.searchsorted(history_dates), calendar_positions, side="left")
+
+    def _precomputePanelFeatures(self):
+        """Per-row quantities, prefix sums and rolling averages over the whole history, as ``CandleFeatures`` computes them."""
+        previous_close = np.concatenate([np.full((len(self.symbols), 1), np.nan), self.close[:, :-1]], axis=1)
+        self.high_low_range: np.ndarray = self.high - self.low
+        with np.errstate(invalid="ignore"):
+            self.true_range: np.ndarray = np.fmax(np.fmax(self.high_low_range, np.abs(self.high - previous_close)), np.abs(self.low - previous_close))
+        self.turnover_sums, self.turnover_counts = CandleFeatures.prefixSums(self.turnover)
+        self.true_range_sums, self.true_range_counts = CandleFeatures.prefixSums(self.true_range)
+        for column, source in CandleFeatures.ROLLING_COLUMNS.items():
+            rolled = pd.DataFrame(getattr(self, source).T).rolling(window=CandleFeatures.ROLLING_WINDOW).mean().to_numpy()
+            setattr(self, column, np.ascontiguousarray(rolled.T))
+
+    # MARK: - Windows
+
+    def _windowDatesOf(self, virtual_dates: List[datetime]):
+        """``[vd - 3 * lowest_avg_turnover_days, vd - 1]`` of every date, as in ``_fetchSymbolsData``."""
+        lookback_days = int(self.config.tunableParams.lowest_avg_turnover_days) * 3
+        from_dates = CrossSectionalEngine._toDatetime64([virtual_date - timedelta(days=lookback_days) for virtual_date in virtual_dates])
+        to_dates = CrossSectionalEngine._toDatetime64([virtual_date - timedelta(days=1) for virtual_date in virtual_dates])
+        return from_dates, to_dates
+
+    def _windowsOf(self, virtual_dates: List[datetime]):
+        return self._rowRanges(*self._windowDatesOf(virtual_dates))
+
+    def _rowRanges(self, from_dates: np.ndarray, to_dates: np.ndarray):
+        """Rows ``[start, end)`` of every symbol dated within ``[from_date, to_date]``, as (dates × symbols)."""
+        start = self.rows_before[:, self.calendar.searchsorted(from_dates, side="left")].T
+        end = self.rows_before[:, self.calendar.searchsorted(to_dates, side="right")].T
+        return start, end
+
+    def _covers(self, from_dates: np.ndarray, to_dates: np.ndarray) -> np.ndarray:
+        # same test as YfinanceHandler's extractNeededDataFromCachedData (NaT for uncached symbols compares False)
+        return (self.first_dates[None, :] <= from_dates[:, None]) & (self.last_dates[None, :] >= to_dates[:, None])
+
+    def _cellGroupsOf(self, lengths: np.ndarray) -> Iterator[Tuple[int, np.ndarray]]:
+        """Flat indices of the (dates × symbols) cells of each nonzero row count in *lengths*, in chunks of ``CELLS_PER_GATHER``."""
+        lengths = lengths.ravel()
+        for length in np.unique(lengths[lengths > 0]):
+            cells = np.flatnonzero(lengths == length)
+            for chunk_start in range(0, len(cells), CrossSectionalEngine.CELLS_PER_GATHER):
+                yield int(length), cells[chunk_start:chunk_start + CrossSectionalEngine.CELLS_PER_GATHER]
+
+    def _turnoverMean(self, start: np.ndarray, end: np.ndarray, n: int) -> np.ndarray:
+        """``CandleFeatures.turnoverMean`` of every window."""
+        total, count = self._tailSums(self.turnover_sums, self.turnover_counts, np.maximum(start, end - n), end)
+        return CrossSectionalEngine._meanOf(total, count)
+
+    def _atrMean(self, start: np.ndarray, end: np.ndarray, n: int) -> np.ndarray:
+        """``CandleFeatures.atrMean`` of every window."""
+        tail_start = np.maximum(start, end - n)
+        total, count = self._tailSums(self.true_range_sums, self.true_range_counts, tail_start, end)
+        # the first row of a window is ranged without the close preceding the window
+        is_window_start = (tail_start == start) & (end > start)
+        symbol_index = np.arange(len(self.symbols))[None, :]
+        first_row = np.minimum(start, self.close.shape[1] - 1)
+        for values, sign in ((self.true_range, -1), (self.high_low_range, 1)):
+            value = values[symbol_index, first_row]
+            is_corrected = is_window_start & ~np.isnan(value)
+            total = np.where(is_corrected, total + sign * value, total)
+            count = np.where(is_corrected, count + sign, count)
+        return CrossSectionalEngine._meanOf(total, count)
+
+    def _closeStd(self, start: np.ndarray, end: np.ndarray, n: int) -> np.ndarray:
+        """``CandleFeatures.closeStd`` of every window: two-pass std of the gathered tails, NaN under 2 rows."""
+        shape = start.shape
+        start, end = start.ravel(), end.ravel()
+        tail_lengths = np.minimum(n, end - start)
+        result = np.full(start.shape, np.nan)
+        for length, cells in self._cellGroupsOf(np.where(tail_lengths >= 2, tail_lengths, 0)):
+            tails = CrossSectionalEngine._gather(self.close, cells % len(self.symbols), end[cells] - length, length)
+            result[cells] = CandleFeatures.windowStds(tails)
+        return result.reshape(shape)
+
+    def _tailSums(self, sums: np.ndarray, counts: np.ndarray, start: np.ndarray, end: np.ndarray):
+        symbol_index = np.arange(len(self.symbols))[None, :]
+        return sums[symbol_index, end] - sums[symbol_index, start], counts[symbol_index, end] - counts[symbol_index, start]
+
+    # MARK: - Performance
+
+    def _evaluatePerformance(self, days: Dict[str, np.ndarray], virtual_dates: List[datetime], previous_market_dates: List[Optional[datetime]], fill_performance: List[bool]):
+        """The last candle on ``[previous market date, vd]``, as ``ChaseHoundMain._fillRecordedPerformance`` reads it."""
+        has_previous_date = np.array([previous_date is not None for previous_date in previous_market_dates], dtype=bool)
+        from_dates = CrossSectionalEngine._toDatetime64([previous_date if previous_date is not None else virtual_date for virtual_date, previous_date in zip(virtual_dates, previous_market_dates)])
+        to_dates = CrossSectionalEngine._toDatetime64(virtual_dates)
+        start, end = self._rowRanges(from_dates, to_dates)
+        days["hasPerformance"] = (
+            (np.asarray(fill_performance, dtype=bool) & has_previous_date)[:, None] & self._covers(from_dates, to_dates) & (end > start)
+        )
+        symbol_index = np.arange(len(self.symbols))[None, :]
+        current_day = np.maximum(end - 1, 0)
+        days["currentDayOpenPrice"] = self.open[symbol_index, current_day]
+        days["currentDayHighPrice"] = self.high[symbol_index, current_day]
+        days["currentDayLowPrice"] = self.low[symbol_index, current_day]
+        days["currentDayClosePrice"] = self.close[symbol_index, current_day]
+
+    # MARK: - Rows
+
+    def _buildDay(self, days: Dict[str, np.ndarray], t: int, virtual_date: datetime) -> CrossSectionalDay:
+        params = self.config.tunableParams
+        universe = np.flatnonzero(days["included"][t, :self.universe_size])
+
+        # previousDayTurnover ranking among the day's targets (highest first, stable)
+        rankings: Dict[int, int] = {}
+        for rank, i in enumerate(universe[np.argsort(-days["previousDayTurnover"][t, universe], kind="stable")], start=1):
+            rankings[int(i)] = rank
+        # best n by currentDayPriceChangePercentage (highest first, stable)
+        performance = np.where(days["hasPerformance"][t, universe], days["currentDayPriceChangePercentage"][t, universe], np.nan)
+        best = universe[np.argsort(-performance, kind="stable")][:params.bestTargetsN]
+        dropped_out_at = {int(i): self._droppedOutAt(days, t, i) for i in best}
+
+        best_rows = [self._targetRow(days, t, i, rankings[int(i)], dropped_out_at[int(i)]) for i in best]
+        main_rows = [
+            self._targetRow(days, t, i, rankings[int(i)], dropped_out_at.get(int(i)))
+            for i in universe if days["passedAllFilters"][t, i]
+        ]
+        index = len(self.symbols) - 1
+        index_rows = [self._baseRow(days, t, index, {})] if days["included"][t, index] else []
+        if days["included"][t, index] and days["hasPerformance"][t, index]:
+            index_rows = [self._baseRow(days, t, index, {key: days[key][t, index] for key in CrossSectionalEngine.PERFORMANCE_KEYS})]
+        return CrossSectionalDay(virtual_date, index_rows, best_rows, [dropped_out_at[int(i)] for i in best], main_rows)
+
+    def _droppedOutAt(self, days: Dict[str, np.ndarray], t: int, i: int) -> str:
+        return self._drop_out_stages[days["droppedOutStage"][t, i]]
+
+    def _targetRow(self, days: Dict[str, np.ndarray], t: int, i: int, ranking: int, dropped_out_at: Optional[str]) -> pd.Series:
+        # additional_info in insertion order: ranking, the flags of the stages the target reached, performance
+        additional_info = {"previousDayTurnoverRanking": ranking}
+        for stage in self.filterPipeline.stages:
+            if not days[CrossSectionalEngine._reachedKeyOf(stage.name)][t, i]:
+                continue
+            # as FilterScheduler.flagsOf: up to the first failing filter, unless the stage records them all
+            for current in stage.filters:
+                additional_info[current.FLAG] = days[current.FLAG][t, i]
+                if not stage.scheduler.records_all_flags and not additional_info[current.FLAG]:
+                    break
+        if days["hasPerformance"][t, i]:
+            for key in CrossSectionalEngine.PERFORMANCE_KEYS:
+                additional_info[key] = days[key][t, i]
+        if dropped_out_at is not None:
+            additional_info["droppedOutAtFilter"] = dropped_out_at
+        return self._baseRow(days, t, i, additional_info)
+
+    def _baseRow(self, days: Dict[str, np.ndarray], t: int, i: int, additional_info: dict) -> pd.Series:
+        # same layout as InvestmentTarget.to_series
+        data = {
+            "symbol": self.symbols[i],
+            "previousDayClosePrice": days["previousDayClosePrice"][t, i],
+            "previousDayVolume": self._previousDayVolumeOf(days, t, i),
+            "latestMarketCap": self.market_caps[i],
+            "previousDayTurnover": days["previousDayTurnover"][t, i],
+            "turnoverRatio": days["turnoverRatio"][t, i],
+            "atrRatio": days["atrRatio"][t, i],
+            "priceStdRatio": days["priceStdRatio"][t, i],
+        }
+        for key, value in additional_info.items():
+            data[key] = value
+        return pd.Series(data)
+
+    def _previousDayVolumeOf(self, days: Dict[str, np.ndarray], t: int, i: int):
+        volume = days["previousDayVolume"][t, i]
+        return np.int64(volume) if days["volumeIsInteger"][t, i] else volume
+
+    # MARK: - Helpers
+
+    @staticmethod
+    def _toDatetime64(dates: List[datetime]) -> np.ndarray:
+        return np.array([np.datetime64(date, "ns") for date in dates], dtype="datetime64[ns]")
+
+    @staticmethod
+    def _gather(values: np.ndarray, symbols: np.ndarray, first_rows: np.ndarray, length: int) -> np.ndarray:
+        """The rows ``[first_row, first_row + length)`` of each symbol, as a (cells × length) matrix."""
+        return values[symbols[:, None], first_rows[:, None] + np.arange(length)]
+
+    @staticmethod
+    def _meanOf(total: np.ndarray, count: np.ndarray) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(count > 0, total / count, np.nan)
+
+
+class PanelWindow:
+    """Rows ``[start, end)`` of symbol *i* of a ``CrossSectionalEngine`` panel, read like a ``CandleWindow``."""
+
+    __slots__ = ("engine", "i", "start", "end")
+
+    def __init__(self, engine: CrossSectionalEngine, i: int, start: int, end: int):
+        self.engine: CrossSectionalEngine = engine
+        self.i: int = i
+        self.start: int = start
+        self.end: int = end
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.engine.columnOf(column, self.i, self.start, self.end)
+
+    def __len__(self) -> int:
+        return self.end - self.start
@@ -0,0 +1,74 @@
+from src_python.ChaseHoundBase import ChaseHoundBase
+from datetime import datetime
+from typing import List, Optional
+import os
+import pandas as pd
+
+
+class DailyResultsWriter(ChaseHoundBase):
+    """Writes the per-day CSVs of a backtest: ``temp/<YYYYMMDD>_<profix>.csv``.
+
+    Rows are the ``pd.Series`` of ``InvestmentTarget.to_series`` (or series built the
+    same way by the cross-sectional engine), so that both engines write identical
+    files.  Nothing is written for a day without rows.
+    """
+
+    def __init__(self, folder_path: Optional[str] = None):
+        super().__init__()
+        self.folder_path: str = folder_path or os.path.join(self.project_root, "temp")
+
+    # files of one day, in writing order
+    DAY_PROFIXES: List[str] = ["sp500Avg", "bestTargetsOfTheDay", "results"]
+
+    def pathOf(self, virtual_date: datetime, profix: str) -> str:
+        return os.path.join(self.folder_path, f"{virtual_date.strftime('%Y%m%d')}_{profix}.csv")
+
+    def pathsOfDay(self, virtual_date: datetime) -> List[str]:
+        return [self.pathOf(virtual_date, profix) for profix in DailyResultsWriter.DAY_PROFIXES]
+
+    @staticmethod
+    def toFrame(rows: List[pd.Series]) -> pd.DataFrame:
+        """One (object) row per series, columns in order of first appearance, missing values NaN.
+
+        Same frame as concatenating the rows one by one onto an empty dataframe, in one concat.
+        """
+        if len(rows) == 0:
+            return pd.DataFrame()
+        return pd.concat([row.to_frame().T for row in rows], ignore_index=True, axis=0)
+
+    def writeResults(self, rows: List[pd.Series], virtual_date: datetime, profix: str = "") -> pd.DataFrame:
+        result_df = DailyResultsWriter.toFrame(rows)
+        if len(result_df) == 0:
+            return result_df
+        # sort by currentDayPriceChangePercentage
+        result_df = result_df.sort_values(by="currentDayPriceChangePercentage", ascending=False)
+        result_df.to_csv(self.pathOf(virtual_date, profix), index=False)
+        return result_df
+
+    def writeMainResults(self, rows: List[pd.Series], virtual_date: datetime, best_n_targets: pd.DataFrame, profix: str = "") -> pd.DataFrame:
+        result_df = DailyResultsWriter.toFrame(rows)
+        if len(result_df) == 0:
+            return result_df
+        # sort by currentDayPriceChangePercentage
+        result_df = result_df.sort_values(by="currentDayPriceChangePercentage", ascending=False)
+        # add isInBestNTargets
+        result_df["isInBestNTargets"] = result_df["symbol"].isin(best_n_targets["symbol"].tolist()).astype(bool)
+        result_df.to_csv(self.pathOf(virtual_date, profix), index=False)
+        return result_df
+
+    def writeBestNResults(self, rows: List[pd.Series], virtual_date: datetime, dropped_out_at: List[str], profix: str = "") -> pd.DataFrame:
+        result_df = DailyResultsWriter.toFrame(rows)
+        if len(result_df) == 0:
+            return result_df
+        # sort by currentDayPriceChangePercentage
+        result_df = result_df.sort_values(by="currentDayPriceChangePercentage", ascending=False)
+        # add droppedOutAtFilter
+        result_df["droppedOutAtFilter"] = dropped_out_at
+        result_df.to_csv(self.pathOf(virtual_date, profix), index=False)
+        return result_df
+
+    def writeDay(self, day):
+        """Write the three files of a ``CrossSectionalDay``, in the order of ``ChaseHoundMain.run``."""
+        self.writeResults(day.index_rows, day.virtual_date, profix="sp500Avg")
+        best_n_targets_df = self.writeBestNResults(day.best_rows, day.virtual_date, day.best_dropped_out_at, profix="bestTargetsOfTheDay")
+        self.writeMainResults(day.main_rows, day.virtual_date, best_n_targets_df, profix="results")
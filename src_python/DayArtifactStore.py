@@ -0,0 +1,122 @@
+from src_python.ChaseHoundBase import ChaseHoundBase
+from src_python.ChaseHoundConfig import ChaseHoundTunableParams
+from datetime import datetime
+from typing import Dict, List, Optional
+import hashlib
+import json
+import os
+import shutil
+import time
+import zipfile
+
+import numpy as np
+
+
+class DayArtifactStore(ChaseHoundBase):
+    """Per-day intermediate results of the backtest, reused across parameter sets.
+
+    A stage only depends on some of the tunable parameters (``STAGE_PARAMS``): its
+    results are stored under a key made of those parameters alone and the data
+    version, so two runs that only differ in, say, ``bestTargetsN`` or a spike
+    threshold share the metrics of every day.  Layout::
+
+        cache/DayArtifactStore/<stage>/<key>/<YYYYMMDD>.npz
+
+    with one array per column, over the symbols of the universe.  Files are written
+    to a temporary path and swapped in.  Key folders older than *max_age_seconds* are
+    removed by ``prune``.
+    """
+
+    STAGE_PARAMS: Dict[str, List[str]] = {
+        # _fetchSymbolsData table and the day's performance
+        "metrics": [
+            "lowest_avg_turnover_days",
+            "turnoverShortTermDays",
+            "turnoverLongTermDays",
+            "atrShortTermDays",
+            "atrLongTermDays",
+            "priceStdShortTermDays",
+            "priceStdLongTermDays",
+        ],
+        # breakout detection and structure confirmation flags
+        "rightSide": [
+            "lowest_avg_turnover_days",
+            "breakoutDetectionDaysLookback",
+            "breakoutDetectionPriceRatioThreshold",
+            "breakoutDetectionVolumeAugmentationRatioThreshold",
+            "structureConfirmationDaysLookback",
+            "structureConfirmationMaTolerance",
+        ],
+    }
+
+    def __init__(self, data_version: str, folder_path: Optional[str] = None, max_age_seconds: Optional[float] = None):
+        """
+        Args:
+            data_version: version of the candles and the universe the artifacts are computed on.
+            max_age_seconds: defaults to ``CHASEHOUND_DAY_ARTIFACTS_MAX_AGE_DAYS`` (7 days).
+        """
+        super().__init__()
+        self.data_version: str = data_version
+        self.folder_path: str = folder_path or os.path.join(self.project_root, "cache", "DayArtifactStore")
+        self.max_age_seconds: float = max_age_seconds if max_age_seconds is not None else float(os.getenv("CHASEHOUND_DAY_ARTIFACTS_MAX_AGE_DAYS", "7")) * 86400
+        self._stats: Dict[str, int] = {"hits": 0, "misses": 0, "saves": 0}
+
+    @staticmethod
+    def stageParamsOf(stage: str, params: ChaseHoundTunableParams) -> Dict:
+        """Canonical values of the parameters *stage* depends on."""
+        canonical = params.toCanonicalDict()
+        return {name: canonical[name] for name in DayArtifactStore.STAGE_PARAMS[stage]}
+
+    def keyOf(self, stage: str, params: ChaseHoundTunableParams) -> str:
+        """Hash of ``stageParamsOf`` and the data version."""
+        subset = DayArtifactStore.stageParamsOf(stage, params)
+        payload = json.dumps({"stage": stage, "params": subset, "dataVersion": self.data_version}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+    def pathOf(self, stage: str, params: ChaseHoundTunableParams, virtual_date: datetime) -> str:
+        return os.path.join(self.folder_path, stage, self.keyOf(stage, params), f"{virtual_date.strftime('%Y%m%d')}.npz")
+
+    # MARK: - Public Methods
+
+    def load(self, stage: str, params: ChaseHoundTunableParams, virtual_date: datetime) -> Optional[Dict[str, np.ndarray]]:
+        """Arrays stored for *virtual_date*, None if there are none."""
+        path = self.pathOf(stage, params, virtual_date)
+        if not os.path.exists(path):
+            self._stats["misses"] += 1
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                arrays = {name: stored[name] for name in stored.files}
+        except (OSError, ValueError, zipfile.BadZipFile) as e:
+            self.log_warning(f"Ignoring unreadable day artifact {path}: {e}")
+            self._stats["misses"] += 1
+            return None
+        self._stats["hits"] += 1
+        return arrays
+
+    def save(self, stage: str, params: ChaseHoundTunableParams, virtual_date: datetime, arrays: Dict[str, np.ndarray]):
+        path = self.pathOf(stage, params, virtual_date)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as file:
+            np.savez(file, **{name: np.asarray(values) for name, values in arrays.items()})
+        os.replace(temp_path, path)
+        self._stats["saves"] += 1
+
+    def prune(self) -> int:
+        """Remove the key folders not written to for more than *max_age_seconds*; return how many."""
+        removed = 0
+        now = time.time()
+        for stage in DayArtifactStore.STAGE_PARAMS:
+            stage_folder_path = os.path.join(self.folder_path, stage)
+            if not os.path.isdir(stage_folder_path):
+                continue
+            for key in os.listdir(stage_folder_path):
+                key_folder_path = os.path.join(stage_folder_path, key)
+                if os.path.isdir(key_folder_path) and now - os.path.getmtime(key_folder_path) > self.max_age_seconds:
+                    shutil.rmtree(key_folder_path, ignore_errors=True)
+                    removed += 1
+        return removed
+
+    def getStats(self) -> Dict[str, int]:
+        return dict(self._stats)
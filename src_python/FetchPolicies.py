@@ -0,0 +1,148 @@
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional
+import random
+import threading
+import time
+
+
+class TokenBucketRateLimiter:
+    """Thread-safe token bucket: ``rate_per_second`` requests on average, bursts of ``burst``.
+
+    ``reserve`` takes a token immediately and returns how long the caller has to wait
+    before using it, so blocking (``acquire``) and asyncio (``asyncio.sleep``) callers
+    share the same bucket.  ``getShared`` returns one bucket per name for the whole
+    process, so that every handler talking to the same upstream is throttled together.
+    """
+
+    _shared: Dict[str, "TokenBucketRateLimiter"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, rate_per_second: float, burst: Optional[float] = None):
+        assert rate_per_second > 0
+        self.rate_per_second: float = rate_per_second
+        self.burst: float = burst if burst is not None else max(1.0, rate_per_second)
+        self._tokens: float = self.burst
+        self._updated_at: float = time.monotonic()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, float] = {"acquired": 0, "throttled": 0, "total_wait_seconds": 0.0}
+
+    @classmethod
+    def getShared(cls, name: str, rate_per_second: float, burst: Optional[float] = None) -> "TokenBucketRateLimiter":
+        with cls._shared_lock:
+            if name not in cls._shared:
+                cls._shared[name] = cls(rate_per_second, burst)
+            return cls._shared[name]
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate_per_second)
+            self._updated_at = now
+            self._tokens -= 1.0
+            wait_seconds = max(0.0, -self._tokens / self.rate_per_second)
+            self.stats["acquired"] += 1
+            if wait_seconds > 0:
+                self.stats["throttled"] += 1
+                self.stats["total_wait_seconds"] += wait_seconds
+            return wait_seconds
+
+    def acquire(self):
+        wait_seconds = self.reserve()
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+
+    def getStats(self) -> Dict[str, float]:
+        return {"rate_per_second": self.rate_per_second, "burst": self.burst, **self.stats}
+
+
+class RetryPolicy:
+    """Up to ``max_attempts`` tries, separated by exponential backoff with jitter.
+
+    The n-th retry waits between half and all of ``min(max_delay, base_delay * 2**n)``,
+    so that requests that failed together do not come back together.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0, seed: Optional[int] = None):
+        assert max_attempts >= 1
+        self.max_attempts: int = max_attempts
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self._random = random.Random(seed)
+
+    def getDelay(self, retry_number: int) -> float:
+        delay = min(self.max_delay, self.base_delay * (2 ** retry_number))
+        return delay / 2 + self._random.uniform(0, delay / 2)
+
+
+class NegativeCache:
+    """Keys that recently failed, remembered for ``ttl_seconds`` so they are not requested again."""
+
+    def __init__(self, ttl_seconds: float = 3600.0):
+        self.ttl_seconds: float = ttl_seconds
+        self._expires_at: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"added": 0, "hits": 0}
+
+    def add(self, key: Hashable):
+        with self._lock:
+            self._expires_at[key] = time.monotonic() + self.ttl_seconds
+            self.stats["added"] += 1
+
+    def contains(self, key: Hashable) -> bool:
+        with self._lock:
+            expires_at = self._expires_at.get(key)
+            if expires_at is None:
+                return False
+            if expires_at <= time.monotonic():
+                del self._expires_at[key]
+                return False
+            self.stats["hits"] += 1
+            return True
+
+    def getStats(self) -> Dict[str, int]:
+        with self._lock:
+            now = time.monotonic()
+            return {"ttl_seconds": self.ttl_seconds, "entries": sum(expires_at > now for expires_at in self._expires_at.values()), **self.stats}
+
+
+class InFlightRequestTable:
+    """Collapses concurrent identical requests into one call.
+
+    The first caller of ``run(key, ...)`` performs the call; callers arriving with the
+    same key while it is running block until it finishes and share its result (or its
+    exception).  Nothing is remembered once the call has returned: this is coalescing,
+    not caching.
+    """
+
+    def __init__(self):
+        self._futures: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"calls": 0, "coalesced": 0}
+
+    def run(self, key: Hashable, function: Callable[..., Any], *args) -> Any:
+        with self._lock:
+            future = self._futures.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._futures[key] = future
+                self.stats["calls"] += 1
+            else:
+                self.stats["coalesced"] += 1
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = function(*args)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._futures[key]
+
+    def getStats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"in_flight": len(self._futures), **self.stats}
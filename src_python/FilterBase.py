@@ -1,9 +1,27 @@
 from src_python.ChaseHoundBase import ChaseHoundBase
 from src_python.ChaseHoundConfig import ChaseHoundConfig
-from typing import Callable, List
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
 from src_python.InvestmentTarget import InvestmentTarget
+import numpy as np
+
+# columnar table of targets: attribute name -> array over the targets (a DataFrame works too)
+TargetTable = Mapping[str, np.ndarray]
+
 
 class FilterBase(ChaseHoundBase):
+    """A filter evaluated on a columnar table of targets.
+
+    Subclasses name the ``InvestmentTarget`` attributes they read (``COLUMNS``) and
+    the ``additional_info`` key of their pass flag (``FLAG``), and implement
+    ``evaluate``.  ``applyBatch`` returns the mask and the flags to record;
+    ``filterTargets`` is the batch counterpart of ``filter(f.apply, targets)``, and
+    ``apply`` remains the per-target adapter.
+    """
+
+    # additional_info key of the pass flag
+    FLAG: str = None
+    # InvestmentTarget attributes read by evaluate
+    COLUMNS: List[str] = []
 
     # MARK: - Instance Properties
     def __init__(self, config: ChaseHoundConfig):
@@ -11,7 +29,49 @@ class FilterBase(ChaseHoundBase):
         self.config: ChaseHoundConfig = config
         self._filterFunction: Callable[[InvestmentTarget], bool] = None
 
-    def apply(self, targets: List[InvestmentTarget]) -> List[InvestmentTarget]:
-        raise NotImplementedError("Subclass must implement apply method")
+    def evaluate(self, table: TargetTable) -> np.ndarray:
+        """Boolean array: does each row of *table* pass the filter."""
+        raise NotImplementedError("Subclass must implement evaluate method")
+
+    # MARK: - Public Methods
+
+    def applyBatch(self, table: TargetTable) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Mask of the rows passing the filter, and the flags to record by ``additional_info`` key."""
+        mask = np.asarray(self.evaluate(table), dtype=bool)
+        return mask, {self.FLAG: mask}
+
+    def filterTargets(self, targets: List[InvestmentTarget]) -> List[InvestmentTarget]:
+        """Targets passing the filter, in order; the flags are recorded on every target."""
+        mask = self.recordFlags(targets)
+        return [target for target, didPass in zip(targets, mask) if didPass]
+
+    def recordFlags(self, targets: List[InvestmentTarget], table: Optional[TargetTable] = None) -> np.ndarray:
+        """Evaluate *targets* (or their rows of *table*) and write the flags into their ``additional_info``."""
+        mask, flags = self.applyBatch(table if table is not None else FilterBase.tableOf(targets, self.COLUMNS))
+        for name, values in flags.items():
+            for target, value in zip(targets, values):
+                target.additional_info[name] = value
+        return mask
+
+    def apply(self, target: InvestmentTarget) -> bool:
+        """Per-target adapter of ``applyBatch``."""
+        return bool(self.recordFlags([target])[0])
+
+    @staticmethod
+    def tableOf(targets: List[InvestmentTarget], columns: List[str]) -> Dict[str, np.ndarray]:
+        table = {}
+        for column in columns:
+            if column == "candles":
+                # frames (or candle windows, no frame built) stay whole: one object per row
+                values = [target.candleWindow for target in targets]
+                table[column] = np.empty(len(values), dtype=object)
+                for row, value in enumerate(values):
+                    table[column][row] = value
+            else:
+                table[column] = np.asarray([getattr(target, column) for target in targets])
+        return table
 
-    
\ No newline at end of file
+    @staticmethod
+    def rowsOf(table: TargetTable, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        """The *rows* of *table*, for the columns it has."""
+        return {column: np.asarray(values)[rows] for column, values in table.items()}
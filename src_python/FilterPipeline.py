@@ -0,0 +1,186 @@
+from src_python.ChaseHoundBase import ChaseHoundBase
+from src_python.FilterBase import FilterBase
+from src_python.FilterScheduler import FilterScheduler, FilterFlagLedger, StageOutcome
+from src_python.InvestmentTarget import InvestmentTarget
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+import os
+import numpy as np
+
+
+class FilterStage:
+    """A named stage of filters, run on the targets passing every stage it depends on.
+
+    A target passes the stage if at least *required_passes* of the filters pass (all
+    of them by default); see ``FilterScheduler``.  A *vectorizable* stage reads its
+    columns from a table built once for the chain of vectorizable stages it belongs to.
+    """
+
+    def __init__(self, name: str, filters: List[FilterBase], depends_on: Optional[List[str]] = None,
+                 required_passes: Optional[int] = None, records_all_flags: bool = False, vectorizable: bool = True):
+        self.name: str = name
+        self.depends_on: List[str] = list(depends_on or [])
+        self.required_passes: Optional[int] = required_passes
+        self.vectorizable: bool = vectorizable
+        self.scheduler: FilterScheduler = FilterScheduler(filters, records_all_flags=records_all_flags)
+
+    @property
+    def filters(self) -> List[FilterBase]:
+        return self.scheduler.filters
+
+    @property
+    def columns(self) -> List[str]:
+        return list(dict.fromkeys(column for current in self.filters for column in current.COLUMNS))
+
+
+class PipelineResult:
+    """Filtering of one day: the passing targets, where the others dropped out, and their flags."""
+
+    # droppedOutAt of the targets passing every stage
+    PASSED: str = "passedAllFilters"
+
+    def __init__(self, targets: List[InvestmentTarget], stage_names: List[str], dropped_out_stages: np.ndarray, ledger: FilterFlagLedger):
+        self.targets: List[InvestmentTarget] = targets
+        self.stage_names: List[str] = stage_names
+        # first failing stage of each target (index into stage_names, len(stage_names) if none), by position
+        self.dropped_out_stages: np.ndarray = dropped_out_stages
+        self.ledger: FilterFlagLedger = ledger
+        self._positions: Dict[int, int] = {id(target): position for position, target in enumerate(targets)}
+
+    @property
+    def passed(self) -> List[InvestmentTarget]:
+        return [target for target, stage in zip(self.targets, self.dropped_out_stages) if stage == len(self.stage_names)]
+
+    def droppedOutAt(self, target: InvestmentTarget) -> str:
+        stage = self.dropped_out_stages[self._positions[id(target)]]
+        return self.stage_names[stage] if stage < len(self.stage_names) else PipelineResult.PASSED
+
+    def exportFlags(self, targets: List[InvestmentTarget]):
+        """Write the filter flags of *targets* into their ``additional_info`` (see ``FilterFlagLedger``)."""
+        self.ledger.export(targets)
+
+
+class FilterPipeline(ChaseHoundBase):
+    """Runs a DAG of ``FilterStage``s on the targets of a day.
+
+    The stages are run in a topological order (ties in declaration order), which is
+    also the order of the recorded flags and of the drop-out attribution: a target
+    drops out at the first stage of that order it reaches and fails.  A stage is
+    run on the targets passing all of its dependencies; stages without dependencies
+    on the whole day.
+
+    - Fusion: a vectorizable stage depending only on the vectorizable stage before it
+      joins its chain.  The table of the chain's columns is built once from the
+      chain's input targets, the later stages reading their rows of it.
+    - Concurrency: the stages whose dependencies are all run, and that do not depend
+      on each other, are run by a pool of *workers* threads (default:
+      ``CHASEHOUND_PIPELINE_WORKERS``, else 1).
+
+    Adding a filter is adding it to a stage, or a stage to the list.
+    """
+
+    def __init__(self, stages: List[FilterStage], workers: Optional[int] = None):
+        super().__init__()
+        self.workers: int = workers or int(os.environ.get("CHASEHOUND_PIPELINE_WORKERS", "1"))
+        self.stages: List[FilterStage] = FilterPipeline._topologicalOrderOf(stages)
+        self._levels: List[List[FilterStage]] = FilterPipeline._levelsOf(self.stages)
+        # fused chains, by the name of their first stage; and the first stage of each fused one
+        self._chains: Dict[str, List[FilterStage]] = {}
+        self._chain_heads: Dict[str, str] = {}
+        for previous, stage in zip(self.stages, self.stages[1:]):
+            if previous.vectorizable and stage.vectorizable and stage.depends_on == [previous.name]:
+                head = self._chain_heads.setdefault(previous.name, previous.name)
+                self._chain_heads[stage.name] = head
+                self._chains.setdefault(head, [previous]).append(stage)
+
+    # MARK: - Public Methods
+
+    def getStage(self, name: str) -> FilterStage:
+        return next(stage for stage in self.stages if stage.name == name)
+
+    def getDropOutStages(self) -> List[str]:
+        """droppedOutAtFilter values, by index of the first failing stage (``PipelineResult.dropped_out_stages``)."""
+        return [stage.name for stage in self.stages] + [PipelineResult.PASSED]
+
+    def run(self, targets: List[InvestmentTarget]) -> PipelineResult:
+        ledger = FilterFlagLedger(targets)
+        passed: Dict[str, np.ndarray] = {}
+        outcomes: Dict[str, StageOutcome] = {}
+        # tables of the fused chains: (rows of the targets, table)
+        chain_tables: Dict[str, tuple] = {}
+        for level in self._levels:
+            inputs = [self._inputRowsOf(stage, len(targets), passed) for stage in level]
+            tables = [self._tableOf(stage, targets, rows, chain_tables) for stage, rows in zip(level, inputs)]
+            jobs = list(zip(level, inputs, tables))
+            if len(jobs) > 1 and self.workers > 1:
+                with ThreadPoolExecutor(max_workers=min(self.workers, len(jobs))) as pool:
+                    level_outcomes = list(pool.map(lambda job: FilterPipeline._runStage(job[0], targets, job[1], job[2]), jobs))
+            else:
+                level_outcomes = [FilterPipeline._runStage(stage, targets, rows, table) for stage, rows, table in jobs]
+            for stage, rows, outcome in zip(level, inputs, level_outcomes):
+                outcomes[stage.name] = outcome
+                passed[stage.name] = np.zeros(len(targets), dtype=bool)
+                passed[stage.name][rows[outcome.mask]] = True
+                print(f"After {stage.name}: {np.count_nonzero(outcome.mask)} of {len(rows)} targets")
+
+        dropped_out_stages = np.full(len(targets), len(self.stages), dtype=np.int8)
+        for index, stage in enumerate(self.stages):
+            ledger.addStage(stage.scheduler, outcomes[stage.name])
+            reached = np.zeros(len(targets), dtype=bool)
+            reached[self._inputRowsOf(stage, len(targets), passed)] = True
+            is_new_drop_out = reached & ~passed[stage.name] & (dropped_out_stages == len(self.stages))
+            dropped_out_stages[is_new_drop_out] = index
+        return PipelineResult(targets, [stage.name for stage in self.stages], dropped_out_stages, ledger)
+
+    # MARK: - Private Methods
+
+    @staticmethod
+    def _runStage(stage: FilterStage, targets: List[InvestmentTarget], rows: np.ndarray, table: Optional[dict]) -> StageOutcome:
+        return stage.scheduler.run([targets[row] for row in rows], stage.required_passes, table)
+
+    @staticmethod
+    def _inputRowsOf(stage: FilterStage, count: int, passed: Dict[str, np.ndarray]) -> np.ndarray:
+        is_input = np.ones(count, dtype=bool)
+        for name in stage.depends_on:
+            is_input &= passed[name]
+        return np.flatnonzero(is_input)
+
+    def _tableOf(self, stage: FilterStage, targets: List[InvestmentTarget], rows: np.ndarray, chain_tables: Dict[str, tuple]) -> Optional[dict]:
+        head = self._chain_heads.get(stage.name)
+        if head is None:
+            # not fused: each filter builds its own columns
+            return None
+        if head == stage.name:
+            columns = list(dict.fromkeys(column for current in self._chains[head] for column in current.columns))
+            chain_tables[head] = (rows, FilterBase.tableOf([targets[row] for row in rows], columns))
+        chain_rows, table = chain_tables[head]
+        # the rows of a later stage are among those of the chain (both sorted)
+        return FilterBase.rowsOf(table, np.searchsorted(chain_rows, rows))
+
+    @staticmethod
+    def _topologicalOrderOf(stages: List[FilterStage]) -> List[FilterStage]:
+        names = [stage.name for stage in stages]
+        assert len(set(names)) == len(names), f"Duplicate filter stage names: {names}"
+        for stage in stages:
+            for name in stage.depends_on:
+                assert name in names, f"Filter stage {stage.name} depends on an unknown stage: {name}"
+        ordered: List[FilterStage] = []
+        remaining = list(stages)
+        while remaining:
+            ready = next((stage for stage in remaining if all(name in [done.name for done in ordered] for name in stage.depends_on)), None)
+            assert ready is not None, f"Cyclic filter stages: {[stage.name for stage in remaining]}"
+            ordered.append(ready)
+            remaining.remove(ready)
+        return ordered
+
+    @staticmethod
+    def _levelsOf(stages: List[FilterStage]) -> List[List[FilterStage]]:
+        """Consecutive groups of the ordered *stages* not depending on one another."""
+        levels: List[List[FilterStage]] = []
+        depth: Dict[str, int] = {}
+        for stage in stages:
+            depth[stage.name] = 1 + max((depth[name] for name in stage.depends_on), default=-1)
+            if depth[stage.name] == len(levels):
+                levels.append([])
+            levels[depth[stage.name]].append(stage)
+        return levels
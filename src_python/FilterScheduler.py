@@ -0,0 +1,148 @@
+from src_python.ChaseHoundBase import ChaseHoundBase
+from src_python.FilterBase import FilterBase, TargetTable
+from src_python.InvestmentTarget import InvestmentTarget
+from typing import Dict, List, Optional, Tuple
+import time
+import numpy as np
+
+
+class StageOutcome:
+    """Outcomes of one scheduled stage: per filter (canonical order) and target, 1 / 0, or -1 if not evaluated."""
+
+    def __init__(self, targets: List[InvestmentTarget], outcomes: np.ndarray, mask: np.ndarray, table: Optional[TargetTable] = None):
+        self.targets: List[InvestmentTarget] = targets
+        self.outcomes: np.ndarray = outcomes
+        self.mask: np.ndarray = mask
+        # rows of the targets the stage was run on, if given a table
+        self.table: Optional[TargetTable] = table
+        self._rows: Dict[int, int] = {id(target): row for row, target in enumerate(targets)}
+
+    def rowOf(self, target: InvestmentTarget) -> Optional[int]:
+        return self._rows.get(id(target))
+
+
+class FilterScheduler(ChaseHoundBase):
+    """Runs a stage of filters, cheap and decisive ones first, until every target's outcome is known.
+
+    A target passes the stage if at least *required_passes* of its filters pass (all
+    of them by default, the filter() chain).  The scheduler keeps the observed pass
+    rate and cost per target of each filter, and evaluates them in increasing cost
+    per decided target; a filter is only evaluated on the targets still undecided
+    (``k`` passes reached, or out of reach).  Filters not observed yet come first,
+    in their given (canonical) order.
+
+    The outcome of the stage does not depend on the order.  The flags the chain
+    would record are rebuilt on demand by ``flagsOf``, evaluating the filters that
+    were skipped: those up to the first failing one, or all of them with
+    *records_all_flags* (the volatility filters all record their flag).
+    """
+
+    def __init__(self, filters: List[FilterBase], records_all_flags: bool = False):
+        super().__init__()
+        self.filters: List[FilterBase] = filters
+        self.records_all_flags: bool = records_all_flags
+        self._stats: List[Dict[str, float]] = [{"evaluated": 0, "passed": 0, "seconds": 0.0} for _ in filters]
+
+    # MARK: - Public Methods
+
+    def run(self, targets: List[InvestmentTarget], required_passes: Optional[int] = None, table: Optional[TargetTable] = None) -> StageOutcome:
+        """Outcome of the stage on *targets*, read from their rows of *table* if given (else built per filter)."""
+        required_passes = len(self.filters) if required_passes is None else required_passes
+        outcomes = np.full((len(self.filters), len(targets)), -1, dtype=np.int8)
+        passes = np.zeros(len(targets), dtype=np.int64)
+        remaining = len(self.filters)
+        undecided = np.arange(len(targets))
+        for k in self.getOrder(required_passes):
+            undecided = undecided[(passes[undecided] < required_passes) & (passes[undecided] + remaining >= required_passes)]
+            if len(undecided) == 0:
+                break
+            mask = self._evaluate(k, [targets[row] for row in undecided], None if table is None else FilterBase.rowsOf(table, undecided))
+            outcomes[k, undecided] = mask
+            passes[undecided] += mask
+            remaining -= 1
+        return StageOutcome(targets, outcomes, passes >= required_passes, table)
+
+    def flagsOf(self, outcome: StageOutcome, rows: List[int]) -> List[Dict[str, bool]]:
+        """Flags of the targets at *rows*, in canonical order, as the unscheduled chain records them."""
+        rows = np.asarray(rows, dtype=np.int64)
+        outcomes = outcome.outcomes
+        for k, current in enumerate(self.filters):
+            is_reached = np.ones(len(rows), dtype=bool) if self.records_all_flags else np.all(outcomes[:k, rows] != 0, axis=0)
+            missing = rows[is_reached & (outcomes[k, rows] == -1)]
+            if len(missing) > 0:
+                outcomes[k, missing] = self._evaluate(
+                    k, [outcome.targets[row] for row in missing], None if outcome.table is None else FilterBase.rowsOf(outcome.table, missing)
+                )
+        flags = []
+        for row in rows:
+            row_flags = {}
+            for k, current in enumerate(self.filters):
+                row_flags[current.FLAG] = np.bool_(outcomes[k, row])
+                if not self.records_all_flags and not outcomes[k, row]:
+                    break
+            flags.append(row_flags)
+        return flags
+
+    def getOrder(self, required_passes: Optional[int] = None) -> List[int]:
+        """Indexes of the filters by increasing cost per decided target."""
+        required_passes = len(self.filters) if required_passes is None else required_passes
+        # a rejection decides an all-of chain, a pass decides a one-of vote
+        decides_by_rejection = required_passes > len(self.filters) / 2
+
+        def keyOf(k: int):
+            stats = self._stats[k]
+            if stats["evaluated"] == 0:
+                return (0, 0.0, k)
+            pass_rate = stats["passed"] / stats["evaluated"]
+            decisive_rate = 1 - pass_rate if decides_by_rejection else pass_rate
+            return (1, stats["seconds"] / stats["evaluated"] / max(decisive_rate, 1e-6), k)
+
+        return sorted(range(len(self.filters)), key=keyOf)
+
+    def getStats(self) -> List[Dict]:
+        return [
+            dict(stats, filter=type(current).__name__, passRate=stats["passed"] / stats["evaluated"] if stats["evaluated"] else None)
+            for current, stats in zip(self.filters, self._stats)
+        ]
+
+    # MARK: - Private Methods
+
+    def _evaluate(self, k: int, targets: List[InvestmentTarget], table: Optional[TargetTable] = None) -> np.ndarray:
+        current = self.filters[k]
+        start_time = time.perf_counter()
+        mask, _ = current.applyBatch(table if table is not None else FilterBase.tableOf(targets, current.COLUMNS))
+        stats = self._stats[k]
+        stats["seconds"] += time.perf_counter() - start_time
+        stats["evaluated"] += len(targets)
+        stats["passed"] += int(np.count_nonzero(mask))
+        return mask
+
+
+class FilterFlagLedger:
+    """Scheduled stages of one day; writes the flags of the exported targets into their ``additional_info``.
+
+    The flags are inserted where the chain would have written them: after the keys
+    the target had when it entered the filters, before those added later (performance).
+    """
+
+    def __init__(self, targets: List[InvestmentTarget]):
+        self._insert_at: Dict[int, int] = {id(target): len(target.additional_info) for target in targets}
+        self._stages: List[Tuple[FilterScheduler, StageOutcome]] = []
+
+    def addStage(self, scheduler: FilterScheduler, outcome: StageOutcome):
+        self._stages.append((scheduler, outcome))
+
+    def export(self, targets: List[InvestmentTarget]):
+        unique_targets = list({id(target): target for target in targets if id(target) in self._insert_at}.values())
+        flags: Dict[int, dict] = {id(target): {} for target in unique_targets}
+        for scheduler, outcome in self._stages:
+            reached = [target for target in unique_targets if outcome.rowOf(target) is not None]
+            for target, target_flags in zip(reached, scheduler.flagsOf(outcome, [outcome.rowOf(target) for target in reached])):
+                flags[id(target)].update(target_flags)
+        for target in unique_targets:
+            items = list(target.additional_info.items())
+            position = self._insert_at[id(target)]
+            target.additional_info = dict(items[:position] + list(flags[id(target)].items()) + items[position:])
+        # exported once
+        for target in unique_targets:
+            del self._insert_at[id(target)]
@@ -0,0 +1,27 @@
+from src_python.ChaseHoundConfig import ChaseHoundConfig
+from src_python.FilterPipeline import FilterStage
+from src_python.FoundamentalFilters import MarketGapFilter, TurnoverFilter, PriceFilter, LastReportDateFilter
+from src_python.VolatilityFilters import TurnoverSpikeFilter, AtrSpikeFilter, PriceStdSpikeFilter
+from src_python.RightSideFilters import BreakOutDetectionFilter, StructureConfirmationFilter
+from typing import List
+
+
+def buildFilterStages(config: ChaseHoundConfig) -> List[FilterStage]:
+    """The filter stages of the backtest, by their droppedOutAtFilter names.
+
+    Run by the day-by-day loop (``ChaseHoundMain.filterPipeline``) and evaluated on
+    the whole panel by ``CrossSectionalEngine``.  Each stage evaluates its filters in
+    the order of their observed cost and selectivity.
+    """
+    assert config.tunableParams.volatilityFiltersPassingThreshold is not None
+    return [
+        FilterStage("foundamentalFilters", [MarketGapFilter(config), TurnoverFilter(config), PriceFilter(config), LastReportDateFilter(config)]),
+        # k of the 3 spike filters: a target stops being evaluated once its outcome is decided
+        FilterStage(
+            "volatilityFilters", [TurnoverSpikeFilter(config), AtrSpikeFilter(config), PriceStdSpikeFilter(config)],
+            depends_on=["foundamentalFilters"], required_passes=config.tunableParams.volatilityFiltersPassingThreshold, records_all_flags=True,
+        ),
+        FilterStage("rightSideFilters", [BreakOutDetectionFilter(config), StructureConfirmationFilter(config)], depends_on=["volatilityFilters"]),
+        # filter with agents
+        FilterStage("signalLayers", [], depends_on=["rightSideFilters"]),
+    ]
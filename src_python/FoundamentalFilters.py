@@ -1,52 +1,56 @@
-from src_python.FilterBase import FilterBase
+from src_python.FilterBase import FilterBase, TargetTable
 from src_python.ChaseHoundConfig import ChaseHoundConfig
-from src_python.InvestmentTarget import InvestmentTarget
+import numpy as np
 
 
 class MarketGapFilter(FilterBase):
+    FLAG = "didPassMarketCapFilter"
+    COLUMNS = ["latestMarketCap"]
+
     def __init__(self, config: ChaseHoundConfig):
         super().__init__(config)
         assert self.config.tunableParams.lowest_market_cap is not None
 
 
-    def apply(self, target: InvestmentTarget) -> bool:
-        didPass = target.latestMarketCap >= self.config.tunableParams.lowest_market_cap
-        target.additional_info["didPassMarketCapFilter"] = didPass
-        return didPass
+    def evaluate(self, table: TargetTable) -> np.ndarray:
+        return np.asarray(table["latestMarketCap"]) >= self.config.tunableParams.lowest_market_cap
 
 
 
 class TurnoverFilter(FilterBase):
+    FLAG = "didPassTurnoverFilter"
+    COLUMNS = ["previousDayTurnover"]
+
     def __init__(self, config: ChaseHoundConfig):
         super().__init__(config)
         assert self.config.tunableParams.lowest_avg_turnover is not None
         assert self.config.tunableParams.lowest_avg_turnover_days is not None
 
 
-    def apply(self, target: InvestmentTarget) -> bool:
-        didPass = target.previousDayTurnover >= self.config.tunableParams.lowest_avg_turnover
-        target.additional_info["didPassTurnoverFilter"] = didPass
-        return didPass
+    def evaluate(self, table: TargetTable) -> np.ndarray:
+        return np.asarray(table["previousDayTurnover"]) >= self.config.tunableParams.lowest_avg_turnover
 
 
 class PriceFilter(FilterBase):
+    FLAG = "didPassPriceFilter"
+    COLUMNS = ["previousDayClosePrice"]
+
     def __init__(self, config: ChaseHoundConfig):
         super().__init__(config)
         assert self.config.tunableParams.lowest_price is not None
 
-    def apply(self, target: InvestmentTarget) -> bool:
-        didPass = target.previousDayClosePrice >= self.config.tunableParams.lowest_price
-        target.additional_info["didPassPriceFilter"] = didPass
-        return didPass
+    def evaluate(self, table: TargetTable) -> np.ndarray:
+        return np.asarray(table["previousDayClosePrice"]) >= self.config.tunableParams.lowest_price
 
 
 class LastReportDateFilter(FilterBase):
+    FLAG = "didPassLastReportDateFilter"
+    COLUMNS = ["symbol"]
+
     def __init__(self, config: ChaseHoundConfig):
         super().__init__(config)
         assert self.config.tunableParams.latest_report_date_days is not None
 
-    def apply(self, target: InvestmentTarget) -> bool:
+    def evaluate(self, table: TargetTable) -> np.ndarray:
         # return target.latest_report_date - self.absolute_current_date_in_eastern >= self.config.tunableParams.latest_report_date_days
-        didPass = True
-        target.additional_info["didPassLastReportDateFilter"] = didPass
-        return didPass
\ No newline at end of file
+        return np.ones(len(table["symbol"]), dtype=bool)
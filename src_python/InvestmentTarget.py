@@ -1,17 +1,22 @@
-
-
-from src_python.ChaseHoundBase import ChaseHoundBase
+from src_python.CandleFeatures import CandleWindow
 
 
 # Target est tout simplement un symbole que nous prévoyons à investir.
 # Cette classe a été étendue pour calculer et stocker toutes les métriques
 # nécessaires aux différents filtres (fondamentaux, volatilité, right-side).
 
-from typing import Optional
+from typing import Optional, Union
 import pandas as pd
 
 
-class InvestmentTarget(ChaseHoundBase):
+class InvestmentTarget:
+    # thousands per virtual date: no instance dict, and no logger (not a ChaseHoundBase)
+    __slots__ = (
+        "symbol", "previousDayClosePrice", "previousDayVolume", "latestMarketCap", "previousDayTurnover",
+        "_candles", "_candle_window",
+        "turnoverShortTerm", "turnoverLongTerm", "atrShortTerm", "atrLongTerm", "priceStdShortTerm", "priceStdLongTerm",
+        "additional_info",
+    )
 
     def __init__(
         self,
@@ -20,22 +25,24 @@ class InvestmentTarget(ChaseHoundBase):
         previousDayVolume: float,
         latestMarketCap: float,
         previousDayTurnover: float,
-        candles: pd.DataFrame,
+        candles: Optional[pd.DataFrame] = None,
         turnoverShortTerm: float = None,
         turnoverLongTerm: float = None,
         atrShortTerm: float = None,
         atrLongTerm: float = None,
         priceStdShortTerm: float = None,
         priceStdLongTerm: float = None,
+        candle_window: Optional[CandleWindow] = None,
     ):
         """Classe simple pour représenter un titre potentiel d'investissement.
 
         Aucun calcul complexe n'est effectué ici afin de maintenir la classe
         lisible. Tous les indicateurs dérivés sont calculés ailleurs et ajoutés
         dynamiquement aux instances.
-        """
 
-        super().__init__()
+        Les bougies sont soit un DataFrame propre à la cible (*candles*), soit une
+        fenêtre des ``CandleFeatures`` partagées du symbole (*candle_window*), sans copie.
+        """
 
         self.symbol: str = symbol
         self.previousDayClosePrice: float = previousDayClosePrice
@@ -43,8 +50,9 @@ class InvestmentTarget(ChaseHoundBase):
         self.latestMarketCap: float = latestMarketCap
         self.previousDayTurnover: float = previousDayTurnover
 
-        # Historique complet de prix/volume (désormais requis)
-        self.candles: pd.DataFrame = candles
+        # Historique de prix/volume: un DataFrame, ou une fenêtre du store partagé
+        self._candles: Optional[pd.DataFrame] = candles
+        self._candle_window: Optional[CandleWindow] = candle_window
 
         # Les attributs suivants sont maintenant requis à l'initialisation
         self.turnoverShortTerm: float = turnoverShortTerm
@@ -56,6 +64,23 @@ class InvestmentTarget(ChaseHoundBase):
 
         self.additional_info: dict = {}
 
+    @property
+    def candles(self) -> Optional[pd.DataFrame]:
+        """The candle frame; built on each access for a target on a candle window."""
+        if self._candle_window is not None:
+            return self._candle_window.toFrame()
+        return self._candles
+
+    @candles.setter
+    def candles(self, candles: pd.DataFrame):
+        self._candles = candles
+        self._candle_window = None
+
+    @property
+    def candleWindow(self) -> Union[CandleWindow, pd.DataFrame, None]:
+        """The candles, read by column (``window[column]``), without building a frame."""
+        return self._candle_window if self._candle_window is not None else self._candles
+
     # ------------------------------------------------------------------
     # Public helper methods
     # ------------------------------------------------------------------
@@ -0,0 +1,95 @@
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional
+import threading
+import pandas as pd
+
+
+class LruFrameCache:
+    """Symbol → dataframe mapping bounded by the memory the frames use.
+
+    Behaves like the plain dict it replaces (``in``, ``[]``, ``keys`` ...); reading or
+    writing a symbol marks it as most recently used and, once the byte budget is
+    exceeded, the least recently used symbols are evicted.  The most recent frame is
+    always kept, even when it alone is larger than the budget.  With ``max_bytes=None``
+    nothing is ever evicted.
+
+    ``get`` is the lookup used by the price loader: it counts hits and misses.
+    Every operation holds an internal lock, so the cache can be shared between threads.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes: Optional[int] = max_bytes
+        self._frames: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self.current_bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._lock = threading.RLock()
+
+    def __contains__(self, symbol: str) -> bool:
+        with self._lock:
+            return symbol in self._frames
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._frames)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __getitem__(self, symbol: str) -> pd.DataFrame:
+        with self._lock:
+            frame = self._frames[symbol]
+            self._frames.move_to_end(symbol)
+            return frame
+
+    def __setitem__(self, symbol: str, frame: pd.DataFrame):
+        size = LruFrameCache.sizeOf(frame)
+        with self._lock:
+            self.pop(symbol)
+            self._frames[symbol] = frame
+            self._sizes[symbol] = size
+            self.current_bytes += size
+            self._evictIfNeeded()
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._frames.keys())
+
+    def get(self, symbol: str) -> Optional[pd.DataFrame]:
+        with self._lock:
+            if symbol in self._frames:
+                self.hits += 1
+                return self[symbol]
+            self.misses += 1
+            return None
+
+    def pop(self, symbol: str) -> Optional[pd.DataFrame]:
+        with self._lock:
+            if symbol not in self._frames:
+                return None
+            self.current_bytes -= self._sizes.pop(symbol)
+            return self._frames.pop(symbol)
+
+    def getStats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "symbols": len(self._frames),
+                "bytes": self.current_bytes,
+            }
+
+    @staticmethod
+    def sizeOf(frame: pd.DataFrame) -> int:
+        return int(frame.memory_usage(index=True, deep=True).sum()) if frame is not None else 0
+
+    def _evictIfNeeded(self):
+        if self.max_bytes is None:
+            return
+        while self.current_bytes > self.max_bytes and len(self._frames) > 1:
+            oldest_symbol = next(iter(self._frames))
+            self.pop(oldest_symbol)
+            self.evictions += 1
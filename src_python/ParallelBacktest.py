@@ -0,0 +1,77 @@
+from src_python.ChaseHoundBase import ChaseHoundBase
+from src_python.ChaseHoundConfig import ChaseHoundConfig, ChaseHoundTunableParams
+from src_python.CrossSectionalEngine import CrossSectionalEngine
+from src_python.DailyResultsWriter import DailyResultsWriter
+from src_python.DayArtifactStore import DayArtifactStore
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+import math
+import os
+import shutil
+import tempfile
+
+
+def _runDaysTask(args: Tuple[str, ChaseHoundTunableParams, str, List[datetime], List[Optional[datetime]], List[bool], Optional[DayArtifactStore]]) -> List[Dict]:
+    """Worker: evaluate a contiguous range of virtual dates on the shared panel and write their files."""
+    panel_folder_path, tunable_params, results_folder_path, virtual_dates, previous_market_dates, fill_performance, artifacts = args
+    engine = CrossSectionalEngine.openShared(panel_folder_path, ChaseHoundConfig(tunableParams=tunable_params), artifacts)
+    writer = DailyResultsWriter(results_folder_path)
+    summaries = []
+    for day in engine.run(virtual_dates, previous_market_dates, fill_performance):
+        writer.writeDay(day)
+        summaries.append({"virtual_date": day.virtual_date, "results": len(day.main_rows), "best": len(day.best_rows)})
+    return summaries
+
+
+class ParallelBacktest(ChaseHoundBase):
+    """Runs ``CrossSectionalEngine`` over the virtual dates across a process pool.
+
+    The engine's panel is written once with ``CrossSectionalEngine.share`` and
+    memory-mapped read-only by every worker, so the price data is loaded (and held in
+    RAM) once whatever the number of workers.  The dates are split into contiguous
+    ranges, one per worker: each day only depends on the panel, and its files are
+    written by exactly one worker.  The summaries are merged in the order of the
+    given dates, independently of the order in which the workers finish.
+    """
+
+    def __init__(self, engine: CrossSectionalEngine, workers: Optional[int] = None, panel_folder_path: Optional[str] = None):
+        """
+        Args:
+            workers: number of processes, defaults to ``CHASEHOUND_BACKTEST_WORKERS``, else the CPU count.
+            panel_folder_path: where to share the panel, a temporary folder (removed afterwards) if None.
+        """
+        super().__init__()
+        self.engine: CrossSectionalEngine = engine
+        if workers is None and os.getenv("CHASEHOUND_BACKTEST_WORKERS"):
+            workers = int(os.getenv("CHASEHOUND_BACKTEST_WORKERS"))
+        self.workers: int = max(1, workers or os.cpu_count() or 1)
+        self.panel_folder_path: Optional[str] = panel_folder_path
+
+    def run(self, virtual_dates: List[datetime], previous_market_dates: List[Optional[datetime]], fill_performance: List[bool], results_folder_path: str, on_days_written: Optional[Callable[[List[Dict]], None]] = None) -> List[Dict]:
+        """Write the files of every date into *results_folder_path*; return one summary per date, in order.
+
+        *on_days_written* is called with the summaries of each range of dates once its files are written.
+        """
+        is_temporary = self.panel_folder_path is None
+        panel_folder_path = self.panel_folder_path or os.path.join(tempfile.mkdtemp(prefix="chasehound_panel_"), "panel")
+        self.engine.share(panel_folder_path)
+        try:
+            days_per_worker = max(1, math.ceil(len(virtual_dates) / self.workers))
+            tasks = [
+                (panel_folder_path, self.engine.config.tunableParams, results_folder_path,
+                 virtual_dates[i:i + days_per_worker], previous_market_dates[i:i + days_per_worker], fill_performance[i:i + days_per_worker],
+                 self.engine.artifacts)
+                for i in range(0, len(virtual_dates), days_per_worker)
+            ]
+            summaries: List[Dict] = []
+            with ProcessPoolExecutor(max_workers=min(self.workers, max(1, len(tasks)))) as executor:
+                # map yields in submission order: the merge does not depend on scheduling
+                for task_summaries in executor.map(_runDaysTask, tasks):
+                    summaries.extend(task_summaries)
+                    if on_days_written is not None:
+                        on_days_written(task_summaries)
+            return summaries
+        finally:
+            if is_temporary:
+                shutil.rmtree(os.path.dirname(panel_folder_path), ignore_errors=True)
@@ -0,0 +1,212 @@
+from src_python.ChaseHoundBase import ChaseHoundBase
+from src_python.ChaseHoundConfig import ChaseHoundConfig, ChaseHoundTunableParams
+from src_python.CrossSectionalEngine import CrossSectionalEngine
+from src_python.DayArtifactStore import DayArtifactStore
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import argparse
+import copy
+import hashlib
+import itertools
+import json
+import os
+import numpy as np
+import pandas as pd
+
+
+class ParameterSweep(ChaseHoundBase):
+    """Evaluates many ``ChaseHoundTunableParams`` against one loaded panel.
+
+    The candles are loaded and the per-row features computed once.  For each block of
+    virtual dates the two stages (see ``DayArtifactStore.STAGE_PARAMS``) are
+    evaluated once per distinct set of the parameters they read, and only the
+    thresholds are applied per parameter set: a grid over spike thresholds or
+    ``volatilityFiltersPassingThreshold`` costs one evaluation of the windows.
+
+    Every parameter set must cover the same dates (``start_date``, ``end_date``).  The
+    summary has one row per parameter set, over the targets passing all the filters
+    on the dates with a recorded performance:
+
+    - ``selectedTargets``, ``targetsPerDay``,
+    - ``hitRate``: share of them closing above the previous close,
+    - ``meanPerformance``: mean ``currentDayPriceChangePercentage``.
+    """
+
+    def __init__(self, engine: CrossSectionalEngine, virtual_dates: List[datetime], previous_market_dates: List[Optional[datetime]], fill_performance: List[bool]):
+        super().__init__()
+        self.engine: CrossSectionalEngine = engine
+        self.virtual_dates: List[datetime] = virtual_dates
+        self.previous_market_dates: List[Optional[datetime]] = previous_market_dates
+        self.fill_performance: List[bool] = fill_performance
+
+    @staticmethod
+    def expandGrid(grid: Dict[str, List], base: Optional[ChaseHoundTunableParams] = None) -> List[ChaseHoundTunableParams]:
+        """Every combination of the values of *grid*, applied on a copy of *base* (the defaults if None)."""
+        base = base or ChaseHoundTunableParams()
+        param_sets = []
+        for values in itertools.product(*grid.values()):
+            params = copy.deepcopy(base)
+            for name, value in zip(grid.keys(), values):
+                if not hasattr(params, name):
+                    raise ValueError(f"Unknown tunable parameter: {name}")
+                setattr(params, name, value)
+            param_sets.append(params)
+        return param_sets
+
+    @classmethod
+    def fromCache(cls, param_sets: List[ChaseHoundTunableParams]) -> "ParameterSweep":
+        """Sweep over the dates of *param_sets* on the symbols universe and the cached candles, fetched if missing."""
+        # the handlers import the market calendar and yfinance, only needed here
+        from src_python.UsSymbolsHandler import UsSymbolsHandler
+        from src_python.YfinanceHandler import YfinanceHandler
+
+        ParameterSweep._checkSameDates(param_sets)
+        # the widest universe: the market cap filter is applied per parameter set
+        universe_params = copy.deepcopy(param_sets[0])
+        universe_params.lowest_market_cap = min(params.lowest_market_cap for params in param_sets)
+        us_symbols_handler = UsSymbolsHandler(ChaseHoundConfig(tunableParams=universe_params))
+        yfinance_handler = YfinanceHandler()
+        nasdaq_symbols: pd.DataFrame = us_symbols_handler.getNasdaqSymbols()
+
+        start_date = datetime.strptime(str(universe_params.start_date)[:10], "%Y-%m-%d")
+        end_date = datetime.strptime(str(universe_params.end_date)[:10], "%Y-%m-%d")
+        lookback_days = 3 * max(int(params.lowest_avg_turnover_days) for params in param_sets)
+        yfinance_handler.loadFromRamOrAsyncFetchHistoryPricesOf(
+            nasdaq_symbols["symbol"].tolist() + [CrossSectionalEngine.INDEX_SYMBOL],
+            start_date - timedelta(days=lookback_days + 7),
+            end_date + timedelta(days=7),
+            "1d"
+        )
+        histories = {
+            symbol: yfinance_handler.getCachedHistoryOf(symbol)
+            for symbol in nasdaq_symbols["symbol"].tolist() + [CrossSectionalEngine.INDEX_SYMBOL]
+        }
+        universe_digest = hashlib.sha256(nasdaq_symbols[["symbol", "marketCap"]].to_csv(index=False).encode("utf-8")).hexdigest()[:16]
+        artifacts = None
+        if os.environ.get("CHASEHOUND_DAY_ARTIFACTS", "1") != "0":
+            artifacts = DayArtifactStore(f"{yfinance_handler.getDataVersion()}-{universe_digest}")
+        yfinance_handler.shutdown()
+
+        virtual_dates = []
+        virtual_date = end_date
+        while virtual_date is not None and virtual_date >= start_date:
+            virtual_dates.append(virtual_date)
+            virtual_date = us_symbols_handler.getPreviousMarketOpenDate(virtual_date)
+        engine = CrossSectionalEngine(ChaseHoundConfig(tunableParams=universe_params), nasdaq_symbols, histories, artifacts=artifacts)
+        return cls(
+            engine,
+            virtual_dates,
+            [us_symbols_handler.getPreviousMarketOpenDate(virtual_date) for virtual_date in virtual_dates],
+            [not us_symbols_handler.doesDateReferToPrediction(virtual_date) for virtual_date in virtual_dates],
+        )
+
+    # MARK: - Public Methods
+
+    def run(self, param_sets: List[ChaseHoundTunableParams]) -> pd.DataFrame:
+        """Summary of every parameter set, in the given order, with the parameters that differ between them."""
+        ParameterSweep._checkSameDates(param_sets)
+        totals = np.zeros((len(param_sets), 4))  # days, selected, hits, performance sum
+        # parameter sets sharing the right-side conditions one after the other
+        order = sorted(range(len(param_sets)), key=lambda index: json.dumps(DayArtifactStore.stageParamsOf("rightSide", param_sets[index]), sort_keys=True))
+        universe = slice(0, self.engine.universe_size)
+        for block_start in range(0, len(self.virtual_dates), self.engine.DAYS_PER_BLOCK):
+            block = slice(block_start, block_start + self.engine.DAYS_PER_BLOCK)
+            stage_results: Dict[str, Dict[str, np.ndarray]] = {}
+            for index in order:
+                self.engine.setTunableParams(param_sets[index])
+                days = self.engine.evaluate(self.virtual_dates[block], self.previous_market_dates[block], self.fill_performance[block], stage_results)
+                performance = days["currentDayPriceChangePercentage"][:, universe]
+                has_performance = days["hasPerformance"][:, universe]
+                selected = days["included"][:, universe] & days["passedAllFilters"][:, universe] & has_performance & np.isfinite(performance)
+                totals[index] += [
+                    np.count_nonzero(np.any(has_performance, axis=1)),
+                    np.count_nonzero(selected),
+                    np.count_nonzero(selected & (performance > 0)),
+                    np.sum(performance, where=selected),
+                ]
+        return ParameterSweep._toSummary(param_sets, totals)
+
+    # MARK: - Private Methods
+
+    @staticmethod
+    def _toSummary(param_sets: List[ChaseHoundTunableParams], totals: np.ndarray) -> pd.DataFrame:
+        canonicals = [params.toCanonicalDict() for params in param_sets]
+        varying = [name for name in canonicals[0] if len({json.dumps(canonical[name], default=str) for canonical in canonicals}) > 1]
+        summary = pd.DataFrame([{name: canonical[name] for name in varying} for canonical in canonicals], index=range(len(param_sets)))
+        summary["paramsHash"] = [params.canonicalHash() for params in param_sets]
+        days, selected, hits, performance_sums = totals.T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            summary["days"] = days.astype(int)
+            summary["selectedTargets"] = selected.astype(int)
+            summary["targetsPerDay"] = selected / days
+            summary["hitRate"] = hits / selected
+            summary["meanPerformance"] = performance_sums / selected
+        return summary
+
+    @staticmethod
+    def _checkSameDates(param_sets: List[ChaseHoundTunableParams]):
+        if len(param_sets) == 0:
+            raise ValueError("No parameter set to sweep")
+        dates = {(str(params.start_date)[:10], str(params.end_date)[:10]) for params in param_sets}
+        if len(dates) > 1:
+            raise ValueError(f"The parameter sets of a sweep must cover the same dates, got {sorted(dates)}")
+
+
+# MARK: - Command Line
+
+def _parseGridArgument(text: str) -> tuple:
+    """``name=v1,v2,...`` -> (name, [values]), typed after the default value of the parameter."""
+    name, _, values = text.partition("=")
+    default = getattr(ChaseHoundTunableParams(), name, None)
+    if default is None or not values:
+        raise argparse.ArgumentTypeError(f"expected <tunable parameter>=<value>,<value>..., got {text!r}")
+    return name, [_parseGridValue(name, default, value) for value in values.split(",")]
+
+
+def _parseGridValue(name: str, default, text: str):
+    """*text* as a value of the parameter *name*.
+
+    Numbers are read as floats (``5e7`` included): some parameters annotated float
+    default to an int (``lowest_market_cap``), so an int default only makes integral
+    values ints.  Booleans are ``true`` / ``false`` (or 1 / 0), not ``bool(text)``.
+    """
+    if isinstance(default, bool):
+        if text.strip().lower() not in ("true", "false", "1", "0"):
+            raise argparse.ArgumentTypeError(f"expected true or false for {name}, got {text!r}")
+        return text.strip().lower() in ("true", "1")
+    if isinstance(default, (int, float)):
+        try:
+            value = float(text)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"expected a number for {name}, got {text!r}")
+        return int(value) if isinstance(default, int) and value.is_integer() else value
+    return type(default)(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest many ChaseHoundTunableParams on one loaded dataset")
+    parser.add_argument("--grid", type=_parseGridArgument, action="append", default=[], metavar="NAME=V1,V2,...",
+                        help="values of one parameter, the sets are the product of every --grid")
+    parser.add_argument("--params-file", default=None,
+                        help="json list of parameter overrides, each one the base of the grid (default: the defaults)")
+    parser.add_argument("--output", default=None, help="csv file of the summary")
+    args = parser.parse_args()
+
+    bases = [ChaseHoundTunableParams()]
+    if args.params_file:
+        with open(args.params_file, "r", encoding="utf-8") as file:
+            bases = [ParameterSweep.expandGrid({name: [value] for name, value in overrides.items()})[0] for overrides in json.load(file)]
+    grid = dict(args.grid)
+    param_sets = [params for base in bases for params in ParameterSweep.expandGrid(grid, base)]
+
+    sweep = ParameterSweep.fromCache(param_sets)
+    print(f"Sweeping {len(param_sets)} parameter sets over {len(sweep.virtual_dates)} virtual dates")
+    summary = sweep.run(param_sets)
+    print(summary.to_string())
+    if args.output:
+        summary.to_csv(args.output, index=False)
+        print(f"Summary written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+from src_python.ChaseHoundBase import ChaseHoundBase
+from datetime import datetime
+from typing import Dict, List, Optional
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+
+
+class PricePanel:
+    """Dense (symbols × trading days × fields) view over OHLCV candles.
+
+    Missing candles are ``NaN``.  Date slicing returns another ``PricePanel``
+    whose ``values`` is a view of the same (possibly memory-mapped) buffer.
+    """
+
+    def __init__(self, symbols: List[str], dates: pd.DatetimeIndex, fields: List[str], values: np.ndarray):
+        assert values.shape == (len(symbols), len(dates), len(fields))
+        self.symbols: List[str] = list(symbols)
+        self.dates: pd.DatetimeIndex = pd.DatetimeIndex(dates)
+        self.fields: List[str] = list(fields)
+        self.values: np.ndarray = values
+
+        self.symbolIndex: Dict[str, int] = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.fieldIndex: Dict[str, int] = {field: i for i, field in enumerate(self.fields)}
+
+    def sliceDates(self, from_date: datetime, to_date: datetime) -> "PricePanel":
+        """Zero-copy slice of every symbol on ``[from_date, to_date]``."""
+        start = self.dates.searchsorted(from_date, side="left")
+        end = self.dates.searchsorted(to_date, side="right")
+        return PricePanel(self.symbols, self.dates[start:end], self.fields, self.values[:, start:end, :])
+
+    def field(self, name: str) -> np.ndarray:
+        """(symbols × dates) view of one field."""
+        return self.values[:, :, self.fieldIndex[name]]
+
+    def rowOf(self, symbol: str) -> Optional[int]:
+        return self.symbolIndex.get(symbol)
+
+    def frameOf(self, symbol: str) -> Optional[pd.DataFrame]:
+        """Rebuild the candles of one symbol as a dataframe (copies, drops missing days)."""
+        row = self.rowOf(symbol)
+        if row is None:
+            return None
+        data = pd.DataFrame(self.values[row], columns=self.fields)
+        data.insert(0, "date", self.dates)
+        return data[data[self.fields].notna().any(axis=1)].reset_index(drop=True)
+
+
+class PricePanelStore(ChaseHoundBase):
+    """On-disk panel: ``values.npy`` (memory-mapped read-only) plus ``index.json``.
+
+    ``index.json`` holds the symbol → row and date → column order and the field names.
+    A rebuild is written to a sibling folder and swapped in afterwards so that readers
+    never see a half-written panel.
+    """
+
+    DEFAULT_FIELDS: List[str] = ["open", "high", "low", "close", "volume", "turnover"]
+
+    def __init__(self, folder_path: str):
+        super().__init__()
+        self.folder_path: str = folder_path
+
+    @property
+    def values_path(self) -> str:
+        return os.path.join(self.folder_path, "values.npy")
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.folder_path, "index.json")
+
+    def exists(self) -> bool:
+        return os.path.exists(self.values_path) and os.path.exists(self.index_path)
+
+    def build(self, frames: Dict[str, pd.DataFrame], fields: Optional[List[str]] = None) -> PricePanel:
+        """Write a panel from per-symbol candle dataframes (with a ``date`` column) and open it."""
+        fields = fields or PricePanelStore.DEFAULT_FIELDS
+        frames = {symbol: frame for symbol, frame in frames.items() if frame is not None and len(frame) > 0}
+        symbols = sorted(frames.keys())
+        dates = pd.DatetimeIndex(np.unique(np.concatenate(
+            [pd.to_datetime(frame["date"]).to_numpy(dtype="datetime64[ns]") for frame in frames.values()]
+        ))) if frames else pd.DatetimeIndex([])
+
+        temp_folder_path = self.folder_path + ".tmp"
+        if os.path.exists(temp_folder_path):
+            shutil.rmtree(temp_folder_path)
+        os.makedirs(temp_folder_path)
+
+        values = np.lib.format.open_memmap(
+            os.path.join(temp_folder_path, "values.npy"), mode="w+", dtype=np.float64,
+            shape=(len(symbols), len(dates), len(fields)),
+        )
+        values[:] = np.nan
+        for row, symbol in enumerate(symbols):
+            frame = frames[symbol]
+            frame = frame[~pd.to_datetime(frame["date"]).duplicated(keep="last")]
+            columns = dates.get_indexer(pd.to_datetime(frame["date"]))
+            for k, field in enumerate(fields):
+                if field in frame.columns:
+                    values[row, columns, k] = frame[field].to_numpy(dtype=np.float64)
+        values.flush()
+        del values
+
+        with open(os.path.join(temp_folder_path, "index.json"), "w", encoding="utf-8") as file:
+            json.dump({
+                "symbols": symbols,
+                "dates": [date.isoformat() for date in dates],
+                "fields": fields,
+                "builtAt": self.latest_absolute_current_time_in_eastern.strftime("%Y%m%d%H%M%S"),
+            }, file)
+
+        if os.path.exists(self.folder_path):
+            shutil.rmtree(self.folder_path)
+        os.replace(temp_folder_path, self.folder_path)
+        return self.open()
+
+    def open(self) -> Optional[PricePanel]:
+        """Memory-map the stored panel read-only, or return None if it has not been built."""
+        if not self.exists():
+            return None
+        with open(self.index_path, "r", encoding="utf-8") as file:
+            index = json.load(file)
+        values = np.load(self.values_path, mmap_mode="r")
+        return PricePanel(index["symbols"], pd.to_datetime(index["dates"]), index["fields"], values)
@@ -0,0 +1,139 @@
+from src_python.ChaseHoundBase import ChaseHoundBase
+from src_python.ChaseHoundConfig import ChaseHoundTunableParams
+from typing import Dict, List, Optional
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+
+class ResultCache(ChaseHoundBase):
+    """Persistent cache of whole backtest outputs, keyed by the parameters and the data version.
+
+    An entry is a folder ``cache/ResultCache/<key>/`` holding a copy of every file a
+    run left in ``temp`` (per-day csv files, plots, checkpoint) and ``entry.json``
+    (parameters, data version, size, creation and last access times).  Entries are
+    written to a sibling folder and swapped in, so a reader never sees half an entry.
+
+    Eviction, after every ``put``:
+
+    - entries created more than *max_age_seconds* ago are removed,
+    - then the least recently used entries until the total is under *max_bytes*.
+    """
+
+    ENTRY_FILE_NAME: str = "entry.json"
+
+    def __init__(self, folder_path: Optional[str] = None, max_bytes: Optional[int] = None, max_age_seconds: Optional[float] = None):
+        """
+        Args:
+            max_bytes: defaults to ``CHASEHOUND_RESULT_CACHE_MAX_MB`` (512 MB).
+            max_age_seconds: defaults to ``CHASEHOUND_RESULT_CACHE_MAX_AGE_DAYS`` (7 days).
+        """
+        super().__init__()
+        self.folder_path: str = folder_path or os.path.join(self.project_root, "cache", "ResultCache")
+        self.max_bytes: int = max_bytes if max_bytes is not None else int(float(os.getenv("CHASEHOUND_RESULT_CACHE_MAX_MB", "512")) * 1024 * 1024)
+        self.max_age_seconds: float = max_age_seconds if max_age_seconds is not None else float(os.getenv("CHASEHOUND_RESULT_CACHE_MAX_AGE_DAYS", "7")) * 86400
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {"hits": 0, "misses": 0, "puts": 0, "evictions": 0}
+
+    @staticmethod
+    def keyOf(params: ChaseHoundTunableParams, data_version: str) -> str:
+        """Canonical hash of the parameters (see ``ChaseHoundTunableParams.toCanonicalDict``) and the data version."""
+        return hashlib.sha256(f"{params.canonicalHash()}-{data_version}".encode("utf-8")).hexdigest()[:24]
+
+    # MARK: - Public Methods
+
+    def restore(self, key: str, target_folder_path: str) -> bool:
+        """Copy the files of entry *key* into *target_folder_path* (emptied first); False on a miss."""
+        with self._lock:
+            entry = self._readEntry(key)
+            if entry is None or self._isExpired(entry):
+                self._stats["misses"] += 1
+                return False
+            if os.path.exists(target_folder_path):
+                shutil.rmtree(target_folder_path)
+            shutil.copytree(self._entryFolderOf(key), target_folder_path, ignore=shutil.ignore_patterns(ResultCache.ENTRY_FILE_NAME))
+            entry["lastAccessAt"] = time.time()
+            self._writeEntry(self._entryFolderOf(key), entry)
+            self._stats["hits"] += 1
+            return True
+
+    def put(self, key: str, source_folder_path: str, metadata: Optional[dict] = None):
+        """Store a copy of the files of *source_folder_path* as entry *key*, then evict."""
+        with self._lock:
+            entry_folder_path = self._entryFolderOf(key)
+            temp_folder_path = entry_folder_path + ".tmp"
+            if os.path.exists(temp_folder_path):
+                shutil.rmtree(temp_folder_path)
+            shutil.copytree(source_folder_path, temp_folder_path)
+            now = time.time()
+            entry = dict(metadata or {})
+            entry.update({"key": key, "createdAt": now, "lastAccessAt": now, "bytes": ResultCache._sizeOf(temp_folder_path)})
+            self._writeEntry(temp_folder_path, entry)
+            if os.path.exists(entry_folder_path):
+                shutil.rmtree(entry_folder_path)
+            os.replace(temp_folder_path, entry_folder_path)
+            self._stats["puts"] += 1
+            self._evict()
+
+    def keys(self) -> List[str]:
+        if not os.path.isdir(self.folder_path):
+            return []
+        return sorted(name for name in os.listdir(self.folder_path) if os.path.exists(os.path.join(self.folder_path, name, ResultCache.ENTRY_FILE_NAME)))
+
+    def getStats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = [entry for entry in (self._readEntry(key) for key in self.keys()) if entry is not None]
+            return dict(self._stats, entries=len(entries), bytes=sum(entry["bytes"] for entry in entries))
+
+    # MARK: - Private Methods
+
+    def _evict(self):
+        entries = [entry for entry in (self._readEntry(key) for key in self.keys()) if entry is not None]
+        kept = []
+        for entry in entries:
+            if self._isExpired(entry):
+                self._remove(entry["key"])
+            else:
+                kept.append(entry)
+        # least recently used first
+        kept.sort(key=lambda entry: entry["lastAccessAt"])
+        total_bytes = sum(entry["bytes"] for entry in kept)
+        while kept and total_bytes > self.max_bytes:
+            entry = kept.pop(0)
+            total_bytes -= entry["bytes"]
+            self._remove(entry["key"])
+
+    def _remove(self, key: str):
+        shutil.rmtree(self._entryFolderOf(key), ignore_errors=True)
+        self._stats["evictions"] += 1
+
+    def _isExpired(self, entry: dict) -> bool:
+        return time.time() - entry["createdAt"] > self.max_age_seconds
+
+    def _entryFolderOf(self, key: str) -> str:
+        return os.path.join(self.folder_path, key)
+
+    def _readEntry(self, key: str) -> Optional[dict]:
+        path = os.path.join(self._entryFolderOf(key), ResultCache.ENTRY_FILE_NAME)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError) as e:
+            self.log_warning(f"Ignoring unreadable result cache entry {path}: {e}")
+            return None
+
+    @staticmethod
+    def _writeEntry(entry_folder_path: str, entry: dict):
+        temp_path = os.path.join(entry_folder_path, ResultCache.ENTRY_FILE_NAME + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(entry, file, indent=2, default=str)
+        os.replace(temp_path, os.path.join(entry_folder_path, ResultCache.ENTRY_FILE_NAME))
+
+    @staticmethod
+    def _sizeOf(folder_path: str) -> int:
+        return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(folder_path) for name in names)
@@ -1,9 +1,39 @@
-from src_python.FilterBase import FilterBase
+from src_python.FilterBase import FilterBase, TargetTable
 from src_python.ChaseHoundConfig import ChaseHoundConfig
-from src_python.InvestmentTarget import InvestmentTarget
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+
+
+def tailsOf(candles: np.ndarray, columns: List[str], lookback: int) -> Dict[str, np.ndarray]:
+    """Last *lookback* rows of each frame (or ``CandleWindow``), as ``frame.iloc[-lookback:]`` selects them, in (targets × rows) arrays.
+
+    Shorter windows are padded with NaN on the left: every condition of the
+    right-side filters is False on a NaN row, as on a missing one.  The tails are
+    sliced per target (each symbol has its own arrays, a ``CandleWindow`` column
+    being a view of them), then scattered into each matrix at once.
+    """
+    window = slice(-lookback, None)
+    tails = {column: [np.asarray(frame[column], dtype=np.float64)[window] for frame in candles] for column in columns}
+    lengths = np.array([len(values) for values in tails[columns[0]]], dtype=np.int64)
+    width = int(lengths.max()) if len(lengths) > 0 else 0
+    # (row, column) of every tail value, right-aligned
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    offsets = np.arange(int(lengths.sum())) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    positions = np.repeat(width - lengths, lengths) + offsets
+    matrices = {}
+    for column, values in tails.items():
+        matrix = np.full((len(lengths), width), np.nan)
+        if len(rows) > 0:
+            matrix[rows, positions] = np.concatenate(values)
+        matrices[column] = matrix
+    return matrices
 
 
 class BreakOutDetectionFilter(FilterBase):
+    FLAG = "didPassBreakoutDetectionFilter"
+    COLUMNS = ["candles"]
+
     def __init__(self, config: ChaseHoundConfig):
         super().__init__(config)
         assert self.config.tunableParams.breakoutDetectionDaysLookback is not None
@@ -11,31 +41,27 @@ class BreakOutDetectionFilter(FilterBase):
         assert self.config.tunableParams.breakoutDetectionVolumeAugmentationRatioThreshold is not None
         assert self.config.tunableParams.breakoutDetectionMaTolerance is not None
 
-    def apply(self, target: InvestmentTarget) -> bool:
-        didPass = False
-        for index, raw in target.candles.iloc[-self.config.tunableParams.breakoutDetectionDaysLookback:].iterrows():
-            didAugumentEnoughByPrice = raw["close"] > raw["open"]
-            didAugumentEnoughByRatio = (raw["close"] - raw["open"]) / raw["open"] >= self.config.tunableParams.breakoutDetectionPriceRatioThreshold
-            didAugumentEnoughByVolume = raw["volume"] > raw["volumeAvg20d"] * self.config.tunableParams.breakoutDetectionVolumeAugmentationRatioThreshold
-            if didAugumentEnoughByPrice or didAugumentEnoughByRatio or didAugumentEnoughByVolume:
-                didPass = True
-                break
-        target.additional_info["didPassBreakoutDetectionFilter"] = didPass
-        return didPass
+    def evaluate(self, table: TargetTable) -> np.ndarray:
+        # any candle of the lookback rising (by price or by ratio) or trading a volume surge
+        tails = tailsOf(table["candles"], ["open", "close", "volume", "volumeAvg20d"], self.config.tunableParams.breakoutDetectionDaysLookback)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            didAugumentEnoughByPrice = tails["close"] > tails["open"]
+            didAugumentEnoughByRatio = (tails["close"] - tails["open"]) / tails["open"] >= self.config.tunableParams.breakoutDetectionPriceRatioThreshold
+            didAugumentEnoughByVolume = tails["volume"] > tails["volumeAvg20d"] * self.config.tunableParams.breakoutDetectionVolumeAugmentationRatioThreshold
+        return np.any(didAugumentEnoughByPrice | didAugumentEnoughByRatio | didAugumentEnoughByVolume, axis=1)
 
 
 class StructureConfirmationFilter(FilterBase):
+    FLAG = "didPassStructureConfirmationFilter"
+    COLUMNS = ["candles"]
+
     def __init__(self, config: ChaseHoundConfig):
         super().__init__(config)
         assert self.config.tunableParams.structureConfirmationMaTolerance is not None
         
         
-    def apply(self, target: InvestmentTarget) -> bool:
-        didPass = True
-        for index, raw in target.candles.iloc[-self.config.tunableParams.structureConfirmationDaysLookback:].iterrows():
-            if raw["close"] < raw["ma_20"] * self.config.tunableParams.structureConfirmationMaTolerance:
-                didPass = False
-                break
-        target.additional_info["didPassStructureConfirmationFilter"] = didPass
-        return didPass
-
+    def evaluate(self, table: TargetTable) -> np.ndarray:
+        # no candle of the lookback closing under its 20-day average (with tolerance)
+        tails = tailsOf(table["candles"], ["close", "ma_20"], self.config.tunableParams.structureConfirmationDaysLookback)
+        with np.errstate(invalid="ignore"):
+            return ~np.any(tails["close"] < tails["ma_20"] * self.config.tunableParams.structureConfirmationMaTolerance, axis=1)
@@ -0,0 +1,31 @@
+import multiprocessing
+import os
+import shutil
+import stat
+import subprocess
+
+
+SUBMODULES_FOLDER: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "submodules")
+
+
+def updateSubmodules():
+    """Clone the latest LLMTrader and US-Stock-Symbols into ``submodules``, replacing the previous clones.
+
+    Called by the entry points, before importing the modules reading the clones
+    (``YfinanceHandler`` imports from LLMTrader).  Does nothing in a child process:
+    the spawned workers of ``ParallelBacktest`` re-import the parent's main module,
+    and would delete the folder while the parent and the other workers import from it.
+    """
+    if multiprocessing.parent_process() is not None:
+        return
+    if os.path.exists(SUBMODULES_FOLDER):
+        def _handle_remove_readonly(func, path, exc_info):
+            try:
+                os.chmod(path, stat.S_IWRITE)
+                func(path)
+            except Exception:
+                raise
+        shutil.rmtree(SUBMODULES_FOLDER, onerror=_handle_remove_readonly)
+    os.makedirs(SUBMODULES_FOLDER, exist_ok=True)
+    subprocess.run(["git", "clone", "--single-branch", "--branch", "main_lightweight", "--depth", "1", "https://github.com/huyuu/LLMTrader.git", os.path.join(SUBMODULES_FOLDER, "LLMTrader")])
+    subprocess.run(["git", "clone", "--depth", "1", "https://github.com/rreichel3/US-Stock-Symbols.git", os.path.join(SUBMODULES_FOLDER, "us_stock_symbols")])
@@ -1,9 +1,12 @@
-from src_python.FilterBase import FilterBase
+from src_python.FilterBase import FilterBase, TargetTable
 from src_python.ChaseHoundConfig import ChaseHoundConfig
-from src_python.InvestmentTarget import InvestmentTarget
+import numpy as np
 
 
 class TurnoverSpikeFilter(FilterBase):
+    FLAG = "didPassTurnoverSpikeFilter"
+    COLUMNS = ["turnoverShortTerm", "turnoverLongTerm"]
+
     def __init__(self, config: ChaseHoundConfig):
         super().__init__(config)
         assert self.config.tunableParams.turnoverSpikeThreshold is not None
@@ -12,12 +15,14 @@ class TurnoverSpikeFilter(FilterBase):
         assert self.config.tunableParams.turnoverShortTermDays <= self.config.tunableParams.turnoverLongTermDays
 
 
-    def apply(self, target: InvestmentTarget) -> bool:
-        didPass = target.turnoverShortTerm / target.turnoverLongTerm >= self.config.tunableParams.turnoverSpikeThreshold
-        target.additional_info["didPassTurnoverSpikeFilter"] = didPass
-        return didPass
+    def evaluate(self, table: TargetTable) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.asarray(table["turnoverShortTerm"]) / np.asarray(table["turnoverLongTerm"]) >= self.config.tunableParams.turnoverSpikeThreshold
 
 class AtrSpikeFilter(FilterBase):
+    FLAG = "didPassAtrSpikeFilter"
+    COLUMNS = ["atrShortTerm", "atrLongTerm"]
+
     def __init__(self, config: ChaseHoundConfig):
         super().__init__(config)
         assert self.config.tunableParams.atrSpikeThreshold is not None
@@ -26,13 +31,15 @@ class AtrSpikeFilter(FilterBase):
         assert self.config.tunableParams.atrShortTermDays <= self.config.tunableParams.atrLongTermDays
 
 
-    def apply(self, target: InvestmentTarget) -> bool:
-        didPass = target.atrShortTerm / target.atrLongTerm >= self.config.tunableParams.atrSpikeThreshold
-        target.additional_info["didPassAtrSpikeFilter"] = didPass
-        return didPass
+    def evaluate(self, table: TargetTable) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.asarray(table["atrShortTerm"]) / np.asarray(table["atrLongTerm"]) >= self.config.tunableParams.atrSpikeThreshold
 
 
 class PriceStdSpikeFilter(FilterBase):
+    FLAG = "didPassPriceStdSpikeFilter"
+    COLUMNS = ["priceStdShortTerm", "priceStdLongTerm"]
+
     def __init__(self, config: ChaseHoundConfig):
         super().__init__(config)
         assert self.config.tunableParams.priceStdSpikeThreshold is not None
@@ -40,10 +47,9 @@ class PriceStdSpikeFilter(FilterBase):
         assert self.config.tunableParams.priceStdLongTermDays is not None
         assert self.config.tunableParams.priceStdShortTermDays <= self.config.tunableParams.priceStdLongTermDays
 
-    def apply(self, target: InvestmentTarget) -> bool:
-        didPass = target.priceStdShortTerm / target.priceStdLongTerm >= self.config.tunableParams.priceStdSpikeThreshold
-        target.additional_info["didPassPriceStdSpikeFilter"] = didPass
-        return didPass
+    def evaluate(self, table: TargetTable) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.asarray(table["priceStdShortTerm"]) / np.asarray(table["priceStdLongTerm"]) >= self.config.tunableParams.priceStdSpikeThreshold
 
 
 
@@ -0,0 +1,79 @@
+from src_python.ChaseHoundBase import ChaseHoundBase
+from datetime import datetime
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+# Optional multi-ticker download backend
+try:
+    import yfinance as yf
+    _HAS_YFINANCE = True
+except ImportError:
+    yf = None
+    _HAS_YFINANCE = False
+
+
+class YfinanceBatchDownloader(ChaseHoundBase):
+    """Downloads the candles of many tickers in one ``yfinance.download`` call.
+
+    The combined response is split into one frame per ticker, in the same layout as
+    the frames returned by ``TradingViewHandler.fetch_history_data_of`` (lower-case
+    OHLCV columns, a ``date`` column and the derived volatility / moving-average
+    columns computed over the fetched window), so that both can share the cache.
+    Tickers missing from the response map to None and are left to the caller.
+    """
+
+    def __init__(self):
+        super().__init__()
+
+    @staticmethod
+    def isAvailable() -> bool:
+        return _HAS_YFINANCE
+
+    def download(self, symbols: List[str], from_date: datetime, to_date: datetime, interval: str) -> Dict[str, Optional[pd.DataFrame]]:
+        """Candles of *symbols* on ``[from_date, to_date)`` (``to_date`` excluded, as in yfinance)."""
+        downloaded = yf.download(
+            symbols, start=from_date, end=to_date, interval=interval,
+            group_by="ticker", auto_adjust=True, threads=False, progress=False,
+        )
+        if downloaded is None or len(downloaded) == 0:
+            return {symbol: None for symbol in symbols}
+        return {symbol: YfinanceBatchDownloader.splitDownload(downloaded, symbol) for symbol in symbols}
+
+    @staticmethod
+    def splitDownload(downloaded: pd.DataFrame, symbol: str) -> Optional[pd.DataFrame]:
+        """Extract one ticker from a ``group_by="ticker"`` download and convert it to the upstream layout."""
+        if isinstance(downloaded.columns, pd.MultiIndex):
+            if symbol not in downloaded.columns.get_level_values(0):
+                return None
+            data = downloaded[symbol]
+        else:
+            data = downloaded
+        return YfinanceBatchDownloader.toUpstreamFormat(data)
+
+    @staticmethod
+    def toUpstreamFormat(data: pd.DataFrame) -> Optional[pd.DataFrame]:
+        data = data.rename(columns=lambda column: str(column).lower())
+        if not {"open", "low", "high", "close", "volume"}.issubset(data.columns):
+            return None
+        data = data.dropna(subset=["open", "low", "high", "close"], how="all")
+        if len(data) == 0:
+            return None
+
+        dates = pd.DatetimeIndex(data.index)
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+        data = pd.DataFrame({
+            "date": dates,
+            "open": data["open"].to_numpy(dtype=np.float64),
+            "low": data["low"].to_numpy(dtype=np.float64),
+            "high": data["high"].to_numpy(dtype=np.float64),
+            "close": data["close"].to_numpy(dtype=np.float64),
+            "volume": data["volume"].fillna(0).to_numpy().astype(np.int64),
+        })
+        data["daily_volatility_percentage"] = (data["high"] - data["low"]) / data["close"] * 100
+        data["20_days_moving_average_of_close_price"] = data["close"].rolling(window=20).mean()
+        data["60_days_moving_average_of_close_price"] = data["close"].rolling(window=60).mean()
+        data["20_days_moving_average_of_volume"] = data["volume"].rolling(window=20).mean()
+        data["60_days_moving_average_of_volume"] = data["volume"].rolling(window=60).mean()
+        return data
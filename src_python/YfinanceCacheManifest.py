@@ -0,0 +1,227 @@
+from src_python.ChaseHoundBase import ChaseHoundBase
+from src_python.CacheHandlable import CacheHandlable
+from src_python.YfinanceCacheTools import (
+    getTemporaryPath,
+    isSegmentFile,
+    listLiveCacheFiles,
+    listSymbolDirectories,
+)
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+import hashlib
+import json
+import os
+import threading
+import pandas as pd
+
+
+class YfinanceCacheManifest(ChaseHoundBase):
+    """Single ``manifest.json`` describing the live cache files of every symbol.
+
+    For each symbol the manifest lists the latest full file followed by its delta
+    segments (oldest first) with the date range and row count of the data they
+    hold, a checksum of the file and its size and modification time.  Startup and
+    coverage checks are answered from it, without listing symbol directories or
+    opening data files.
+
+    The manifest is only a cache of what is on disk: a missing or outdated manifest
+    is rebuilt from the directories, and the first query of a symbol stats its files
+    and rescans it if one of them disappeared or no longer has the recorded size and
+    modification time.  Updates and saves are serialised by an internal lock.
+    """
+
+    FILE_NAME: str = "manifest.json"
+    VERSION: int = 2
+
+    def __init__(self, cache_folder: str):
+        super().__init__()
+        self.cache_folder: str = cache_folder
+        self._symbols: Dict[str, List[Dict]] = {}
+        # symbols whose entries were checked against their files since the manifest was loaded
+        self._verified_symbols: Set[str] = set()
+        self._is_loaded: bool = False
+        self._is_dirty: bool = False
+        self._lock = threading.RLock()
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.cache_folder, YfinanceCacheManifest.FILE_NAME)
+
+    @property
+    def is_dirty(self) -> bool:
+        return self._is_dirty
+
+    @property
+    def symbols(self) -> List[str]:
+        self.ensureLoaded()
+        return sorted(self._symbols.keys())
+
+    def __contains__(self, symbol: str) -> bool:
+        self.ensureLoaded()
+        return symbol in self._symbols
+
+    # MARK: - Load / Save
+
+    def ensureLoaded(self):
+        """Read the manifest on first use, or build it from the cache tree when there is none yet."""
+        if self._is_loaded:
+            return
+        with self._lock:
+            if self._is_loaded:
+                return
+            if not self.load():
+                self.rebuild()
+                self.save()
+
+    def load(self) -> bool:
+        """Read ``manifest.json``; returns False when it is missing, unreadable or of another version."""
+        content = None
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as file:
+                    content = json.load(file)
+            except (OSError, ValueError) as e:
+                self.log_warning(f"Ignoring unreadable cache manifest {self.path}: {e}")
+        is_valid = content is not None and content.get("version") == YfinanceCacheManifest.VERSION
+        with self._lock:
+            if is_valid:
+                self._symbols = content.get("symbols", {})
+                self._verified_symbols = set()
+                self._is_dirty = False
+            self._is_loaded = True
+        return is_valid
+
+    def save(self):
+        """Atomically write the manifest if anything changed since the last save."""
+        with self._lock:
+            if not self._is_dirty:
+                return
+            os.makedirs(self.cache_folder, exist_ok=True)
+            temp_path = getTemporaryPath(self.path)
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump({"version": YfinanceCacheManifest.VERSION, "symbols": self._symbols}, file, separators=(",", ":"))
+            os.replace(temp_path, self.path)
+            self._is_dirty = False
+
+    def rebuild(self, symbols: Optional[List[str]] = None):
+        """Rescan *symbols* (default: the whole tree, dropping symbols that no longer exist)."""
+        with self._lock:
+            if symbols is None:
+                symbols = listSymbolDirectories(self.cache_folder)
+                self._symbols = {}
+            for symbol in symbols:
+                self.refreshSymbol(symbol)
+            self._is_dirty = True
+            self._is_loaded = True
+
+    def refreshSymbol(self, symbol: str) -> List[Dict]:
+        """Re-read the live files of one symbol directory into the manifest."""
+        symbol_cache_path = os.path.join(self.cache_folder, symbol)
+        entries = []
+        if os.path.isdir(symbol_cache_path):
+            for file_name in listLiveCacheFiles(symbol_cache_path):
+                file_path = os.path.join(symbol_cache_path, file_name)
+                data = CacheHandlable._readDataFrameFile(file_path, date_columns=("date",))
+                entries.append(YfinanceCacheManifest.makeEntry(file_path, data))
+        with self._lock:
+            if len(entries) > 0:
+                self._symbols[symbol] = entries
+            else:
+                self._symbols.pop(symbol, None)
+            self._verified_symbols.add(symbol)
+            self._is_dirty = True
+        return entries
+
+    # MARK: - Updates
+
+    def recordFile(self, symbol: str, file_name: str, data: pd.DataFrame):
+        """Register a file just written by the handler.
+
+        A full file supersedes every previous file of the symbol, a segment is
+        appended after them (or replaces a segment of the same name).
+        """
+        self.ensureLoaded()
+        entry = YfinanceCacheManifest.makeEntry(os.path.join(self.cache_folder, symbol, file_name), data)
+        with self._lock:
+            if entry["isSegment"]:
+                entries = [previous for previous in self._symbols.get(symbol, []) if previous["file"] != file_name]
+                entries.append(entry)
+            else:
+                entries = [entry]
+            self._symbols[symbol] = entries
+            self._is_dirty = True
+
+    @staticmethod
+    def makeEntry(file_path: str, data: pd.DataFrame) -> Dict:
+        dates = pd.to_datetime(data["date"])
+        with open(file_path, "rb") as file:
+            checksum = hashlib.sha256(file.read()).hexdigest()
+            stat = os.fstat(file.fileno())
+        return {
+            "file": os.path.basename(file_path),
+            "from": dates.min().isoformat(),
+            "to": dates.max().isoformat(),
+            "rows": int(len(data)),
+            "checksum": checksum,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "isSegment": isSegmentFile(file_path),
+        }
+
+    def verifySymbol(self, symbol: str) -> bool:
+        """Rescan *symbol* if a file of its entries is missing or changed on disk; True if the entries were up to date."""
+        self.ensureLoaded()
+        with self._lock:
+            if symbol in self._verified_symbols:
+                return True
+            entries = self._symbols.get(symbol, [])
+        for entry in entries:
+            try:
+                stat = os.stat(os.path.join(self.cache_folder, symbol, entry["file"]))
+            except OSError:
+                stat = None
+            if stat is None or stat.st_size != entry.get("size") or stat.st_mtime_ns != entry.get("mtime"):
+                self.log_warning(f"Cache manifest entry {symbol}/{entry['file']} is outdated, rescanning {symbol}")
+                self.refreshSymbol(symbol)
+                return False
+        with self._lock:
+            self._verified_symbols.add(symbol)
+        return True
+
+    # MARK: - Queries
+
+    def getEntries(self, symbol: str) -> List[Dict]:
+        self.verifySymbol(symbol)
+        return self._symbols.get(symbol, [])
+
+    def getFileNames(self, symbol: str) -> List[str]:
+        """Live files of *symbol*, oldest first (what ``listLiveCacheFiles`` would return)."""
+        return [entry["file"] for entry in self.getEntries(symbol)]
+
+    def getCoverage(self, symbol: str) -> Optional[Tuple[datetime, datetime]]:
+        """First and last candle date stored for *symbol*, or None if it is not cached."""
+        entries = self.getEntries(symbol)
+        if len(entries) == 0:
+            return None
+        return (
+            min(datetime.fromisoformat(entry["from"]) for entry in entries),
+            max(datetime.fromisoformat(entry["to"]) for entry in entries),
+        )
+
+    def covers(self, symbol: str, from_date: datetime, to_date: datetime) -> bool:
+        """Same test as ``extractNeededDataFromCachedData``, answered without reading the data."""
+        coverage = self.getCoverage(symbol)
+        return coverage is not None and coverage[0] <= from_date and coverage[1] >= to_date
+
+    def getDataVersion(self) -> str:
+        """Short digest of every live file checksum; changes whenever any cached candle changes."""
+        self.ensureLoaded()
+        for symbol in list(self._symbols.keys()):
+            self.verifySymbol(symbol)
+        digest = hashlib.sha256()
+        with self._lock:
+            for symbol in sorted(self._symbols.keys()):
+                digest.update(symbol.encode("utf-8"))
+                for entry in self._symbols[symbol]:
+                    digest.update(entry["checksum"].encode("utf-8"))
+        return digest.hexdigest()[:16]
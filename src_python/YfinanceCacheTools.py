@@ -0,0 +1,407 @@
+"""
+YfinanceCacheTools
+==================
+
+Maintenance commands for the price cache stored under ``cache/YfinanceHandler/<SYMBOL>/``.
+
+The helpers only touch files on disk and never instantiate ``YfinanceHandler``,
+so they can run without network access or the TradingView submodule.
+
+Usage:
+    python -m src_python.YfinanceCacheTools migrate [--format arrow|parquet] [--keep-csv]
+    python -m src_python.YfinanceCacheTools build-panel [--interval 1d]
+    python -m src_python.YfinanceCacheTools compact [--workers N] [--format arrow|parquet|csv]
+    python -m src_python.YfinanceCacheTools build-manifest
+
+``migrate`` and ``compact`` refresh ``manifest.json`` for the symbols they rewrote.
+``compact`` exits with status 1 if any symbol failed to compact (see the log).
+"""
+
+import argparse
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+
+from src_python.ChaseHoundBase import ChaseHoundBase
+from src_python.CacheHandlable import CacheHandlable
+from src_python.PricePanelStore import PricePanelStore
+
+
+def getYfinanceCacheFolder() -> str:
+    return os.path.join(ChaseHoundBase.project_root, "cache", "YfinanceHandler")
+
+
+def listSymbolDirectories(cache_folder: str) -> List[str]:
+    """Return the symbol names that own a directory in *cache_folder* (sorted A-Z)."""
+    if not os.path.exists(cache_folder):
+        return []
+    return sorted(
+        name for name in os.listdir(cache_folder)
+        if not name.startswith("_") and os.path.isdir(os.path.join(cache_folder, name))
+    )
+
+
+def listCacheFiles(symbol_cache_path: str) -> List[str]:
+    """Dataframe files of one symbol directory, oldest ``_at`` first (segments after full files, csv before columnar on ties)."""
+    files = [
+        file_name for file_name in os.listdir(symbol_cache_path)
+        if file_name.endswith(CacheHandlable.DATAFRAME_EXTENSIONS) and not file_name.startswith(".")
+    ]
+    return sorted(files, key=lambda file_name: (getSavedTimeStamp(file_name), isSegmentFile(file_name), not file_name.endswith(".csv")))
+
+
+def getSavedTimeStamp(file_name: str) -> str:
+    """The ``YYYYMMDDHHMMSS`` part of ``..._atYYYYMMDDHHMMSS.<ext>`` (sortable as a string)."""
+    for element in os.path.splitext(file_name)[0].split("_"):
+        if element.startswith("at") and element[2:].isdigit():
+            return element[2:]
+    return ""
+
+
+SEGMENT_SUFFIX = "_seg"
+
+
+def parseCacheFileName(file_name: str) -> Optional[Dict]:
+    """Split ``<symbol>_from<YYYYMMDD>_to<YYYYMMDD>_<interval>_at<YYYYMMDDHHMMSS>[_seg].<ext>``.
+
+    Returns None for names that do not follow the convention.
+    """
+    stem = os.path.splitext(file_name)[0]
+    is_segment = stem.endswith(SEGMENT_SUFFIX)
+    if is_segment:
+        stem = stem[: -len(SEGMENT_SUFFIX)]
+    parts = stem.rsplit("_", 4)
+    if len(parts) != 5 or not parts[1].startswith("from") or not parts[2].startswith("to") or not parts[4].startswith("at"):
+        return None
+    try:
+        return {
+            "symbol": parts[0],
+            "from": datetime.strptime(parts[1][len("from"):], "%Y%m%d"),
+            "to": datetime.strptime(parts[2][len("to"):], "%Y%m%d"),
+            "interval": parts[3],
+            "at": parts[4][len("at"):],
+            "isSegment": is_segment,
+        }
+    except ValueError:
+        return None
+
+
+def isSegmentFile(file_name: str) -> bool:
+    return os.path.splitext(file_name)[0].endswith(SEGMENT_SUFFIX)
+
+
+def listLiveCacheFiles(symbol_cache_path: str) -> List[str]:
+    """The latest full file plus the delta segments saved after it, oldest first.
+
+    Older files are superseded: everything they contain is in the latest full file.
+    """
+    files = listCacheFiles(symbol_cache_path)
+    base_positions = [i for i, file_name in enumerate(files) if not isSegmentFile(file_name)]
+    if len(base_positions) == 0:
+        return files
+    return files[base_positions[-1]:]
+
+
+def readLatestSymbolFrame(symbol_cache_path: str) -> Optional[pd.DataFrame]:
+    """Latest full file of a symbol merged with the delta segments appended after it."""
+    files = listLiveCacheFiles(symbol_cache_path)
+    if len(files) == 0:
+        return None
+    frames = [CacheHandlable._readDataFrameFile(os.path.join(symbol_cache_path, file_name), date_columns=("date",)) for file_name in files]
+    return frames[0] if len(frames) == 1 else mergeCacheFrames(frames)
+
+
+def mergeCacheFrames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Merge candle frames (oldest first) on ``date``; rows of later frames win."""
+    merged = None
+    for frame in frames:
+        frame = frame.set_index("date").sort_index()
+        frame = frame[~frame.index.duplicated(keep="last")]
+        merged = frame if merged is None else frame.combine_first(merged)
+    return merged.reset_index().sort_values(by="date")
+
+
+def toDateIndexedFrame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Candles sorted by unique ``date``, indexed by a ``DatetimeIndex`` (the ``date`` column is kept).
+
+    This is the layout of the frames held in RAM by ``YfinanceHandler``: periods are cut
+    with ``searchsorted`` on the index instead of boolean masks.
+    """
+    if isinstance(frame.index, pd.DatetimeIndex) and frame.index.is_monotonic_increasing and frame.index.is_unique:
+        return frame
+    frame = frame.sort_values(by="date", kind="stable")
+    frame = frame[~frame["date"].duplicated(keep="last").to_numpy()]
+    return frame.set_axis(pd.DatetimeIndex(frame["date"], name=None), axis=0)
+
+
+def sliceDateIndexedFrame(frame: pd.DataFrame, from_date: datetime, to_date: datetime) -> pd.DataFrame:
+    """Rows of a ``toDateIndexedFrame`` frame on ``[from_date, to_date]``, found by binary search (no copy)."""
+    start = frame.index.searchsorted(from_date, side="left")
+    end = frame.index.searchsorted(to_date, side="right")
+    return frame.iloc[start:end]
+
+
+def extractChangedRows(cached: pd.DataFrame, fetched: pd.DataFrame) -> pd.DataFrame:
+    """Rows of *fetched* that are missing from *cached* or differ from it (e.g. split re-adjustments)."""
+    cached = cached.set_index("date")
+    cached = cached[~cached.index.duplicated(keep="last")]
+    fetched_indexed = fetched.set_index("date")
+    is_new = ~fetched_indexed.index.isin(cached.index)
+
+    shared_columns = [
+        column for column in fetched_indexed.columns
+        if column in cached.columns and pd.api.types.is_numeric_dtype(fetched_indexed[column]) and pd.api.types.is_numeric_dtype(cached[column])
+    ]
+    is_changed = np.zeros(len(fetched_indexed), dtype=bool)
+    if len(shared_columns) > 0:
+        previous = cached[shared_columns].reindex(fetched_indexed.index).to_numpy(dtype=np.float64)
+        current = fetched_indexed[shared_columns].to_numpy(dtype=np.float64)
+        same = np.isclose(current, previous, rtol=1e-9, atol=0.0, equal_nan=True)
+        is_changed = ~same.all(axis=1)
+    return fetched[is_new | is_changed]
+
+
+def getCoverageFromFileNames(file_names: List[str]) -> List[Tuple[datetime, datetime]]:
+    """Merge the ``[from, to]`` ranges encoded in cache file names into disjoint date ranges."""
+    ranges = sorted(
+        (parsed["from"], parsed["to"]) for parsed in map(parseCacheFileName, file_names) if parsed is not None
+    )
+    coverage: List[Tuple[datetime, datetime]] = []
+    for start, end in ranges:
+        if coverage and start <= coverage[-1][1] + timedelta(days=1):
+            coverage[-1] = (coverage[-1][0], max(coverage[-1][1], end))
+        else:
+            coverage.append((start, end))
+    return coverage
+
+
+def getMissingDateRanges(from_date: datetime, to_date: datetime, covered_from: datetime, covered_to: datetime, interval: str = "1d") -> List[Tuple[datetime, datetime]]:
+    """Sub-ranges of ``[from_date, to_date]`` outside the cached ``[covered_from, covered_to]``.
+
+    The cache of a symbol is contiguous (every fetch extends it), so at most the head
+    and the tail are missing.  Intraday tails restart at the day of the last cached
+    bar, whose later bars may not have been fetched yet.  Ranges without any business
+    day cannot hold candles and are dropped.
+    """
+    ranges = []
+    if from_date < covered_from:
+        ranges.append((from_date, min(to_date, covered_from - timedelta(days=1))))
+    if to_date > covered_to:
+        is_intraday = interval.endswith(("m", "h"))
+        tail_start = pd.Timestamp(covered_to).normalize() if is_intraday else covered_to + timedelta(days=1)
+        ranges.append((max(from_date, tail_start), to_date))
+    return [(start, end) for start, end in ranges if start <= end and countBusinessDays(start, end) > 0]
+
+
+def countBusinessDays(from_date: datetime, to_date: datetime) -> int:
+    """Weekdays on ``[from_date, to_date]`` (market holidays are not excluded)."""
+    return int(np.busday_count(pd.Timestamp(from_date).date(), pd.Timestamp(to_date).date() + timedelta(days=1)))
+
+
+# MARK: - Migration
+
+def migrateSymbolDirectory(symbol_cache_path: str, cache_format: str = "arrow", keep_csv: bool = False) -> Dict[str, int]:
+    """Convert every csv file of one symbol directory into *cache_format*.
+
+    The converted file keeps the original cache key (and therefore its ``_at``
+    timestamp), so the loader keeps picking the same snapshot.  Each file is
+    written to a hidden temporary path, read back and only then renamed into place.
+    """
+    extension = CacheHandlable.CACHE_FORMAT_EXTENSIONS[cache_format]
+    report = {"converted": 0, "bytes_before": 0, "bytes_after": 0}
+    for file_name in sorted(os.listdir(symbol_cache_path)):
+        if not file_name.endswith(".csv") or file_name.startswith("."):
+            continue
+        csv_path = os.path.join(symbol_cache_path, file_name)
+        target_path = os.path.join(symbol_cache_path, file_name[: -len(".csv")] + extension)
+        temp_path = getTemporaryPath(target_path)
+
+        data = CacheHandlable._readDataFrameFile(csv_path, date_columns=("date",))
+        CacheHandlable._writeDataFrameFile(temp_path, data)
+        if len(CacheHandlable._readDataFrameFile(temp_path)) != len(data):
+            os.remove(temp_path)
+            raise RuntimeError(f"Row count mismatch while migrating {csv_path}")
+        os.replace(temp_path, target_path)
+
+        report["converted"] += 1
+        report["bytes_before"] += os.path.getsize(csv_path)
+        report["bytes_after"] += os.path.getsize(target_path)
+        if not keep_csv:
+            os.remove(csv_path)
+    return report
+
+
+def getTemporaryPath(file_path: str) -> str:
+    """Hidden sibling of *file_path*; the loader ignores dot-files, so a crash never exposes a partial file."""
+    directory, file_name = os.path.split(file_path)
+    return os.path.join(directory, "." + file_name)
+
+
+def migrateCsvTree(cache_folder: Optional[str] = None, cache_format: str = "arrow", keep_csv: bool = False, symbols: Optional[List[str]] = None) -> Dict[str, int]:
+    """One-shot migration of the whole csv cache tree into a columnar backend."""
+    cache_folder = cache_folder or getYfinanceCacheFolder()
+    symbols = symbols or listSymbolDirectories(cache_folder)
+    total = {"symbols": 0, "converted": 0, "bytes_before": 0, "bytes_after": 0}
+    for symbol in tqdm(symbols, desc=f"Migrating cache to {cache_format}"):
+        symbol_cache_path = os.path.join(cache_folder, symbol)
+        if not os.path.isdir(symbol_cache_path):
+            continue
+        report = migrateSymbolDirectory(symbol_cache_path, cache_format=cache_format, keep_csv=keep_csv)
+        total["symbols"] += 1
+        for key, value in report.items():
+            total[key] += value
+    return total
+
+
+# MARK: - Compaction
+
+def compactSymbolDirectory(symbol_cache_path: str, cache_format: Optional[str] = None) -> Dict[str, int]:
+    """Merge every cache file of one symbol into a single canonical file and delete the others.
+
+    Rows of files saved later win.  The canonical file is named after the merged date
+    range and keeps the newest ``_at`` timestamp, it is written to a hidden temporary
+    path and renamed into place before any superseded file is removed, so the
+    directory is readable at every step.
+    """
+    files = listCacheFiles(symbol_cache_path)
+    bytes_before = sum(os.path.getsize(os.path.join(symbol_cache_path, file_name)) for file_name in files)
+    report = {"symbols": 1, "files_before": len(files), "files_after": len(files), "bytes_before": bytes_before, "bytes_after": bytes_before}
+    if len(files) == 0 or (len(files) == 1 and (cache_format is None or files[0].endswith(CacheHandlable.CACHE_FORMAT_EXTENSIONS[cache_format]))):
+        return report
+
+    frames = [CacheHandlable._readDataFrameFile(os.path.join(symbol_cache_path, file_name), date_columns=("date",)) for file_name in files]
+    merged = mergeCacheFrames(frames)
+
+    latest = parseCacheFileName(files[-1]) or {}
+    symbol = os.path.basename(os.path.normpath(symbol_cache_path))
+    extension = CacheHandlable.CACHE_FORMAT_EXTENSIONS[cache_format] if cache_format else os.path.splitext(files[-1])[1]
+    canonical_name = (
+        f"{symbol}_from{merged['date'].min().strftime('%Y%m%d')}_to{merged['date'].max().strftime('%Y%m%d')}"
+        f"_{latest.get('interval', '1d')}_at{max(getSavedTimeStamp(file_name) for file_name in files)}{extension}"
+    )
+    canonical_path = os.path.join(symbol_cache_path, canonical_name)
+    temp_path = getTemporaryPath(canonical_path)
+    CacheHandlable._writeDataFrameFile(temp_path, merged)
+    if len(CacheHandlable._readDataFrameFile(temp_path, date_columns=("date",))) != len(merged):
+        os.remove(temp_path)
+        raise RuntimeError(f"Row count mismatch while compacting {symbol_cache_path}")
+    os.replace(temp_path, canonical_path)
+
+    for file_name in files:
+        if file_name != canonical_name:
+            os.remove(os.path.join(symbol_cache_path, file_name))
+
+    report["files_after"] = 1
+    report["bytes_after"] = os.path.getsize(canonical_path)
+    return report
+
+
+def _compactSymbolDirectoryTask(args: Tuple[str, Optional[str]]) -> Tuple[Dict[str, int], Optional[str]]:
+    """``compactSymbolDirectory`` in a worker: the report, and the traceback of the failure if any, for the parent to log."""
+    symbol_cache_path, cache_format = args
+    try:
+        return compactSymbolDirectory(symbol_cache_path, cache_format=cache_format), None
+    except Exception:
+        return {"symbols": 1, "files_before": 0, "files_after": 0, "bytes_before": 0, "bytes_after": 0, "failed": 1}, traceback.format_exc()
+
+
+def compactCacheTree(cache_folder: Optional[str] = None, workers: Optional[int] = None, cache_format: Optional[str] = None, symbols: Optional[List[str]] = None) -> Dict[str, int]:
+    """Compact every symbol directory across a process pool and return the summed report.
+
+    A symbol failing to compact is left as it was, logged, and counted in ``failed``.
+    """
+    cache_folder = cache_folder or getYfinanceCacheFolder()
+    symbols = symbols or listSymbolDirectories(cache_folder)
+    tasks = [(os.path.join(cache_folder, symbol), cache_format) for symbol in symbols if os.path.isdir(os.path.join(cache_folder, symbol))]
+    total = {"symbols": 0, "files_before": 0, "files_after": 0, "bytes_before": 0, "bytes_after": 0, "failed": 0}
+    failures: List[Tuple[str, str]] = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_compactSymbolDirectoryTask, tasks, chunksize=32)
+        for (symbol_cache_path, _), (report, error) in tqdm(zip(tasks, results), total=len(tasks), desc="Compacting cache"):
+            for key, value in report.items():
+                total[key] += value
+            if error is not None:
+                failures.append((symbol_cache_path, error))
+    if failures:
+        logger = ChaseHoundBase().logger
+        for symbol_cache_path, error in failures:
+            logger.error(f"Failed to compact {symbol_cache_path}:\n{error}")
+    return total
+
+
+# MARK: - Panel
+
+def buildPricePanel(cache_folder: Optional[str] = None, interval: str = "1d", symbols: Optional[List[str]] = None):
+    """Build the memory-mapped panel read by ``YfinanceHandler.loadPricePanel`` from the latest file of each symbol."""
+    cache_folder = cache_folder or getYfinanceCacheFolder()
+    symbols = symbols or listSymbolDirectories(cache_folder)
+    frames = {}
+    for symbol in tqdm(symbols, desc="Reading cache for the price panel"):
+        symbol_cache_path = os.path.join(cache_folder, symbol)
+        if os.path.isdir(symbol_cache_path):
+            frames[symbol] = readLatestSymbolFrame(symbol_cache_path)
+    return PricePanelStore(os.path.join(cache_folder, "_panel", interval)).build(frames)
+
+
+# MARK: - Command Line
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintenance commands for cache/YfinanceHandler")
+    parser.add_argument("--cache-folder", default=None, help="defaults to <project_root>/cache/YfinanceHandler")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser("migrate", help="convert the csv cache tree into a columnar backend")
+    migrate_parser.add_argument("--format", default="arrow", choices=["parquet", "arrow"])
+    migrate_parser.add_argument("--keep-csv", action="store_true", help="keep the original csv files next to the converted ones")
+    migrate_parser.add_argument("--symbols", nargs="*", default=None)
+
+    panel_parser = subparsers.add_parser("build-panel", help="build the memory-mapped (symbols x dates x fields) panel")
+    panel_parser.add_argument("--interval", default="1d")
+    panel_parser.add_argument("--symbols", nargs="*", default=None)
+
+    compact_parser = subparsers.add_parser("compact", help="merge the overlapping files of each symbol into one canonical file")
+    compact_parser.add_argument("--workers", type=int, default=None, help="size of the process pool (default: number of CPUs)")
+    compact_parser.add_argument("--format", default=None, choices=["csv", "parquet", "arrow"], help="default: keep the format of the latest file")
+    compact_parser.add_argument("--symbols", nargs="*", default=None)
+
+    subparsers.add_parser("build-manifest", help="rescan the whole cache tree into manifest.json")
+
+    args = parser.parse_args()
+    # the manifest module imports this one, hence the late import
+    from src_python.YfinanceCacheManifest import YfinanceCacheManifest
+    manifest = YfinanceCacheManifest(args.cache_folder or getYfinanceCacheFolder())
+
+    if args.command == "migrate":
+        report = migrateCsvTree(args.cache_folder, cache_format=args.format, keep_csv=args.keep_csv, symbols=args.symbols)
+        manifest.rebuild(args.symbols if manifest.load() else None)
+        manifest.save()
+        saved = report["bytes_before"] - report["bytes_after"]
+        print(f"Migrated {report['converted']} files of {report['symbols']} symbols: "
+              f"{report['bytes_before'] / 1e6:.1f} MB -> {report['bytes_after'] / 1e6:.1f} MB ({saved / 1e6:.1f} MB saved)")
+    elif args.command == "compact":
+        report = compactCacheTree(args.cache_folder, workers=args.workers, cache_format=args.format, symbols=args.symbols)
+        manifest.rebuild(args.symbols if manifest.load() else None)
+        manifest.save()
+        reclaimed = report["bytes_before"] - report["bytes_after"]
+        print(f"Compacted {report['symbols']} symbols ({report['failed']} failed): {report['files_before']} -> {report['files_after']} files, "
+              f"{report['bytes_before'] / 1e6:.1f} MB -> {report['bytes_after'] / 1e6:.1f} MB ({reclaimed / 1e6:.1f} MB reclaimed)")
+        if report["failed"] > 0:
+            sys.exit(1)
+    elif args.command == "build-panel":
+        panel = buildPricePanel(args.cache_folder, interval=args.interval, symbols=args.symbols)
+        print(f"Built a panel of {len(panel.symbols)} symbols x {len(panel.dates)} dates x {len(panel.fields)} fields")
+    elif args.command == "build-manifest":
+        manifest.rebuild()
+        manifest.save()
+        print(f"Indexed {len(manifest.symbols)} symbols into {manifest.path}")
+
+
+if __name__ == "__main__":
+    main()
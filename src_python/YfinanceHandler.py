@@ -1,16 +1,34 @@
 from datetime import datetime, timedelta
 import pandas as pd
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from tqdm import tqdm
 import os
-import shutil
+import json
 import stat
+import threading
+import time
 
 # Concurrency utilities
 from concurrent.futures import ThreadPoolExecutor, Future
 
 from src_python.ChaseHoundBase import ChaseHoundBase
 from src_python.CacheHandlable import CacheHandlable
+from src_python.AsyncFetchEngine import AimdConcurrencyLimit, AsyncFetchEngine
+from src_python.FetchPolicies import InFlightRequestTable, NegativeCache, RetryPolicy, TokenBucketRateLimiter
+from src_python.YfinanceBatchDownloader import YfinanceBatchDownloader
+from src_python.LruFrameCache import LruFrameCache
+from src_python.PricePanelStore import PricePanel, PricePanelStore
+from src_python.YfinanceCacheManifest import YfinanceCacheManifest
+from src_python.YfinanceCacheTools import (
+    SEGMENT_SUFFIX,
+    countBusinessDays,
+    extractChangedRows,
+    getCoverageFromFileNames,
+    getMissingDateRanges,
+    mergeCacheFrames,
+    sliceDateIndexedFrame,
+    toDateIndexedFrame,
+)
 from src.TradingViewHandler import TradingViewHandler
 
 import sys, asyncio
@@ -19,45 +37,101 @@ if sys.platform.startswith("win"):
 
 
 class YfinanceHandler(CacheHandlable):
+    # MARK: - Class Properties
+    CACHE_MODES: tuple = ("eager", "lazy")
+    # identical (symbols, interval, range) requests running at the same time, in any handler of the process, share one upstream call
+    _in_flight_requests: InFlightRequestTable = InFlightRequestTable()
+
     # MARK: - Constructor
-    def __init__(self):
-        super().__init__()
+    def __init__(self, cache_format: Optional[str] = None, cache_mode: Optional[str] = None, cache_memory_budget_mb: Optional[float] = None):
+        """
+        Args:
+            cache_format: csv / parquet / arrow, see ``CacheHandlable``.
+            cache_mode: "eager" loads every requested symbol on the first call (default),
+                "lazy" loads a symbol from disk the first time it is requested.
+                Defaults to the ``CHASEHOUND_CACHE_MODE`` environment variable.
+            cache_memory_budget_mb: RAM the cached candles may use before the least recently
+                used symbols are evicted (they are reloaded from disk on the next access).
+                Defaults to ``CHASEHOUND_CACHE_MEMORY_BUDGET_MB``, unbounded if unset.
+        """
+        super().__init__(cache_format)
         self._trading_view_handler = TradingViewHandler()
         # concurrency control for asynchronous price fetching
         self._max_concurrent_requests: int = 20  # Adjust as needed
         self._thread_pool_executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=self._max_concurrent_requests)
-
-        self._cache: dict[str, pd.DataFrame] = {}
+        # requests per second allowed towards the upstream, shared by every handler of the process
+        self._rate_limiter: TokenBucketRateLimiter = TokenBucketRateLimiter.getShared(
+            "TradingViewHandler", rate_per_second=float(os.getenv("CHASEHOUND_FETCH_RATE_PER_SECOND", "20"))
+        )
+        # symbols whose fetch kept failing are not requested again before the TTL expires
+        self._negative_cache: NegativeCache = NegativeCache(ttl_seconds=float(os.getenv("CHASEHOUND_FETCH_NEGATIVE_TTL_SECONDS", "3600")))
+        # history prices are fetched under an AIMD limit (at most _max_concurrent_requests in flight)
+        self._fetch_engine: AsyncFetchEngine = AsyncFetchEngine(
+            lambda *request: self._request_history_prices_of(*request),
+            limit=AimdConcurrencyLimit(initial=self._max_concurrent_requests // 2, maximum=self._max_concurrent_requests),
+            executor=self._thread_pool_executor,
+            rate_limiter=self._rate_limiter,
+            retry_policy=RetryPolicy(max_attempts=int(os.getenv("CHASEHOUND_FETCH_MAX_ATTEMPTS", "3"))),
+            negative_cache=self._negative_cache,
+            negative_key=lambda request: (request[0], request[3]),  # (symbol, interval)
+        )
+        # seconds a whole batch of history price requests may take, the unfinished ones are given up (None)
+        self._fetch_deadline_seconds: Optional[float] = float(os.getenv("CHASEHOUND_FETCH_DEADLINE_SECONDS")) if os.getenv("CHASEHOUND_FETCH_DEADLINE_SECONDS") else None
+        # opt-in: requests sharing the same window are downloaded up to _fetch_batch_size tickers per call (0 or 1 disables it)
+        self._fetch_batch_size: int = int(os.getenv("CHASEHOUND_FETCH_BATCH_SIZE", "0")) if YfinanceBatchDownloader.isAvailable() else 0
+        self._batch_downloader: YfinanceBatchDownloader = YfinanceBatchDownloader()
+        self._batch_fetch_engine: AsyncFetchEngine = AsyncFetchEngine(
+            lambda *request: self._request_history_prices_of_symbols(*request),
+            limit=AimdConcurrencyLimit(initial=2, maximum=4),
+            executor=self._thread_pool_executor,
+            rate_limiter=self._rate_limiter,
+            retry_policy=RetryPolicy(max_attempts=2),
+        )
+
+        self._cache_mode: str = (cache_mode or os.getenv("CHASEHOUND_CACHE_MODE", "eager")).lower()
+        if self._cache_mode not in YfinanceHandler.CACHE_MODES:
+            raise ValueError(f"Unsupported cache mode: {self._cache_mode}")
+        if cache_memory_budget_mb is None and os.getenv("CHASEHOUND_CACHE_MEMORY_BUDGET_MB"):
+            cache_memory_budget_mb = float(os.getenv("CHASEHOUND_CACHE_MEMORY_BUDGET_MB"))
+        self._cache: LruFrameCache = LruFrameCache(
+            max_bytes=int(cache_memory_budget_mb * 1024 * 1024) if cache_memory_budget_mb is not None else None
+        )
+        # number of delta segments a symbol may accumulate before they are folded into a new full file
+        self._max_segments_per_symbol: int = 16
+        # optional memory-mapped panel of the whole universe, opened on first use
+        self._price_panels: dict[str, PricePanel] = {}
+        # index of the files of every cached symbol, read once instead of listing each symbol directory
+        self._manifest: YfinanceCacheManifest = YfinanceCacheManifest(self.class_cache_folder_path)
+        # serialises the eager preload and the read-merge-write of cache files when the handler is shared between threads
+        self._cache_lock = threading.RLock()
         
 
     # MARK: - Public Methods
 
     def loadFromRamOrAsyncFetchHistoryPricesOf(self, symbols: List[str], from_date: datetime, to_date: datetime, interval: str, shouldAbandonFetching: bool = False) -> List[Optional[pd.DataFrame]]:
-        if len(self._cache) == 0:
-            self._cache = self._loadCache(symbols)
+        if self._cache_mode == "eager" and len(self._cache) == 0:
+            with self._cache_lock:
+                if len(self._cache) == 0:
+                    self._cache = self._loadCache(symbols, from_date, to_date)
 
         symbolsToFetch = []
         results_dict = {}
 
         def extractNeededDataFromCachedData(from_date: datetime, to_date: datetime, cacheData: pd.DataFrame) -> Optional[pd.DataFrame]:
-            if cacheData["date"].min() <= from_date and cacheData["date"].max() >= to_date:
-                # Réperez les données correspondant à la période demandée
-                cacheData = cacheData[cacheData["date"] >= from_date]
-                cacheData = cacheData[cacheData["date"] <= to_date]
-                return cacheData
+            # cacheData is indexed by its sorted dates (toDateIndexedFrame): the bounds are its first and last labels
+            if len(cacheData) > 0 and cacheData.index[0] <= from_date and cacheData.index[-1] >= to_date:
+                # Réperez les données correspondant à la période demandée (recherche binaire, sans copie)
+                return sliceDateIndexedFrame(cacheData, from_date, to_date)
             else:
                 return None
 
         # load
         for symbol in symbols:
-            if symbol in self._cache: # does the symbol exist in RAM?
+            # RAM first, then disk if the manifest says the period is stored there
+            cachedData = self._getCachedDataOf(symbol, from_date, to_date)
+            if cachedData is not None:
                 # Vérifier si les données existantes comprennent la période demandée
-                # if self._cache[symbol]["date"].min() <= from_date and self._cache[symbol]["date"].max() >= to_date:
-                #     # Réperez les données correspondant à la période demandée
-                #     results_dict[symbol] = self._cache[symbol][self._cache[symbol]["date"] >= from_date]
-                #     results_dict[symbol] = results_dict[symbol][results_dict[symbol]["date"] <= to_date]
-                #     continue
-                results_dict[symbol] = extractNeededDataFromCachedData(from_date, to_date, self._cache[symbol])
+                results_dict[symbol] = extractNeededDataFromCachedData(from_date, to_date, cachedData)
                 if results_dict[symbol] is not None:
                     continue
             # else, need fetch
@@ -70,13 +144,20 @@ class YfinanceHandler(CacheHandlable):
             return [results_dict.get(symbol, None) for symbol in symbols]
         
         if len(symbolsToFetch) == 0:
+            self._manifest.save()
             # sort the dict by symbol in A-Z and turn it into a list
             results_list = [results_dict.get(symbol, None) for symbol in symbols]
             return results_list
 
-        # fetch
+        # fetch only the sub-ranges missing from the cache of each symbol
         print(f"Among the requested {len(symbols)} symbols, {len(symbolsToFetch)} symbols are not in the cache. Fetching {len(symbolsToFetch)} symbols...")
-        fetchedResults = self._async_fetch_history_prices_of(symbolsToFetch, from_date, to_date, interval)
+        fetchRequests = self._planDeltaFetch(symbolsToFetch, from_date, to_date, interval)
+        fetchedRanges = self._async_fetch_history_price_ranges_of(fetchRequests, interval)
+        fetchedFrames: dict[str, List[pd.DataFrame]] = {symbol: [] for symbol in symbolsToFetch}
+        for (symbol, _, _), data in zip(fetchRequests, fetchedRanges):
+            if data is not None and len(data) > 0:
+                fetchedFrames[symbol].append(data)
+        fetchedResults = [pd.concat(fetchedFrames[symbol], ignore_index=True) if len(fetchedFrames[symbol]) > 0 else None for symbol in symbolsToFetch]
         for symbol, result in zip(symbolsToFetch, fetchedResults):
             results_dict[symbol] = result
             
@@ -85,34 +166,26 @@ class YfinanceHandler(CacheHandlable):
                 continue
             elif len(result) == 0:
                 continue
-            elif symbol not in self._cache.keys(): # if the symbol is not in the cache, save the result to the cache
-                cache_key = self.__createCacheKey(symbol, from_date, to_date, interval)
-                self._saveToCache(cache_key, result)
-                results_dict[symbol] = extractNeededDataFromCachedData(from_date, to_date, result)
-            else:
-                # merge les données récupérées avec les données du cache
-                # Utiliser "outer" pour garder toutes les données, mais prioriser result sur cache
-                df_cache = self._cache[symbol].set_index('date').sort_index()
-                df_cache = df_cache[~df_cache.index.duplicated(keep='last')]
-                df_new = result.set_index('date').sort_index()
-                df_new = df_new[~df_new.index.duplicated(keep='last')]
-                extendedCachedData = df_new.combine_first(df_cache).reset_index()
-                
-                # trier les données par date
-                extendedCachedData = extendedCachedData.sort_values(by="date")
-                # enregistrer les données dans le cache
-                symbol_cache_path = os.path.join(self.class_cache_folder_path, symbol)
-                if os.path.exists(symbol_cache_path):
-                    # delete the cache file
-                    shutil.rmtree(symbol_cache_path, onerror=self._handle_remove_readonly)
-                os.makedirs(symbol_cache_path, exist_ok=True)
-                # calculer la cache clé après le fond
-                from_date_cache = extendedCachedData["date"].min()
-                to_date_cache = extendedCachedData["date"].max()
-                cache_key = self.__createCacheKey(symbol, from_date_cache, to_date_cache, interval)
-                self._saveToCache(cache_key, extendedCachedData)
-                results_dict[symbol] = extractNeededDataFromCachedData(from_date, to_date, extendedCachedData)
-
+            result = toDateIndexedFrame(result)
+
+            with self._cache_lock:
+                # the partially cached rows are read back (if evicted or not loaded yet) to merge the fetched ones into
+                cachedData = self._getCachedDataOf(symbol)
+                if cachedData is None: # if the symbol is not in the cache, save the result to the cache
+                    cache_key = self.__createCacheKey(symbol, from_date, to_date, interval)
+                    self._saveToCache(cache_key, result)
+                    results_dict[symbol] = extractNeededDataFromCachedData(from_date, to_date, result)
+                else:
+                    # merge les données récupérées avec les données du cache
+                    # les lignes de result sont prioritaires sur celles du cache
+                    extendedCachedData = toDateIndexedFrame(mergeCacheFrames([cachedData, result]))
+                    # n'écrire sur disque que les lignes nouvelles ou modifiées, la fusion des segments est différée
+                    changedRows = extractChangedRows(cachedData, result)
+                    if len(changedRows) > 0:
+                        self._appendSegmentToCache(symbol, changedRows, extendedCachedData, interval)
+                    results_dict[symbol] = extractNeededDataFromCachedData(from_date, to_date, extendedCachedData)
+
+        self._manifest.save()
         print(f"All symbols prices have been fetched and cached.")
         # sort the dict by symbol in A-Z and turn it into a list
         results_list = [results_dict.get(symbol, None) for symbol in symbols]
@@ -120,16 +193,153 @@ class YfinanceHandler(CacheHandlable):
         return results_list
         
 
+    def getCachedHistoryOf(self, symbol: str) -> Optional[pd.DataFrame]:
+        """Whole cached history of *symbol* (date-indexed, read from disk if needed), without fetching.
+
+        The frame is shared with the cache: it must not be modified in place.
+        """
+        return self._getCachedDataOf(symbol)
+
+    def getCachedCoverageOf(self, symbol: str) -> List[Tuple[datetime, datetime]]:
+        """Date ranges of *symbol* stored on disk (full file + delta segments), merged and oldest first.
+
+        Answered from the manifest, neither the symbol directory nor the data is read.
+        """
+        return getCoverageFromFileNames(self._manifest.getFileNames(symbol))
+
+    def getCacheStats(self) -> dict:
+        """Hit / miss / eviction counters of the in-RAM candle cache, plus its current size."""
+        return {"mode": self._cache_mode, "budget_bytes": self._cache.max_bytes, **self._cache.getStats()}
+
+    def getFetchMetrics(self) -> dict:
+        """Request / retry / error / timeout counters of the fetch engine, with its rate limiter and negative cache."""
+        return {
+            **self._fetch_engine.getStats(),
+            "batches": self._batch_fetch_engine.getStats(),
+            "coalescing": YfinanceHandler._in_flight_requests.getStats(),
+        }
+
+    def exportFetchMetrics(self, path: Optional[str] = None) -> str:
+        """Write ``getFetchMetrics`` and ``getCacheStats`` as JSON (default: temp/yfinance_metrics.json)."""
+        path = path or os.path.join(self.temp_folder, "yfinance_metrics.json")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"fetch": self.getFetchMetrics(), "cache": self.getCacheStats()}, file, indent=2)
+        return path
+
+    def getDataVersion(self) -> str:
+        """Digest of the cached candles of every symbol, changes whenever the cache is written."""
+        return self._manifest.getDataVersion()
+
+    def loadPricePanel(self, from_date: datetime, to_date: datetime, interval: str = "1d") -> Optional[PricePanel]:
+        """Return a zero-copy (symbols × dates × fields) slice of the memory-mapped panel.
+
+        The panel has to be built first with ``buildPricePanel`` (or
+        ``python -m src_python.YfinanceCacheTools build-panel``); None is returned otherwise.
+        Unlike ``loadFromRamOrAsyncFetchHistoryPricesOf`` nothing is fetched.
+        """
+        if interval not in self._price_panels:
+            panel = self._getPricePanelStore(interval).open()
+            if panel is None:
+                return None
+            self._price_panels[interval] = panel
+        return self._price_panels[interval].sliceDates(from_date, to_date)
+
+    def buildPricePanel(self, symbols: Optional[List[str]] = None, interval: str = "1d") -> PricePanel:
+        """(Re)build the memory-mapped panel from the cached candles of *symbols* (default: every cached symbol)."""
+        if symbols is None:
+            symbols = self._manifest.symbols
+        panel = self._getPricePanelStore(interval).build({symbol: self._getCachedDataOf(symbol) for symbol in symbols})
+        self._price_panels[interval] = panel
+        return panel
+
     def _async_fetch_history_prices_of(self, symbols: List[str], from_date: datetime, to_date: datetime, interval: str) -> List[Optional[pd.DataFrame]]:      
         # si les données ne sont pas dans le cache, on les récupère
-        futures: List[Future] = [
-            self._thread_pool_executor.submit(self._fetch_history_prices_of, symbol, from_date, to_date, interval)
-            for symbol in symbols
+        return self._async_fetch_history_price_ranges_of([(symbol, from_date, to_date) for symbol in symbols], interval)
+
+    def _async_fetch_history_price_ranges_of(self, requests: List[Tuple[str, datetime, datetime]], interval: str) -> List[Optional[pd.DataFrame]]:
+        """Fetch every ``(symbol, from_date, to_date)`` request concurrently, results in request order.
+
+        Requests sharing a window are first downloaded in multi-ticker batches; whatever a
+        batch did not return (failed call, missing ticker) falls back to single-symbol requests.
+        The progress bar advances as requests complete (a slow symbol no longer holds it back),
+        and requests still running after ``_fetch_deadline_seconds`` are given up with None.
+        """
+        start_time = time.monotonic()
+        results: List[Optional[pd.DataFrame]] = [None] * len(requests)
+        if self._fetch_batch_size > 1 and len(requests) > 1:
+            results = self._async_fetch_history_price_batches_of(requests, interval)
+
+        pending = [i for i, result in enumerate(results) if result is None]
+        deadline_seconds = None if self._fetch_deadline_seconds is None else max(0.0, self._fetch_deadline_seconds - (time.monotonic() - start_time))
+        with tqdm(desc="Conducting YfinanceHandler.async_fetch_history_prices_of", total=len(pending)) as progress_bar:
+            pending_results = self._fetch_engine.fetchAll(
+                [(requests[i][0], requests[i][1], requests[i][2], interval) for i in pending],
+                deadline_seconds=deadline_seconds,
+                on_result=lambda index, result: progress_bar.update(1),
+            )
+        for i, result in zip(pending, pending_results):
+            results[i] = result
+        return results
+
+    def _async_fetch_history_price_batches_of(self, requests: List[Tuple[str, datetime, datetime]], interval: str) -> List[Optional[pd.DataFrame]]:
+        """Multi-ticker downloads of the requests grouped by window; None where the batch returned nothing."""
+        groups: dict[Tuple[datetime, datetime], List[int]] = {}
+        for i, (_, from_date, to_date) in enumerate(requests):
+            groups.setdefault((from_date, to_date), []).append(i)
+        batches = [
+            (window, indices[start:start + self._fetch_batch_size])
+            for window, indices in groups.items()
+            for start in range(0, len(indices), self._fetch_batch_size)
         ]
-        results = [future.result() for future in tqdm(futures, desc="Conducting YfinanceHandler.async_fetch_history_prices_of", total=len(symbols))]
 
+        results: List[Optional[pd.DataFrame]] = [None] * len(requests)
+        with tqdm(desc="Conducting YfinanceHandler.async_fetch_history_price_batches_of", total=len(batches)) as progress_bar:
+            batch_results = self._batch_fetch_engine.fetchAll(
+                [(tuple(requests[i][0] for i in indices), window[0], window[1], interval) for window, indices in batches],
+                deadline_seconds=self._fetch_deadline_seconds,
+                on_result=lambda index, result: progress_bar.update(1),
+            )
+        for (_, indices), frames in zip(batches, batch_results):
+            if frames is None:
+                continue
+            for i in indices:
+                results[i] = frames.get(requests[i][0])
+
+        served = sum(result is not None for result in results)
+        self.logger.info(f"Batched fetch: {served} of {len(requests)} requests served by {len(batches)} multi-ticker calls, "
+                         f"{len(requests) - served} fall back to single-symbol requests.")
         return results
 
+    def _planDeltaFetch(self, symbols: List[str], from_date: datetime, to_date: datetime, interval: str) -> List[Tuple[str, datetime, datetime]]:
+        """Requests covering only what the cache of each symbol lacks on ``[from_date, to_date]``.
+
+        Symbols without any cache get the whole window.  Logs how many requests and
+        (business-day) rows the delta fetch saves compared to re-fetching every window.
+        """
+        requests = []
+        fullWindowDays = countBusinessDays(from_date, to_date)
+        savedRows = 0
+        for symbol in symbols:
+            coverage = self._getCachedDateRangeOf(symbol)
+            if coverage is None:
+                requests.append((symbol, from_date, to_date))
+                continue
+            missingRanges = getMissingDateRanges(from_date, to_date, coverage[0], coverage[1], interval)
+            requests.extend((symbol, start, end) for start, end in missingRanges)
+            savedRows += fullWindowDays - sum(countBusinessDays(start, end) for start, end in missingRanges)
+
+        self.logger.info(f"Delta fetch: {len(requests)} requests instead of {len(symbols)} ({len(symbols) - len(requests)} saved), "
+                         f"about {savedRows} symbol-days already cached are not downloaded again.")
+        return requests
+
+    def _getCachedDateRangeOf(self, symbol: str) -> Optional[Tuple[datetime, datetime]]:
+        """First and last cached candle date of *symbol*, from RAM or else from the manifest."""
+        if symbol in self._cache:
+            cachedData = self._cache[symbol]
+            return (cachedData.index[0], cachedData.index[-1]) if len(cachedData) > 0 else None
+        return self._manifest.getCoverage(symbol)
+
     def _async_fetch_last_trade_price_for_symbols(self, symbols: List[str]) -> List[Optional[float]]:
         """Fetch the last traded price for each symbol concurrently.
 
@@ -169,17 +379,10 @@ class YfinanceHandler(CacheHandlable):
         
 
     def _fetch_history_prices_of(self, symbol: str, from_date: datetime, to_date: datetime, interval: str) -> Optional[pd.DataFrame]:
-        # rewrite symbol name
-        symbol = self._rewrite_symbol_names_for_yfinance(symbol)
-        to_date += timedelta(days=1)
         # fetch data
         try:
-            data = self._trading_view_handler.fetch_history_data_of(symbol, from_date=from_date, to_date=to_date, interval=interval)
-            if data is None or len(data) == 0:
-                return None
-            # calculate turnover
-            data["turnover"] = data["volume"] * data["close"]
-            return data
+            self._rate_limiter.acquire()
+            return self._request_history_prices_of(symbol, from_date, to_date, interval)
         except Exception as e:
             # self.log_warning(f"{self.yellow_color_code}Error fetching history prices for {symbol}, during execution of YfinanceHandler.fetch_history_prices_of.{self.reset_color_code}")
             data = None
@@ -190,28 +393,98 @@ class YfinanceHandler(CacheHandlable):
             
         return data
 
-    def _loadCache(self, symbols: List[str]) -> dict[str, pd.DataFrame]:
+    def _request_history_prices_of(self, symbol: str, from_date: datetime, to_date: datetime, interval: str) -> Optional[pd.DataFrame]:
+        """Same as ``_fetch_history_prices_of`` but lets errors raise, so the fetch engine can count them.
+
+        A request identical to one already in flight waits for it and gets the same frame
+        (callers must not modify it in place).
+        """
+        return YfinanceHandler._in_flight_requests.run(
+            (symbol, interval, from_date, to_date), self._download_history_prices_of, symbol, from_date, to_date, interval
+        )
+
+    def _request_history_prices_of_symbols(self, symbols: Tuple[str, ...], from_date: datetime, to_date: datetime, interval: str) -> dict[str, Optional[pd.DataFrame]]:
+        """Multi-ticker counterpart of ``_request_history_prices_of``, keyed by the original symbol names."""
+        return YfinanceHandler._in_flight_requests.run(
+            (tuple(symbols), interval, from_date, to_date), self._download_history_prices_of_symbols, symbols, from_date, to_date, interval
+        )
+
+    def _download_history_prices_of(self, symbol: str, from_date: datetime, to_date: datetime, interval: str) -> Optional[pd.DataFrame]:
+        # rewrite symbol name
+        symbol = self._rewrite_symbol_names_for_yfinance(symbol)
+        to_date += timedelta(days=1)
+        data = self._trading_view_handler.fetch_history_data_of(symbol, from_date=from_date, to_date=to_date, interval=interval)
+        if data is None or len(data) == 0:
+            return None
+        # calculate turnover
+        data["turnover"] = data["volume"] * data["close"]
+        return data
+
+    def _download_history_prices_of_symbols(self, symbols: Tuple[str, ...], from_date: datetime, to_date: datetime, interval: str) -> dict[str, Optional[pd.DataFrame]]:
+        upstream_symbols = {self._rewrite_symbol_names_for_yfinance(symbol): symbol for symbol in symbols}
+        frames = self._batch_downloader.download(list(upstream_symbols.keys()), from_date, to_date + timedelta(days=1), interval)
+        results = {}
+        for upstream_symbol, symbol in upstream_symbols.items():
+            data = frames.get(upstream_symbol)
+            if data is not None and len(data) > 0:
+                # calculate turnover
+                data["turnover"] = data["volume"] * data["close"]
+                results[symbol] = data
+        return results
+
+    def _loadCache(self, symbols: List[str], from_date: Optional[datetime] = None, to_date: Optional[datetime] = None) -> LruFrameCache:
+        """Read the cached candles of *symbols* into RAM, using the manifest instead of listing directories.
+
+        When a period is given, symbols whose files do not cover it are left on disk:
+        they have to be fetched anyway and are read only when the fetched rows are merged.
+        """
         for symbol in symbols:
-            symbolLevelCachePath = os.path.join(self.class_cache_folder_path, symbol)
-            if not os.path.exists(symbolLevelCachePath):
+            if from_date is not None and to_date is not None and not self._manifest.covers(symbol, from_date, to_date):
                 continue
-                
-            files = list(filter(lambda x: x.endswith(".csv"), os.listdir(symbolLevelCachePath)))
-            if len(files) == 0:
-                continue
-            
-            # Sort files by modification time (oldest first)
-            if len(files) > 1:
-                files.sort(key=lambda path: self._getSavedTimeFromCacheName(path))
-            # get the latest cache file
-            latestCacheFilePath = os.path.join(symbolLevelCachePath, files[-1])
-
-            symbolCache = self._readFromCache(latestCacheFilePath)
-            if symbolCache is not None and len(symbolCache) > 0:
+            symbolCache = self._readSymbolCache(symbol)
+            if symbolCache is not None:
                 self._cache[symbol] = symbolCache
             
         return self._cache
 
+    def _getCachedDataOf(self, symbol: str, from_date: Optional[datetime] = None, to_date: Optional[datetime] = None) -> Optional[pd.DataFrame]:
+        """Candles of *symbol* from RAM, else loaded from disk (and kept in RAM within the memory budget).
+
+        When a period is given, the disk is only read if the manifest says it covers that period.
+        """
+        cachedData = self._cache.get(symbol)
+        if cachedData is not None:
+            return cachedData
+        if from_date is not None and to_date is not None and not self._manifest.covers(symbol, from_date, to_date):
+            return None
+        cachedData = self._readSymbolCache(symbol)
+        if cachedData is not None:
+            self._cache[symbol] = cachedData
+        return cachedData
+
+    def _readSymbolCache(self, symbol: str) -> Optional[pd.DataFrame]:
+        # the latest full cache file followed by the delta segments appended after it (oldest first)
+        files = self._manifest.getFileNames(symbol)
+        if len(files) == 0:
+            return None
+
+        symbolLevelCachePath = os.path.join(self.class_cache_folder_path, symbol)
+        try:
+            frames = [self._readFromCache(os.path.join(symbolLevelCachePath, file)) for file in files]
+        except FileNotFoundError:
+            # the directory was changed behind the manifest's back (e.g. by a manual clean-up)
+            files = [entry["file"] for entry in self._manifest.refreshSymbol(symbol)]
+            if len(files) == 0:
+                return None
+            frames = [self._readFromCache(os.path.join(symbolLevelCachePath, file)) for file in files]
+        symbolCache = frames[0] if len(frames) == 1 else mergeCacheFrames(frames)
+        if symbolCache is None or len(symbolCache) == 0:
+            return None
+        return toDateIndexedFrame(symbolCache)
+
+    def _getPricePanelStore(self, interval: str) -> PricePanelStore:
+        return PricePanelStore(os.path.join(self.class_cache_folder_path, "_panel", interval))
+
     def _rewrite_symbol_names_for_yfinance(self, symbol: str) -> str:
         # special case symbols
         if symbol == "BRK.B":
@@ -222,36 +495,77 @@ class YfinanceHandler(CacheHandlable):
 
     # MARK: - Shutdown Helper
 
-    def shutdown(self, wait: bool = False):
-        """Cleanly shut down the internal thread pool executor."""
+    def shutdown(self, wait: bool = False, export_metrics: Optional[bool] = None):
+        """Cleanly shut down the internal thread pool executor and persist the cache manifest.
+
+        The fetch metrics are only exported (``exportFetchMetrics``) if *export_metrics*,
+        which defaults to ``CHASEHOUND_EXPORT_FETCH_METRICS`` (off).
+        """
         self._thread_pool_executor.shutdown(wait=wait)
+        self._manifest.save()
+        self.logger.info(f"YfinanceHandler cache stats: {self.getCacheStats()}")
+        if export_metrics is None:
+            export_metrics = os.getenv("CHASEHOUND_EXPORT_FETCH_METRICS", "0") != "0"
+        if export_metrics:
+            self.logger.info(f"YfinanceHandler fetch metrics: {self.getFetchMetrics()} (exported to {self.exportFetchMetrics()})")
 
     # MARK: - Cache Helper
 
     def _readFromCache(self, cache_key: str):
-        data = pd.read_csv(cache_key)
-        # convert the date column to datetime
-        data["date"] = pd.to_datetime(data["date"])
-        return data
+        # csv needs the date column to be parsed, columnar files already store native datetimes
+        return CacheHandlable._readDataFrameFile(cache_key, date_columns=("date",))
 
     def _saveToCache(self, cache_key: str, cache_data):
         # save the dataframe under cache/symbol/cache_key.csv
         if cache_data is None:
             return
             
-        # Extract symbol from cache_key (assuming format: symbol_fromYYYYMMDD_toYYYYMMDD_interval.csv)
+        # Extract symbol from cache_key (assuming format: symbol_fromYYYYMMDD_toYYYYMMDD_interval_atYYYYMMDDHHMMSS.<ext>)
         symbol = cache_key.split('_from')[0]
         symbol_cache_path = os.path.join(self.class_cache_folder_path, symbol)
         if not os.path.exists(symbol_cache_path):
             os.makedirs(symbol_cache_path)
         
         cache_file_path = os.path.join(symbol_cache_path, cache_key)
-        cache_data.to_csv(cache_file_path, index=False)
-        # save to RAM
-        self._cache[symbol] = cache_data
+        CacheHandlable._writeDataFrameFile(cache_file_path, cache_data)
+        self._manifest.recordFile(symbol, cache_key, cache_data)
+        # save to RAM, indexed by date for the binary-search slicing
+        self._cache[symbol] = toDateIndexedFrame(cache_data)
         
-    def __createCacheKey(self, symbol: str, from_date: datetime, to_date: datetime, interval: str) -> str:
-        return f"{symbol}_from{from_date.strftime('%Y%m%d')}_to{to_date.strftime('%Y%m%d')}_{interval}_at{self.latest_absolute_current_time_in_eastern.strftime('%Y%m%d%H%M%S')}.csv"
+    def _appendSegmentToCache(self, symbol: str, changedRows: pd.DataFrame, mergedData: pd.DataFrame, interval: str):
+        """Persist only *changedRows* as a delta segment; *mergedData* becomes the RAM cache.
+
+        Once a symbol has accumulated ``_max_segments_per_symbol`` segments they are folded
+        into a new full file and the superseded files are removed.
+        """
+        symbol_cache_path = os.path.join(self.class_cache_folder_path, symbol)
+        os.makedirs(symbol_cache_path, exist_ok=True)
+        liveFiles = self._manifest.getFileNames(symbol)
+        if len(liveFiles) > self._max_segments_per_symbol:
+            cache_key = self.__createCacheKey(symbol, mergedData["date"].min(), mergedData["date"].max(), interval)
+            self._saveToCache(cache_key, mergedData)
+            for file in os.listdir(symbol_cache_path):
+                if file != cache_key and file.endswith(CacheHandlable.DATAFRAME_EXTENSIONS):
+                    self._remove_file(os.path.join(symbol_cache_path, file))
+            return
+
+        cache_key = self.__createCacheKey(symbol, changedRows["date"].min(), changedRows["date"].max(), interval, suffix=SEGMENT_SUFFIX)
+        segment_path = os.path.join(symbol_cache_path, cache_key)
+        if os.path.exists(segment_path):
+            # a segment with the same name was saved within the same second, keep both deltas
+            changedRows = mergeCacheFrames([self._readFromCache(segment_path), changedRows])
+        CacheHandlable._writeDataFrameFile(segment_path, changedRows)
+        self._manifest.recordFile(symbol, cache_key, changedRows)
+        self._cache[symbol] = toDateIndexedFrame(mergedData)
+
+    def __createCacheKey(self, symbol: str, from_date: datetime, to_date: datetime, interval: str, suffix: str = "") -> str:
+        return f"{symbol}_from{from_date.strftime('%Y%m%d')}_to{to_date.strftime('%Y%m%d')}_{interval}_at{self.latest_absolute_current_time_in_eastern.strftime('%Y%m%d%H%M%S')}{suffix}{self.cache_extension}"
+
+    def _remove_file(self, path: str):
+        try:
+            os.remove(path)
+        except PermissionError:
+            self._handle_remove_readonly(os.remove, path, None)
         
     def _handle_remove_readonly(self, func, path, exc_info):
         try:
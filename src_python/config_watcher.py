@@ -5,6 +5,11 @@ from threading import Thread
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
+from src_python.Submodules import updateSubmodules
+
+if __name__ == "__main__":
+    updateSubmodules()
+
 from src_python.ChaseHoundMain import ChaseHoundMain
 from src_python.config_loader import RunConfig
 
@@ -0,0 +1,69 @@
+import unittest
+import sys
+import os
+import time
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, "src_python"))
+
+from src_python.AsyncFetchEngine import AimdConcurrencyLimit, AsyncFetchEngine
+
+
+class TestAimdConcurrencyLimit(unittest.TestCase):
+
+    def test_additive_increase(self):
+        limit = AimdConcurrencyLimit(initial=4, maximum=8)
+        for i in range(4):
+            limit.onResult(0.1, True, now=float(i))
+        self.assertEqual(limit.current, 4)  # 4 + 4 * (1 / ~4) is just below 5
+        for i in range(6):
+            limit.onResult(0.1, True, now=float(i))
+        self.assertGreaterEqual(limit.current, 5)
+
+    def test_multiplicative_decrease_once_per_latency(self):
+        limit = AimdConcurrencyLimit(initial=8, maximum=8)
+        limit.onResult(1.0, True, now=0.0)
+        limit.onResult(1.0, False, now=10.0)
+        self.assertEqual(limit.current, 4)
+        # errors of requests sent together are only counted once
+        limit.onResult(1.0, False, now=10.1)
+        self.assertEqual(limit.current, 4)
+        # a latency spike is congestion too
+        limit.onResult(5.0, True, now=20.0)
+        self.assertEqual(limit.current, 2)
+
+
+class TestAsyncFetchEngine(unittest.TestCase):
+
+    def test_results_in_request_order_delivered_as_completed(self):
+        def fetch(value, delay):
+            time.sleep(delay)
+            if value == "error":
+                raise RuntimeError("boom")
+            return value
+
+        engine = AsyncFetchEngine(fetch, limit=AimdConcurrencyLimit(initial=4, maximum=4))
+        completion_order = []
+        results = engine.fetchAll(
+            [("slow", 0.2), ("fast", 0.0), ("error", 0.0)],
+            on_result=lambda index, result: completion_order.append(index),
+        )
+        engine.shutdown()
+        self.assertEqual(results, ["slow", "fast", None])
+        self.assertEqual(completion_order[-1], 0)
+        self.assertEqual(engine.getStats()["errors"], 1)
+
+    def test_deadline_abandons_unfinished_requests(self):
+        engine = AsyncFetchEngine(lambda delay: time.sleep(delay) or delay, limit=AimdConcurrencyLimit(initial=2, maximum=2))
+        start_time = time.time()
+        results = engine.fetchAll([(0.0,), (1.0,)], deadline_seconds=0.2)
+        self.assertLess(time.time() - start_time, 0.9)
+        engine.shutdown()
+        self.assertEqual(results, [0.0, None])
+        self.assertEqual(engine.getStats()["timeouts"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
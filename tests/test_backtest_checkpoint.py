@@ -0,0 +1,61 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, "src_python"))
+
+from src_python.BacktestCheckpoint import BacktestCheckpoint
+from src_python.ChaseHoundConfig import ChaseHoundTunableParams
+
+
+class TestBacktestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.run_key = BacktestCheckpoint.hashParams(ChaseHoundTunableParams())
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def write(self, file_name: str, content: str) -> str:
+        path = os.path.join(self.work_dir, file_name)
+        with open(path, "w") as file:
+            file.write(content)
+        return path
+
+    def test_resumed_run_skips_days_whose_files_are_unchanged(self):
+        checkpoint = BacktestCheckpoint(self.work_dir, self.run_key)
+        self.assertFalse(checkpoint.resume("v1"))
+        checkpoint.start("v1")
+        for day, content in ((datetime(2025, 6, 30), "a,b\n1,2\n"), (datetime(2025, 6, 27), "a,b\n3,4\n")):
+            path = self.write(f"{day.strftime('%Y%m%d')}_results.csv", content)
+            # files of a day without rows are not written
+            checkpoint.markDayComplete(day, [path, os.path.join(self.work_dir, "missing.csv")], "v2")
+
+        resumed = BacktestCheckpoint(self.work_dir, self.run_key)
+        self.assertFalse(resumed.resume("v1"))  # the data changed since the last completed day
+        self.assertTrue(resumed.resume("v2"))
+        self.assertEqual(resumed.getCompletedDayCount(), 2)
+        self.assertTrue(resumed.isDayComplete(datetime(2025, 6, 30)))
+        self.assertFalse(resumed.isDayComplete(datetime(2025, 6, 26)))
+        self.write("20250627_results.csv", "a,b\n3,5\n")
+        self.assertFalse(resumed.isDayComplete(datetime(2025, 6, 27)))
+
+    def test_checkpoint_of_other_parameters_is_not_resumed(self):
+        BacktestCheckpoint(self.work_dir, self.run_key).start("v1")
+        params = ChaseHoundTunableParams()
+        params.bestTargetsN = 10
+        other_key = BacktestCheckpoint.hashParams(params)
+        self.assertNotEqual(other_key, self.run_key)
+        self.assertFalse(BacktestCheckpoint(self.work_dir, other_key).resume("v1"))
+        self.assertTrue(BacktestCheckpoint(self.work_dir, self.run_key).resume("v1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
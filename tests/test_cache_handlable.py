@@ -0,0 +1,79 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, "src_python"))
+
+from src_python.CacheHandlable import CacheHandlable
+from src_python.YfinanceCacheTools import migrateCsvTree
+
+
+def make_candles(n: int = 30, start: str = "2024-01-02") -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    close = 100 + rng.standard_normal(n).cumsum()
+    return pd.DataFrame({
+        "date": pd.bdate_range(start, periods=n),
+        "open": close + 0.5,
+        "low": close - 1.0,
+        "high": close + 1.0,
+        "close": close,
+        "volume": rng.integers(1_000, 100_000, n).astype(float),
+        "turnover": close * 1_000,
+    })
+
+
+class TestCacheHandlable(unittest.TestCase):
+
+    def setUp(self):
+        """Create an isolated cache tree for each test."""
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def test_columnar_round_trip_keeps_values(self):
+        """Parquet and Arrow files must load back exactly what was written, with native datetimes."""
+        candles = make_candles()
+        for extension in [".parquet", ".arrow"]:
+            path = os.path.join(self.work_dir, f"AAPL_from20240101_to20240201_1d_at20250101000000{extension}")
+            CacheHandlable._writeDataFrameFile(path, candles)
+            loaded = CacheHandlable._readDataFrameFile(path)
+            self.assertTrue(pd.api.types.is_datetime64_any_dtype(loaded["date"]))
+            self.assertEqual(loaded["volume"].dtype, np.int64)
+            self.assertEqual(loaded["close"].dtype, np.float64)
+            np.testing.assert_array_equal(loaded["close"].to_numpy(), candles["close"].to_numpy())
+            np.testing.assert_array_equal(loaded["volume"].to_numpy(), candles["volume"].to_numpy())
+
+    def test_float32_only_when_lossless(self):
+        """Price columns are narrowed to float32 only if no value changes."""
+        candles = make_candles()
+        candles["open"] = candles["open"].astype(np.float32).astype(np.float64)
+        narrowed = CacheHandlable._toColumnarDtypes(candles)
+        self.assertEqual(narrowed["open"].dtype, np.float32)
+        self.assertEqual(narrowed["close"].dtype, np.float64)
+
+    def test_migrate_csv_tree(self):
+        """The migration converts every csv file and keeps the cache key."""
+        symbol_dir = os.path.join(self.work_dir, "AAPL")
+        os.makedirs(symbol_dir)
+        candles = make_candles()
+        candles.to_csv(os.path.join(symbol_dir, "AAPL_from20240101_to20240201_1d_at20250101000000.csv"), index=False)
+
+        report = migrateCsvTree(self.work_dir, cache_format="parquet")
+
+        self.assertEqual(report["converted"], 1)
+        self.assertEqual(os.listdir(symbol_dir), ["AAPL_from20240101_to20240201_1d_at20250101000000.parquet"])
+        loaded = CacheHandlable._readDataFrameFile(os.path.join(symbol_dir, os.listdir(symbol_dir)[0]))
+        self.assertEqual(len(loaded), len(candles))
+        np.testing.assert_allclose(loaded["close"].to_numpy(), candles["close"].to_numpy())
+
+
+if __name__ == '__main__':
+    unittest.main()
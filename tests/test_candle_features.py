@@ -0,0 +1,109 @@
+import unittest
+import sys
+import os
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, "src_python"))
+
+from src_python.CandleFeatures import CandleFeatures, CandleFeatureStore
+from src_python.YfinanceCacheTools import sliceDateIndexedFrame, toDateIndexedFrame
+
+
+def make_candles(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 50 + np.cumsum(rng.normal(0, 1, n))
+    high = close + rng.uniform(0, 2, n)
+    low = close - rng.uniform(0, 2, n)
+    volume = rng.integers(1_000, 100_000, n)
+    data = pd.DataFrame({
+        "date": pd.bdate_range("2023-01-02", periods=n),
+        "open": close + rng.normal(0, 0.5, n), "low": low, "high": high, "close": close, "volume": volume,
+    })
+    data["turnover"] = data["volume"] * data["close"]
+    # a few missing candles, as in real caches
+    data.loc[[7, 40], ["open", "low", "high", "close", "turnover"]] = np.nan
+    data.loc[60:64, "close"] = data.loc[60, "close"]
+    return toDateIndexedFrame(data)
+
+
+# the running sums of the features start from the first row of the history, not of the window
+RTOL = 1e-9
+
+
+def loop_metrics(window: pd.DataFrame, n: int):
+    # what ChaseHoundMain computed on each sliced window before the features were precomputed
+    previous_close = window["close"].shift(1)
+    true_range = pd.concat([
+        window["high"] - window["low"], (window["high"] - previous_close).abs(), (window["low"] - previous_close).abs(),
+    ], axis=1).max(axis=1)
+    return window["turnover"].tail(n).mean(), true_range.tail(n).mean(), window["close"].tail(n).std()
+
+
+class TestCandleFeatures(unittest.TestCase):
+
+    def test_lookups_match_metrics_of_sliced_windows(self):
+        candles = make_candles(300)
+        features = CandleFeatures(candles)
+        for virtual_date in list(candles.index[::7]) + [candles.index[1], candles.index[-1] + timedelta(days=3)]:
+            from_date, to_date = virtual_date - timedelta(days=60), virtual_date - timedelta(days=1)
+            window = sliceDateIndexedFrame(candles, from_date, to_date)
+            start, end = features.windowOf(from_date, to_date)
+            self.assertEqual(end - start, len(window))
+            if len(window) == 0:
+                continue
+            for n in (1, 5, 20, 60):
+                expected = loop_metrics(window, n)
+                actual = (features.turnoverMean(start, end, n), features.atrMean(start, end, n), features.closeStd(start, end, n))
+                np.testing.assert_allclose(actual, expected, rtol=RTOL, err_msg=f"{virtual_date} n={n}")
+
+            enhanced = window.copy()
+            enhanced["volumeAvg20d"] = enhanced["volume"].rolling(window=20).mean()
+            enhanced["ma_20"] = enhanced["close"].rolling(window=20).mean()
+            pd.testing.assert_frame_equal(features.candlesOf(start, end), enhanced, check_exact=False, rtol=RTOL)
+
+    def test_metrics_match_the_loop_on_large_prices_and_flat_stretches(self):
+        candles = make_candles(400, seed=4)
+        # a price level where differences of running sums lose the low digits, and flat closes
+        for column in ("open", "low", "high", "close"):
+            candles[column] = candles[column] * 1e4 + 3e6
+        candles.iloc[100:140, candles.columns.get_loc("close")] = 3.5e6
+        candles.iloc[250:300, candles.columns.get_loc("close")] = 1234567.891
+        candles["turnover"] = candles["volume"] * candles["close"]
+        features = CandleFeatures(candles)
+        for virtual_date in candles.index[::3]:
+            from_date, to_date = virtual_date - timedelta(days=60), virtual_date - timedelta(days=1)
+            window = sliceDateIndexedFrame(candles, from_date, to_date)
+            start, end = features.windowOf(from_date, to_date)
+            for n in (0, 1, 2, 5, 20, 60):
+                expected = loop_metrics(window, n)
+                actual = (features.turnoverMean(start, end, n), features.atrMean(start, end, n), features.closeStd(start, end, n))
+                np.testing.assert_allclose(actual, expected, rtol=RTOL, err_msg=f"{virtual_date} n={n}")
+
+    def test_window_reads_the_columns_of_the_frame(self):
+        candles = make_candles(120)
+        features = CandleFeatures(candles)
+        for start, end in ((0, 60), (50, 90), (100, 100)):
+            window, frame = features.windowAt(start, end), features.candlesOf(start, end)
+            self.assertEqual(len(window), len(frame))
+            for column in frame.columns:
+                np.testing.assert_array_equal(window[column], frame[column].to_numpy(), err_msg=column)
+            # a view of the shared history, not a copy
+            self.assertTrue(np.shares_memory(window["close"], candles["close"].to_numpy()) or end == start)
+
+    def test_store_rebuilds_only_when_history_changes(self):
+        store = CandleFeatureStore()
+        candles = make_candles(100)
+        first = store.getFeaturesOf("AAPL", candles)
+        self.assertIs(store.getFeaturesOf("AAPL", candles), first)
+        self.assertIsNot(store.getFeaturesOf("AAPL", make_candles(120)), first)
+        self.assertIsNone(store.getFeaturesOf("MSFT", None))
+        self.assertEqual(store.builds, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
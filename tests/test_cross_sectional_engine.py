@@ -0,0 +1,232 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, "src_python"))
+
+from src_python.ChaseHoundConfig import ChaseHoundConfig, ChaseHoundTunableParams
+from src_python.CrossSectionalEngine import CrossSectionalEngine
+from src_python.DailyResultsWriter import DailyResultsWriter
+from src_python.DayArtifactStore import DayArtifactStore
+from src_python.ParallelBacktest import ParallelBacktest
+from src_python.BacktestCheckpoint import BacktestCheckpoint
+from src_python.YfinanceCacheTools import sliceDateIndexedFrame, toDateIndexedFrame
+
+try:
+    from src_python.ChaseHoundMain import ChaseHoundMain
+except ImportError:
+    # the market calendar, yfinance and the LLMTrader submodule are not installed
+    ChaseHoundMain = None
+
+
+CALENDAR = pd.bdate_range("2023-01-02", "2024-03-29")
+# the engine computes the loop's metrics on the panel arrays: running sums and rolling averages may
+# round differently in the last digits, the rows and flags are the same
+RTOL = 1e-9
+
+
+def make_universe(symbol_count: int = 30, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    symbols, market_caps, histories = [], [], {}
+    for i in range(symbol_count + 1):
+        symbol = f"S{i:02d}" if i < symbol_count else "^SPX"
+        dates = CALENDAR
+        if i % 9 == 4:
+            dates = dates[dates >= "2024-01-15"]  # listed during the backtest
+        if i % 11 == 5:
+            dates = dates[dates <= "2024-03-08"]  # delisted during the backtest
+        # a few missing days before the backtest (the loop needs a candle on each backtested day)
+        dates = dates[(rng.random(len(dates)) > 0.03) | (dates >= "2023-12-01")]
+        n = len(dates)
+        close = np.abs(20 + np.cumsum(rng.normal(0.05 * (i % 4), 1, n))) + 1
+        volume = rng.integers(200_000, 3_000_000, n)
+        volume[rng.random(n) < 0.05] *= 4  # volume surges
+        data = pd.DataFrame({
+            "date": dates,
+            "open": close * (1 + rng.normal(0, 0.02, n)), "low": close * 0.97, "high": close * 1.03, "close": close, "volume": volume,
+        })
+        data["turnover"] = data["volume"] * data["close"]
+        # missing candles early in the history
+        data.loc[[10, 11], ["open", "low", "high", "close", "turnover"]] = np.nan
+        histories[symbol] = toDateIndexedFrame(data)
+        if i < symbol_count:
+            symbols.append(symbol)
+            market_caps.append(float(rng.choice([3e7, 2e8, 5e9])))
+    return pd.DataFrame({"symbol": symbols, "marketCap": market_caps}), histories
+
+
+def previous_market_date(virtual_date):
+    return CALENDAR[CALENDAR < virtual_date][-1].to_pydatetime()
+
+
+class InMemorySymbolsHandler:
+    """UsSymbolsHandler of the fixture: its universe, on the business days of CALENDAR."""
+
+    def __init__(self, universe):
+        self.universe = universe
+
+    def getNasdaqSymbols(self):
+        return self.universe
+
+    def getPreviousMarketOpenDate(self, virtual_date):
+        previous_dates = CALENDAR[CALENDAR < virtual_date]
+        return previous_dates[-1].to_pydatetime() if len(previous_dates) > 0 else None
+
+    def doesDateReferToPrediction(self, virtual_date):
+        return False
+
+
+class InMemoryYfinanceHandler:
+    """YfinanceHandler on a secured cache: the fixture's candles, nothing fetched."""
+
+    def __init__(self, histories):
+        self.histories = histories
+
+    def getCachedHistoryOf(self, symbol):
+        return self.histories.get(symbol)
+
+    def loadFromRamOrAsyncFetchHistoryPricesOf(self, symbols, from_date, to_date, interval="1d", shouldAbandonFetching=True):
+        return [self._load(symbol, from_date, to_date) for symbol in symbols]
+
+    def getDataVersion(self):
+        return "fixture"
+
+    def shutdown(self):
+        pass
+
+    def _load(self, symbol, from_date, to_date):
+        # same coverage test as extractNeededDataFromCachedData
+        data = self.histories.get(symbol)
+        if data is None or not (data.index[0] <= from_date and data.index[-1] >= to_date):
+            return None
+        return sliceDateIndexedFrame(data, from_date, to_date)
+
+
+def run_loop(config, universe, histories, virtual_dates, folder_path):
+    """``ChaseHoundMain._runLoop`` over *virtual_dates* on the in-memory handlers, writing into *folder_path*."""
+    config.tunableParams.start_date = min(virtual_dates).strftime("%Y-%m-%d")
+    config.tunableParams.end_date = max(virtual_dates).strftime("%Y-%m-%d")
+    with patch("src_python.ChaseHoundMain.UsSymbolsHandler", return_value=InMemorySymbolsHandler(universe)), \
+            patch("src_python.ChaseHoundMain.YfinanceHandler", return_value=InMemoryYfinanceHandler(histories)):
+        main = ChaseHoundMain(config)
+    main.resultsWriter = DailyResultsWriter(folder_path)
+    os.makedirs(folder_path)
+    main.checkpoint = BacktestCheckpoint(folder_path + "_checkpoint", "loop")
+    main.checkpoint.start(main._dataSnapshot())
+    # no plots
+    with patch.object(main, "_postAnalysisForDay"):
+        main._runLoop()
+
+
+class TestCrossSectionalEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        params = ChaseHoundTunableParams()
+        params.bestTargetsN = 8
+        params.structureConfirmationMaTolerance = 0.9
+        self.config = ChaseHoundConfig(tunableParams=params)
+        self.universe, self.histories = make_universe()
+        self.virtual_dates = [date.to_pydatetime() for date in CALENDAR[-60:][::-1]]
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    @unittest.skipIf(ChaseHoundMain is None, "ChaseHoundMain's dependencies are not installed")
+    def test_writes_the_same_csv_files_as_the_loop(self):
+        loop_folder_path = os.path.join(self.work_dir, "loop")
+        run_loop(self.config, self.universe, self.histories, self.virtual_dates, loop_folder_path)
+
+        engine_writer = DailyResultsWriter(os.path.join(self.work_dir, "vectorized"))
+        os.makedirs(engine_writer.folder_path)
+        engine = CrossSectionalEngine(self.config, self.universe, self.histories)
+        engine.DAYS_PER_BLOCK = 16
+        for day in engine.run(self.virtual_dates, [previous_market_date(date) for date in self.virtual_dates], [True] * len(self.virtual_dates)):
+            engine_writer.writeDay(day)
+
+        file_names = sorted(os.listdir(loop_folder_path))
+        self.assertEqual(sorted(os.listdir(engine_writer.folder_path)), file_names)
+        # the fixture exercises every stage: targets pass all filters on some days
+        self.assertTrue(any(name.endswith("_results.csv") for name in file_names))
+        for file_name in file_names:
+            expected = pd.read_csv(os.path.join(loop_folder_path, file_name))
+            actual = pd.read_csv(os.path.join(engine_writer.folder_path, file_name))
+            pd.testing.assert_frame_equal(actual, expected, check_exact=False, rtol=RTOL, obj=file_name)
+
+    def test_parallel_run_on_the_shared_panel_writes_the_same_files(self):
+        previous_dates = [previous_market_date(date) for date in self.virtual_dates]
+        engine = CrossSectionalEngine(self.config, self.universe, self.histories)
+        serial_writer = DailyResultsWriter(os.path.join(self.work_dir, "serial"))
+        os.makedirs(serial_writer.folder_path)
+        for day in engine.run(self.virtual_dates, previous_dates, [True] * len(self.virtual_dates)):
+            serial_writer.writeDay(day)
+
+        panel_folder_path = os.path.join(self.work_dir, "panel")
+        parallel_folder_path = os.path.join(self.work_dir, "parallel")
+        os.makedirs(parallel_folder_path)
+        summaries = ParallelBacktest(engine, workers=3, panel_folder_path=panel_folder_path).run(
+            self.virtual_dates, previous_dates, [True] * len(self.virtual_dates), parallel_folder_path
+        )
+        self.assertEqual([summary["virtual_date"] for summary in summaries], self.virtual_dates)
+
+        shared = CrossSectionalEngine.openShared(panel_folder_path, self.config)
+        self.assertIsInstance(shared.close, np.memmap)
+        file_names = sorted(os.listdir(serial_writer.folder_path))
+        self.assertEqual(sorted(os.listdir(parallel_folder_path)), file_names)
+        for file_name in file_names:
+            with open(os.path.join(serial_writer.folder_path, file_name)) as expected, open(os.path.join(parallel_folder_path, file_name)) as actual:
+                self.assertEqual(actual.read(), expected.read(), file_name)
+
+    def test_reuses_day_artifacts_across_parameter_sets(self):
+        previous_dates = [previous_market_date(date) for date in self.virtual_dates]
+        fill_performance = [True] * len(self.virtual_dates)
+        artifacts = DayArtifactStore("v1", folder_path=os.path.join(self.work_dir, "artifacts"))
+        loads = []
+
+        def histories():
+            loads.append(1)
+            return self.histories
+
+        def run_into(folder_name, config, engine_artifacts):
+            writer = DailyResultsWriter(os.path.join(self.work_dir, folder_name))
+            os.makedirs(writer.folder_path)
+            engine = CrossSectionalEngine(config, self.universe, histories, artifacts=engine_artifacts)
+            for day in engine.run(self.virtual_dates, previous_dates, fill_performance):
+                writer.writeDay(day)
+            return writer.folder_path
+
+        run_into("first", self.config, artifacts)
+        self.assertEqual(len(loads), 1)
+
+        # only downstream parameters change: every stage is read back, the candles are not loaded
+        params = ChaseHoundTunableParams()
+        params.bestTargetsN = 5
+        params.structureConfirmationMaTolerance = 0.9
+        params.atrSpikeThreshold = 1.2
+        reused_folder_path = run_into("reused", ChaseHoundConfig(tunableParams=params), artifacts)
+        self.assertEqual(len(loads), 1)
+        self.assertEqual(artifacts.getStats()["saves"], 2 * len(self.virtual_dates))
+
+        fresh_folder_path = run_into("fresh", ChaseHoundConfig(tunableParams=params), None)
+        file_names = sorted(os.listdir(fresh_folder_path))
+        self.assertEqual(sorted(os.listdir(reused_folder_path)), file_names)
+        for file_name in file_names:
+            with open(os.path.join(fresh_folder_path, file_name)) as expected, open(os.path.join(reused_folder_path, file_name)) as actual:
+                self.assertEqual(actual.read(), expected.read(), file_name)
+
+        # a right-side parameter only invalidates that stage
+        params.structureConfirmationMaTolerance = 0.95
+        self.assertEqual(artifacts.keyOf("metrics", params), artifacts.keyOf("metrics", self.config.tunableParams))
+        self.assertNotEqual(artifacts.keyOf("rightSide", params), artifacts.keyOf("rightSide", self.config.tunableParams))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, "src_python"))
+
+from src_python.AsyncFetchEngine import AimdConcurrencyLimit, AsyncFetchEngine
+from src_python.FetchPolicies import InFlightRequestTable, NegativeCache, RetryPolicy, TokenBucketRateLimiter
+
+
+class TestFetchPolicies(unittest.TestCase):
+
+    def test_token_bucket_throttles_beyond_burst(self):
+        limiter = TokenBucketRateLimiter(rate_per_second=10, burst=2)
+        waits = [limiter.reserve() for _ in range(4)]
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertAlmostEqual(waits[2], 0.1, delta=0.02)
+        self.assertAlmostEqual(waits[3], 0.2, delta=0.02)
+        self.assertEqual(limiter.getStats()["throttled"], 2)
+        self.assertIs(TokenBucketRateLimiter.getShared("test", 5), TokenBucketRateLimiter.getShared("test", 50))
+
+    def test_retry_delays_are_jittered_and_capped(self):
+        policy = RetryPolicy(max_attempts=5, base_delay=1.0, max_delay=4.0, seed=0)
+        for retry_number, ceiling in [(0, 1.0), (1, 2.0), (2, 4.0), (5, 4.0)]:
+            delay = policy.getDelay(retry_number)
+            self.assertGreaterEqual(delay, ceiling / 2)
+            self.assertLessEqual(delay, ceiling)
+
+    def test_negative_cache_expires(self):
+        cache = NegativeCache(ttl_seconds=0.05)
+        cache.add(("DEAD", "1d"))
+        self.assertTrue(cache.contains(("DEAD", "1d")))
+        time.sleep(0.06)
+        self.assertFalse(cache.contains(("DEAD", "1d")))
+
+    def test_engine_retries_then_negative_caches(self):
+        calls = {"FLAKY": 0, "DEAD": 0}
+
+        def fetch(symbol):
+            calls[symbol] += 1
+            if symbol == "DEAD" or calls[symbol] < 2:
+                raise RuntimeError("429")
+            return symbol
+
+        engine = AsyncFetchEngine(
+            fetch,
+            limit=AimdConcurrencyLimit(initial=2, maximum=2),
+            rate_limiter=TokenBucketRateLimiter(rate_per_second=1000),
+            retry_policy=RetryPolicy(max_attempts=3, base_delay=0.01),
+            negative_cache=NegativeCache(ttl_seconds=60),
+        )
+        self.assertEqual(engine.fetchAll([("FLAKY",), ("DEAD",)]), ["FLAKY", None])
+        self.assertEqual(engine.fetchAll([("DEAD",)]), [None])
+        engine.shutdown()
+
+        self.assertEqual(calls, {"FLAKY": 2, "DEAD": 3})
+        stats = engine.getStats()
+        self.assertEqual((stats["retries"], stats["errors"], stats["negative_cache_skips"]), (3, 1, 1))
+        self.assertEqual(stats["rate_limiter"]["acquired"], 5)
+
+    def test_in_flight_requests_are_coalesced(self):
+        table = InFlightRequestTable()
+        release = threading.Event()
+        calls = []
+
+        def fetch(symbol):
+            calls.append(symbol)
+            release.wait(5)
+            if symbol == "DEAD":
+                raise RuntimeError("404")
+            return {"symbol": symbol}
+
+        results, errors = [], []
+
+        def request(symbol):
+            try:
+                results.append(table.run((symbol, "1d"), fetch, symbol))
+            except RuntimeError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=request, args=(symbol,)) for symbol in ["AAPL"] * 4 + ["DEAD"] * 3]
+        for thread in threads:
+            thread.start()
+        while table.getStats()["calls"] + table.getStats()["coalesced"] < len(threads):
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(calls), ["AAPL", "DEAD"])
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(len(errors), 3)
+        self.assertTrue(all(error is errors[0] for error in errors))
+        self.assertEqual(table.getStats(), {"in_flight": 0, "calls": 2, "coalesced": 5})
+        # nothing is remembered once the call returned
+        self.assertIsNot(table.run(("AAPL", "1d"), fetch, "AAPL"), results[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
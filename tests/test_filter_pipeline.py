@@ -0,0 +1,122 @@
+import unittest
+import sys
+import os
+import numpy as np
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, "src_python"))
+
+from src_python.ChaseHoundConfig import ChaseHoundConfig, ChaseHoundTunableParams
+from src_python.FilterBase import FilterBase
+from src_python.FilterPipeline import FilterPipeline, FilterStage
+from src_python.FilterStages import buildFilterStages
+from src_python.FoundamentalFilters import MarketGapFilter, TurnoverFilter, PriceFilter, LastReportDateFilter
+from src_python.VolatilityFilters import TurnoverSpikeFilter, AtrSpikeFilter, PriceStdSpikeFilter
+from src_python.RightSideFilters import BreakOutDetectionFilter, StructureConfirmationFilter
+from test_filters import make_targets
+
+
+class MarketCapCeilingFilter(FilterBase):
+    FLAG = "isBelowMarketCapCeiling"
+    COLUMNS = ["latestMarketCap"]
+
+    def evaluate(self, table):
+        return np.asarray(table["latestMarketCap"]) < 5e8
+
+
+class TestFilterPipeline(unittest.TestCase):
+
+    def setUp(self):
+        params = ChaseHoundTunableParams()
+        params.structureConfirmationMaTolerance = 0.9
+        params.lowest_market_cap = 1e8
+        self.params = params
+        self.config = ChaseHoundConfig(tunableParams=params)
+
+    def stagesOf(self, vectorizable=True):
+        config = self.config
+        return [
+            FilterStage("foundamentalFilters", [MarketGapFilter(config), TurnoverFilter(config), PriceFilter(config), LastReportDateFilter(config)],
+                        vectorizable=vectorizable),
+            FilterStage("volatilityFilters", [TurnoverSpikeFilter(config), AtrSpikeFilter(config), PriceStdSpikeFilter(config)],
+                        depends_on=["foundamentalFilters"], required_passes=self.params.volatilityFiltersPassingThreshold, records_all_flags=True,
+                        vectorizable=vectorizable),
+            FilterStage("rightSideFilters", [BreakOutDetectionFilter(config), StructureConfirmationFilter(config)],
+                        depends_on=["volatilityFilters"], vectorizable=vectorizable),
+            FilterStage("signalLayers", [], depends_on=["rightSideFilters"]),
+        ]
+
+    def chain(self, targets):
+        # the former run loop: each stage on the survivors of the previous one
+        config = self.config
+        dropped_out_at = {target.symbol: "passedAllFilters" for target in targets}
+        for name, filters in [
+            ("foundamentalFilters", [MarketGapFilter(config), TurnoverFilter(config), PriceFilter(config), LastReportDateFilter(config)]),
+            ("volatilityFilters", [TurnoverSpikeFilter(config), AtrSpikeFilter(config), PriceStdSpikeFilter(config)]),
+            ("rightSideFilters", [BreakOutDetectionFilter(config), StructureConfirmationFilter(config)]),
+        ]:
+            survivors = targets
+            if name == "volatilityFilters":
+                spike_counts = sum(current.recordFlags(targets).astype(int) for current in filters)
+                survivors = [target for target, count in zip(targets, spike_counts) if count >= self.params.volatilityFiltersPassingThreshold]
+            else:
+                for current in filters:
+                    survivors = current.filterTargets(survivors)
+            for target in targets:
+                if target not in survivors:
+                    dropped_out_at[target.symbol] = name
+            targets = survivors
+        return targets, dropped_out_at
+
+    def test_default_stages_match_the_chain(self):
+        for vectorizable in [True, False]:
+            pipeline = FilterPipeline(self.stagesOf(vectorizable))
+            for seed in range(3):
+                expected_targets, targets = make_targets(count=100, seed=seed), make_targets(count=100, seed=seed)
+                expected_passed, expected_dropped_out_at = self.chain(expected_targets)
+
+                result = pipeline.run(targets)
+                self.assertEqual([target.symbol for target in result.passed], [target.symbol for target in expected_passed])
+                self.assertEqual({target.symbol: result.droppedOutAt(target) for target in targets}, expected_dropped_out_at)
+
+                result.exportFlags(targets)
+                by_symbol = {target.symbol: target for target in expected_targets}
+                for target in targets:
+                    self.assertEqual(list(target.additional_info.items()), list(by_symbol[target.symbol].additional_info.items()), target.symbol)
+            # fused into one chain, or not at all
+            self.assertEqual(len(pipeline._chains.get("foundamentalFilters", [])), 4 if vectorizable else 0)
+
+    def test_drop_out_stages_are_the_stage_names(self):
+        pipeline = FilterPipeline(buildFilterStages(self.config))
+        self.assertEqual(pipeline.getDropOutStages(), ["foundamentalFilters", "volatilityFilters", "rightSideFilters", "signalLayers", "passedAllFilters"])
+        result = pipeline.run(make_targets(count=100, seed=1))
+        self.assertLessEqual({result.droppedOutAt(target) for target in result.targets}, set(pipeline.getDropOutStages()))
+
+    def test_added_independent_stage(self):
+        def stagesWithCeiling():
+            stages = self.stagesOf()
+            # next to the volatility filters, both on the targets passing the fundamental ones
+            stages.insert(2, FilterStage("marketCapCeiling", [MarketCapCeilingFilter(self.config)], depends_on=["foundamentalFilters"]))
+            stages[-1].depends_on.append("marketCapCeiling")
+            return stages
+
+        serial = FilterPipeline(stagesWithCeiling(), workers=1)
+        concurrent = FilterPipeline(stagesWithCeiling(), workers=2)
+        self.assertEqual([[stage.name for stage in level] for level in concurrent._levels][1], ["volatilityFilters", "marketCapCeiling"])
+
+        targets = make_targets(count=100, seed=5)
+        serial_result = serial.run(targets)
+        concurrent_result = concurrent.run(make_targets(count=100, seed=5))
+        self.assertEqual([target.symbol for target in serial_result.passed], [target.symbol for target in concurrent_result.passed])
+        self.assertEqual(
+            [serial_result.droppedOutAt(target) for target in serial_result.targets],
+            [concurrent_result.droppedOutAt(target) for target in concurrent_result.targets],
+        )
+        self.assertIn("marketCapCeiling", [serial_result.droppedOutAt(target) for target in targets])
+        self.assertTrue(all(target.latestMarketCap < 5e8 for target in serial_result.passed))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import sys
+import os
+import numpy as np
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, "src_python"))
+
+from src_python.ChaseHoundConfig import ChaseHoundConfig, ChaseHoundTunableParams
+from src_python.FilterScheduler import FilterScheduler, FilterFlagLedger
+from src_python.FoundamentalFilters import MarketGapFilter, TurnoverFilter, PriceFilter, LastReportDateFilter
+from src_python.VolatilityFilters import TurnoverSpikeFilter, AtrSpikeFilter, PriceStdSpikeFilter
+from src_python.RightSideFilters import BreakOutDetectionFilter, StructureConfirmationFilter
+from test_filters import make_targets
+
+
+class TestFilterScheduler(unittest.TestCase):
+
+    def setUp(self):
+        params = ChaseHoundTunableParams()
+        params.structureConfirmationMaTolerance = 0.9
+        # the price filter rejects the most
+        params.lowest_market_cap = 1e8
+        params.lowest_price = 11.0
+        self.params = params
+        config = ChaseHoundConfig(tunableParams=params)
+        self.foundamental_filters = [MarketGapFilter(config), TurnoverFilter(config), PriceFilter(config), LastReportDateFilter(config)]
+        self.volatility_filters = [TurnoverSpikeFilter(config), AtrSpikeFilter(config), PriceStdSpikeFilter(config)]
+        self.right_side_filters = [BreakOutDetectionFilter(config), StructureConfirmationFilter(config)]
+
+    def chain(self, targets):
+        # the unscheduled chain: filters in order, every spike filter on every target
+        for current in self.foundamental_filters:
+            targets = current.filterTargets(targets)
+        spike_counts = sum(current.recordFlags(targets).astype(int) for current in self.volatility_filters)
+        targets = [target for target, count in zip(targets, spike_counts) if count >= self.params.volatilityFiltersPassingThreshold]
+        for current in self.right_side_filters:
+            targets = current.filterTargets(targets)
+        return targets
+
+    def test_exported_flags_match_the_unscheduled_chain(self):
+        schedulers = [
+            (FilterScheduler(self.foundamental_filters), None),
+            (FilterScheduler(self.volatility_filters, records_all_flags=True), self.params.volatilityFiltersPassingThreshold),
+            (FilterScheduler(self.right_side_filters), None),
+        ]
+        for seed in range(4):
+            expected_targets, targets = make_targets(count=120, seed=seed), make_targets(count=120, seed=seed)
+            for pair in zip(expected_targets, targets):
+                for target in pair:
+                    target.additional_info["previousDayTurnoverRanking"] = 1
+            expected_passed = self.chain(expected_targets)
+
+            ledger = FilterFlagLedger(targets)
+            passed = targets
+            for scheduler, required_passes in schedulers:
+                outcome = scheduler.run(passed, required_passes)
+                ledger.addStage(scheduler, outcome)
+                passed = [target for target, didPass in zip(passed, outcome.mask) if didPass]
+            self.assertEqual([target.symbol for target in passed], [target.symbol for target in expected_passed])
+
+            # exported: the passing targets and some others, after keys added later
+            exported = passed + targets[::7]
+            for target in targets:
+                target.additional_info["currentDayClosePrice"] = 1.0
+            for target in expected_targets:
+                target.additional_info["currentDayClosePrice"] = 1.0
+            ledger.export(exported)
+            by_symbol = {target.symbol: target for target in expected_targets}
+            for target in exported:
+                self.assertEqual(list(target.additional_info.items()), list(by_symbol[target.symbol].additional_info.items()), target.symbol)
+
+        # the chains were reordered, and some evaluations skipped
+        self.assertNotEqual(schedulers[0][0].getOrder(), [0, 1, 2, 3])
+        evaluated = sum(stats["evaluated"] for stats in schedulers[0][0].getStats())
+        self.assertLess(evaluated, 4 * 4 * 120)
+
+    def test_k_of_n_vote_stops_once_decided(self):
+        scheduler = FilterScheduler(self.volatility_filters, records_all_flags=True)
+        targets = make_targets(count=50)
+        outcome = scheduler.run(targets, required_passes=1)
+        expected = np.sum([current.evaluate({column: np.array([getattr(t, column) for t in targets]) for column in current.COLUMNS}) for current in self.volatility_filters], axis=0) >= 1
+        self.assertEqual(list(outcome.mask), list(expected))
+        # targets passing the first filter were not evaluated by the others
+        self.assertTrue((outcome.outcomes == -1).any())
+        flags = scheduler.flagsOf(outcome, list(range(len(targets))))
+        self.assertTrue(all(list(row) == [current.FLAG for current in self.volatility_filters] for row in flags))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import unittest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, "src_python"))
+
+from src_python.ChaseHoundConfig import ChaseHoundConfig, ChaseHoundTunableParams
+from src_python.FilterBase import FilterBase
+from src_python.InvestmentTarget import InvestmentTarget
+from src_python.CandleFeatures import CandleFeatures
+from src_python.FoundamentalFilters import MarketGapFilter, TurnoverFilter, PriceFilter, LastReportDateFilter
+from src_python.VolatilityFilters import TurnoverSpikeFilter, AtrSpikeFilter, PriceStdSpikeFilter
+from src_python.RightSideFilters import BreakOutDetectionFilter, StructureConfirmationFilter
+
+
+def make_targets(count: int = 60, seed: int = 3):
+    rng = np.random.default_rng(seed)
+    targets = []
+    for i in range(count):
+        close = 10 * np.exp(np.cumsum(rng.normal(0, 0.03, 40)))
+        candles = pd.DataFrame({
+            "open": close * (1 + rng.normal(0, 0.01, 40)),
+            "close": close,
+            "volume": rng.integers(1_000, 100_000, 40).astype(float),
+        })
+        candles["volumeAvg20d"] = candles["volume"].rolling(window=20).mean()
+        candles["ma_20"] = candles["close"].rolling(window=20).mean()
+        targets.append(InvestmentTarget(
+            symbol=f"S{i}",
+            previousDayClosePrice=float(close[-1]) if i % 7 else float("nan"),
+            previousDayVolume=float(candles["volume"].iloc[-1]),
+            latestMarketCap=float(rng.uniform(1e7, 1e9)),
+            previousDayTurnover=float(rng.uniform(1e6, 5e7)),
+            candles=candles,
+            turnoverShortTerm=float(rng.uniform(0.5, 2)), turnoverLongTerm=1.0 if i % 11 else 0.0,
+            atrShortTerm=float(rng.uniform(0.5, 2)), atrLongTerm=1.0,
+            priceStdShortTerm=float(rng.uniform(0.5, 2)), priceStdLongTerm=1.0,
+        ))
+    return targets
+
+
+def breakout_by_rows(candles, params):
+    # the former BreakOutDetectionFilter.apply
+    for index, raw in candles.iloc[-params.breakoutDetectionDaysLookback:].iterrows():
+        if (raw["close"] > raw["open"]
+                or (raw["close"] - raw["open"]) / raw["open"] >= params.breakoutDetectionPriceRatioThreshold
+                or raw["volume"] > raw["volumeAvg20d"] * params.breakoutDetectionVolumeAugmentationRatioThreshold):
+            return True
+    return False
+
+
+def structure_by_rows(candles, params):
+    # the former StructureConfirmationFilter.apply
+    for index, raw in candles.iloc[-params.structureConfirmationDaysLookback:].iterrows():
+        if raw["close"] < raw["ma_20"] * params.structureConfirmationMaTolerance:
+            return False
+    return True
+
+
+class TestFilters(unittest.TestCase):
+
+    def setUp(self):
+        params = ChaseHoundTunableParams()
+        params.structureConfirmationMaTolerance = 0.9
+        config = ChaseHoundConfig(tunableParams=params)
+        self.filters = [
+            MarketGapFilter(config), TurnoverFilter(config), PriceFilter(config), LastReportDateFilter(config),
+            TurnoverSpikeFilter(config), AtrSpikeFilter(config), PriceStdSpikeFilter(config),
+            BreakOutDetectionFilter(config), StructureConfirmationFilter(config),
+        ]
+
+    def test_batch_matches_the_per_target_adapter(self):
+        batch_targets, single_targets = make_targets(), make_targets()
+        for current in self.filters:
+            mask, flags = current.applyBatch(FilterBase.tableOf(batch_targets, current.COLUMNS))
+            self.assertEqual(list(flags), [current.FLAG])
+            self.assertEqual(list(mask), [current.apply(target) for target in single_targets], current.FLAG)
+            # both outcomes occur on the fixture
+            self.assertTrue(mask.any(), current.FLAG)
+
+    def test_filter_targets_records_flags_of_the_evaluated_targets_only(self):
+        targets = make_targets()
+        passed = self.filters[1].filterTargets(self.filters[0].filterTargets(targets))
+        self.assertTrue(all(target.additional_info["didPassTurnoverFilter"] for target in passed))
+        for target in targets:
+            if not target.additional_info["didPassMarketCapFilter"]:
+                self.assertNotIn("didPassTurnoverFilter", target.additional_info)
+        self.assertEqual(list(targets[0].additional_info), ["didPassMarketCapFilter", "didPassTurnoverFilter"][:len(targets[0].additional_info)])
+
+    def test_right_side_filters_match_the_row_by_row_evaluation(self):
+        targets = make_targets(count=80, seed=5)
+        # short windows, NaN rows, flat candles, zero opens
+        targets[0].candles = targets[0].candles.iloc[:3]
+        targets[1].candles = targets[1].candles.iloc[:0]
+        targets[2].candles.loc[35:, ["open", "close"]] = np.nan
+        targets[3].candles["open"] = targets[3].candles["close"]
+        targets[4].candles.loc[38, "open"] = 0.0
+        for lookback, ratio, volume_ratio, tolerance in ((20, 0.05, 1.5, 0.9), (5, 0.5, 3.0, 0.97), (60, 0.01, 1.0, 1.0), (0, 0.05, 1.5, 0.9)):
+            params = ChaseHoundTunableParams()
+            params.breakoutDetectionDaysLookback = params.structureConfirmationDaysLookback = lookback
+            params.breakoutDetectionPriceRatioThreshold = ratio
+            params.breakoutDetectionVolumeAugmentationRatioThreshold = volume_ratio
+            params.structureConfirmationMaTolerance = tolerance
+            config = ChaseHoundConfig(tunableParams=params)
+            table = FilterBase.tableOf(targets, ["candles"])
+            with np.errstate(invalid="ignore", divide="ignore"):
+                expected_breakout = [breakout_by_rows(target.candles, params) for target in targets]
+            expected_structure = [structure_by_rows(target.candles, params) for target in targets]
+            self.assertEqual(list(BreakOutDetectionFilter(config).evaluate(table)), expected_breakout, lookback)
+            self.assertEqual(list(StructureConfirmationFilter(config).evaluate(table)), expected_structure, lookback)
+            self.assertEqual(BreakOutDetectionFilter(config).apply(targets[5]), expected_breakout[5])
+
+    def test_targets_on_candle_windows_match_targets_owning_their_frame(self):
+        history = make_targets(count=1, seed=7)[0].candles
+        history["high"], history["low"] = history["close"] * 1.01, history["close"] * 0.99
+        history = history.drop(columns=["volumeAvg20d", "ma_20"]).set_index(pd.bdate_range("2024-01-01", periods=len(history)))
+        features = CandleFeatures(history)
+        windows = [(0, 40), (10, 40), (25, 30), (5, 5)]
+        framed = [InvestmentTarget("S", 1.0, 1.0, 1.0, 1.0, features.candlesOf(start, end)) for start, end in windows]
+        windowed = [InvestmentTarget("S", 1.0, 1.0, 1.0, 1.0, candle_window=features.windowAt(start, end)) for start, end in windows]
+        config = ChaseHoundConfig(tunableParams=ChaseHoundTunableParams())
+        for current in (BreakOutDetectionFilter(config), StructureConfirmationFilter(config)):
+            with np.errstate(invalid="ignore", divide="ignore"):
+                self.assertEqual(list(current.recordFlags(windowed)), list(current.recordFlags(framed)))
+        pd.testing.assert_frame_equal(windowed[1].candles, framed[1].candles)
+        # slotted: no instance dict, no logger
+        self.assertFalse(hasattr(windowed[0], "__dict__"))
+        self.assertFalse(hasattr(windowed[0], "logger"))
+
+
+if __name__ == "__main__":
+    unittest.main()
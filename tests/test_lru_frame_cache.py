@@ -0,0 +1,60 @@
+import unittest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, "src_python"))
+
+from src_python.LruFrameCache import LruFrameCache
+
+
+def make_frame(n: int) -> pd.DataFrame:
+    return pd.DataFrame({"date": pd.bdate_range("2024-01-01", periods=n), "close": np.arange(n, dtype=float)})
+
+
+class TestLruFrameCache(unittest.TestCase):
+
+    def test_unbounded_never_evicts(self):
+        cache = LruFrameCache()
+        for i in range(10):
+            cache[f"S{i}"] = make_frame(100)
+        self.assertEqual(len(cache), 10)
+        self.assertEqual(cache.evictions, 0)
+
+    def test_evicts_least_recently_used_within_budget(self):
+        frame_bytes = LruFrameCache.sizeOf(make_frame(100))
+        cache = LruFrameCache(max_bytes=2 * frame_bytes)
+        cache["A"] = make_frame(100)
+        cache["B"] = make_frame(100)
+        cache.get("A")  # A becomes the most recently used
+        cache["C"] = make_frame(100)
+
+        self.assertIn("A", cache)
+        self.assertNotIn("B", cache)
+        self.assertIn("C", cache)
+        self.assertEqual(cache.evictions, 1)
+        self.assertLessEqual(cache.current_bytes, cache.max_bytes)
+
+    def test_oversized_frame_is_kept_alone(self):
+        cache = LruFrameCache(max_bytes=1)
+        cache["A"] = make_frame(10)
+        cache["B"] = make_frame(10)
+        self.assertEqual(list(cache.keys()), ["B"])
+
+    def test_hit_and_miss_counters(self):
+        cache = LruFrameCache()
+        cache["A"] = make_frame(5)
+        self.assertIsNotNone(cache.get("A"))
+        self.assertIsNone(cache.get("B"))
+        stats = cache.getStats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        cache["A"] = make_frame(10)
+        self.assertEqual(cache.current_bytes, LruFrameCache.sizeOf(make_frame(10)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import argparse
+import unittest
+import sys
+import os
+import numpy as np
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, "src_python"))
+
+from src_python.ChaseHoundConfig import ChaseHoundConfig, ChaseHoundTunableParams
+from src_python.CrossSectionalEngine import CrossSectionalEngine
+from src_python.ParameterSweep import ParameterSweep, _parseGridArgument, _parseGridValue
+from test_cross_sectional_engine import CALENDAR, make_universe, previous_market_date
+
+
+class TestParameterSweep(unittest.TestCase):
+
+    def setUp(self):
+        self.universe, self.histories = make_universe()
+        self.virtual_dates = [date.to_pydatetime() for date in CALENDAR[-40:][::-1]]
+        self.previous_dates = [previous_market_date(date) for date in self.virtual_dates]
+        base = ChaseHoundTunableParams()
+        base.structureConfirmationMaTolerance = 0.9
+        self.param_sets = ParameterSweep.expandGrid(
+            {"atrSpikeThreshold": [1.0, 1.2], "volatilityFiltersPassingThreshold": [1, 2], "structureConfirmationMaTolerance": [0.9, 0.95]}, base
+        )
+
+    def summaryOfSingleRun(self, params):
+        engine = CrossSectionalEngine(ChaseHoundConfig(tunableParams=params), self.universe, self.histories)
+        performances = [
+            row["currentDayPriceChangePercentage"]
+            for day in engine.run(self.virtual_dates, self.previous_dates, [True] * len(self.virtual_dates))
+            for row in day.main_rows
+        ]
+        performances = np.array([performance for performance in performances if np.isfinite(performance)])
+        return len(performances), np.count_nonzero(performances > 0), performances.sum()
+
+    def test_summary_matches_separate_runs(self):
+        engine = CrossSectionalEngine(ChaseHoundConfig(tunableParams=ChaseHoundTunableParams()), self.universe, self.histories)
+        engine.DAYS_PER_BLOCK = 16
+        summary = ParameterSweep(engine, self.virtual_dates, self.previous_dates, [True] * len(self.virtual_dates)).run(self.param_sets)
+
+        self.assertEqual(len(summary), 8)
+        self.assertEqual(list(summary["atrSpikeThreshold"]), [1, 1, 1, 1, 1.2, 1.2, 1.2, 1.2])
+        self.assertNotIn("bestTargetsN", summary.columns)
+        self.assertTrue((summary["days"] == len(self.virtual_dates)).all())
+        self.assertGreater(summary["selectedTargets"].max(), 0)
+        for index, params in enumerate(self.param_sets):
+            selected, hits, performance_sum = self.summaryOfSingleRun(params)
+            self.assertEqual(summary["selectedTargets"][index], selected)
+            if selected > 0:
+                self.assertAlmostEqual(summary["hitRate"][index], hits / selected)
+                self.assertAlmostEqual(summary["meanPerformance"][index], performance_sum / selected)
+
+    def test_rejects_parameter_sets_over_different_dates(self):
+        params = ChaseHoundTunableParams()
+        params.start_date = "2025-01-02"
+        with self.assertRaises(ValueError):
+            ParameterSweep(None, [], [], []).run([ChaseHoundTunableParams(), params])
+        with self.assertRaises(ValueError):
+            ParameterSweep.expandGrid({"unknownThreshold": [1]})
+
+    def test_grid_arguments_are_read_as_numbers(self):
+        # annotated float, defaulting to an int
+        self.assertEqual(_parseGridArgument("lowest_market_cap=5e7,1e8,2.5e7"), ("lowest_market_cap", [50000000, 100000000, 25000000]))
+        self.assertEqual(_parseGridArgument("lowest_market_cap=1.5e3")[1], [1500])
+        self.assertEqual(_parseGridArgument("lowest_price=1,2.5")[1], [1.0, 2.5])
+        days = _parseGridArgument("lowest_avg_turnover_days=10,2e1")[1]
+        self.assertEqual(days, [10, 20])
+        self.assertTrue(all(isinstance(value, int) for value in days))
+        self.assertIs(_parseGridValue("flag", True, "False"), False)
+        self.assertIs(_parseGridValue("flag", False, "true"), True)
+        for text in ("lowest_market_cap=big", "unknownThreshold=1", "lowest_price="):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                _parseGridArgument(text)
+        with self.assertRaises(argparse.ArgumentTypeError):
+            _parseGridValue("flag", False, "no")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, "src_python"))
+
+from src_python.PricePanelStore import PricePanelStore
+
+
+def make_candles(dates) -> pd.DataFrame:
+    close = np.arange(len(dates), dtype=float) + 10.0
+    return pd.DataFrame({
+        "date": pd.to_datetime(dates),
+        "open": close - 0.5,
+        "high": close + 1.0,
+        "low": close - 1.0,
+        "close": close,
+        "volume": np.full(len(dates), 1000.0),
+        "turnover": close * 1000.0,
+    })
+
+
+class TestPricePanelStore(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.store = PricePanelStore(os.path.join(self.work_dir, "_panel", "1d"))
+        self.frames = {
+            "AAPL": make_candles(["2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05"]),
+            "MSFT": make_candles(["2024-01-03", "2024-01-05"]),
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def test_build_and_open_memory_mapped(self):
+        """The stored panel is re-opened read-only through a memory map with the same values."""
+        self.store.build(self.frames)
+        panel = self.store.open()
+        self.assertIsInstance(panel.values, np.memmap)
+        self.assertFalse(panel.values.flags.writeable)
+        self.assertEqual(panel.symbols, ["AAPL", "MSFT"])
+        self.assertEqual(panel.values.shape, (2, 4, len(PricePanelStore.DEFAULT_FIELDS)))
+        np.testing.assert_array_equal(panel.field("close")[panel.rowOf("AAPL")], [10.0, 11.0, 12.0, 13.0])
+        np.testing.assert_array_equal(panel.field("close")[panel.rowOf("MSFT")], [np.nan, 10.0, np.nan, 11.0])
+
+    def test_slice_dates_is_zero_copy(self):
+        """Slicing a date window for all symbols shares memory with the full panel."""
+        panel = self.store.build(self.frames)
+        window = panel.sliceDates(datetime(2024, 1, 3), datetime(2024, 1, 4))
+        self.assertEqual(list(window.dates.strftime("%Y-%m-%d")), ["2024-01-03", "2024-01-04"])
+        self.assertTrue(np.shares_memory(window.values, panel.values))
+        np.testing.assert_array_equal(window.field("close")[0], [11.0, 12.0])
+
+    def test_frame_of_drops_missing_days(self):
+        panel = self.store.build(self.frames)
+        frame = panel.frameOf("MSFT")
+        self.assertEqual(len(frame), 2)
+        np.testing.assert_array_equal(frame["close"].to_numpy(), [10.0, 11.0])
+        self.assertIsNone(panel.frameOf("UNKNOWN"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from unittest.mock import patch
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, "src_python"))
+
+from src_python.ChaseHoundConfig import ChaseHoundTunableParams
+from src_python.ResultCache import ResultCache
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.results_dir = os.path.join(self.work_dir, "temp")
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def write_results(self, size: int):
+        os.makedirs(self.results_dir, exist_ok=True)
+        with open(os.path.join(self.results_dir, "20250630_results.csv"), "w") as file:
+            file.write("x" * size)
+
+    def test_key_is_canonical_over_equivalent_parameters(self):
+        params, same = ChaseHoundTunableParams(), ChaseHoundTunableParams()
+        same.volatilityFiltersPassingThreshold = 2.0
+        same.start_date = datetime(2024, 7, 1)
+        self.assertEqual(ResultCache.keyOf(same, "v1"), ResultCache.keyOf(params, "v1"))
+        self.assertNotEqual(ResultCache.keyOf(params, "v2"), ResultCache.keyOf(params, "v1"))
+        same.bestTargetsN = 10
+        self.assertNotEqual(ResultCache.keyOf(same, "v1"), ResultCache.keyOf(params, "v1"))
+
+    def test_hit_restores_the_stored_files(self):
+        cache = ResultCache(os.path.join(self.work_dir, "cache"), max_bytes=10_000, max_age_seconds=60)
+        self.write_results(100)
+        cache.put("a", self.results_dir, metadata={"dataSnapshot": "v1"})
+        shutil.rmtree(self.results_dir)
+        self.assertFalse(cache.restore("b", self.results_dir))
+        self.assertTrue(cache.restore("a", self.results_dir))
+        self.assertEqual(os.listdir(self.results_dir), ["20250630_results.csv"])
+        self.assertEqual(cache.getStats()["hits"], 1)
+        self.assertEqual(cache.getStats()["misses"], 1)
+
+    def test_entries_are_evicted_by_size_then_age(self):
+        # a clock advanced by hand: the access order and the ages do not depend on the machine's timer
+        clock = [1_000.0]
+
+        def tick(seconds: float = 1.0):
+            clock[0] += seconds
+
+        with patch("src_python.ResultCache.time") as time_module:
+            time_module.time.side_effect = lambda: clock[0]
+            cache = ResultCache(os.path.join(self.work_dir, "cache"), max_bytes=2_500, max_age_seconds=60)
+            for key in ("a", "b"):
+                self.write_results(1_000)
+                cache.put(key, self.results_dir)
+                tick()
+            self.assertTrue(cache.restore("a", self.results_dir))  # "b" becomes the least recently used
+            tick()
+            self.write_results(1_000)
+            cache.put("c", self.results_dir)
+            self.assertEqual(cache.keys(), ["a", "c"])
+
+            tick(61)
+            self.assertFalse(cache.restore("a", self.results_dir))
+            cache.put("d", self.results_dir)
+            self.assertEqual(cache.keys(), ["d"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, "src_python"))
+
+from src_python.YfinanceBatchDownloader import YfinanceBatchDownloader
+
+
+def make_download(symbols, n: int) -> pd.DataFrame:
+    """Shape of ``yfinance.download(..., group_by="ticker")``: (ticker, field) columns indexed by date."""
+    dates = pd.DatetimeIndex(pd.bdate_range("2024-01-01", periods=n), name="Date")
+    columns = {}
+    for k, symbol in enumerate(symbols):
+        close = np.arange(n, dtype=float) + 10.0 * (k + 1)
+        for field, values in [("Open", close), ("High", close + 1), ("Low", close - 1), ("Close", close), ("Volume", np.full(n, 1000.0))]:
+            columns[(symbol, field)] = values
+    return pd.DataFrame(columns, index=dates)
+
+
+class TestYfinanceBatchDownloader(unittest.TestCase):
+
+    def test_split_download_matches_upstream_layout(self):
+        downloaded = make_download(["AAA", "BRK-B"], 70)
+        downloaded.loc[downloaded.index[:5], "BRK-B"] = np.nan  # listed later
+
+        aaa = YfinanceBatchDownloader.splitDownload(downloaded, "AAA")
+        self.assertEqual(list(aaa.columns[:6]), ["date", "open", "low", "high", "close", "volume"])
+        self.assertEqual(len(aaa), 70)
+        self.assertEqual(aaa["volume"].dtype, np.int64)
+        self.assertAlmostEqual(aaa["daily_volatility_percentage"].iloc[0], 2 / 10 * 100)
+        self.assertTrue(np.isnan(aaa["20_days_moving_average_of_close_price"].iloc[18]))
+        self.assertAlmostEqual(aaa["20_days_moving_average_of_close_price"].iloc[19], aaa["close"].iloc[:20].mean())
+
+        self.assertEqual(len(YfinanceBatchDownloader.splitDownload(downloaded, "BRK-B")), 65)
+        self.assertIsNone(YfinanceBatchDownloader.splitDownload(downloaded, "MISSING"))
+
+
+if __name__ == "__main__":
+    unittest.main()
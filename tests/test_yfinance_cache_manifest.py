@@ -0,0 +1,97 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, "src_python"))
+
+from src_python.CacheHandlable import CacheHandlable
+from src_python.YfinanceCacheManifest import YfinanceCacheManifest
+
+
+def make_candles(start: str, n: int) -> pd.DataFrame:
+    close = np.arange(n, dtype=float) + 10.0
+    return pd.DataFrame({
+        "date": pd.bdate_range(start, periods=n),
+        "open": close,
+        "close": close,
+        "volume": np.full(n, 1000.0),
+    })
+
+
+class TestYfinanceCacheManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.symbol_dir = os.path.join(self.work_dir, "AAA")
+        os.makedirs(self.symbol_dir)
+        CacheHandlable._writeDataFrameFile(
+            os.path.join(self.symbol_dir, "AAA_from20240101_to20240131_1d_at20250101000000.csv"), make_candles("2024-01-01", 20)
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def test_built_from_tree_and_reloaded(self):
+        manifest = YfinanceCacheManifest(self.work_dir)
+        manifest.ensureLoaded()
+        self.assertTrue(os.path.exists(manifest.path))
+        self.assertEqual(manifest.getEntries("AAA")[0]["rows"], 20)
+        self.assertTrue(manifest.covers("AAA", datetime(2024, 1, 3), datetime(2024, 1, 26)))
+        self.assertFalse(manifest.covers("AAA", datetime(2024, 1, 3), datetime(2024, 2, 26)))
+
+        reloaded = YfinanceCacheManifest(self.work_dir)
+        self.assertTrue(reloaded.load())
+        self.assertEqual(reloaded.getFileNames("AAA"), manifest.getFileNames("AAA"))
+        self.assertEqual(reloaded.getDataVersion(), manifest.getDataVersion())
+
+    def test_record_segment_and_full_file(self):
+        manifest = YfinanceCacheManifest(self.work_dir)
+        version = manifest.getDataVersion()
+
+        segment_name = "AAA_from20240129_to20240209_1d_at20250102000000_seg.csv"
+        segment = make_candles("2024-01-29", 10)
+        CacheHandlable._writeDataFrameFile(os.path.join(self.symbol_dir, segment_name), segment)
+        manifest.recordFile("AAA", segment_name, segment)
+        self.assertEqual(len(manifest.getFileNames("AAA")), 2)
+        self.assertEqual(manifest.getCoverage("AAA"), (datetime(2024, 1, 1), datetime(2024, 2, 9)))
+        self.assertNotEqual(manifest.getDataVersion(), version)
+        self.assertTrue(manifest.is_dirty)
+
+        full_name = "AAA_from20240101_to20240209_1d_at20250103000000.csv"
+        full = make_candles("2024-01-01", 30)
+        CacheHandlable._writeDataFrameFile(os.path.join(self.symbol_dir, full_name), full)
+        manifest.recordFile("AAA", full_name, full)
+        self.assertEqual(manifest.getFileNames("AAA"), [full_name])
+
+    def test_refresh_after_files_changed_on_disk(self):
+        manifest = YfinanceCacheManifest(self.work_dir)
+        manifest.ensureLoaded()
+        shutil.rmtree(self.symbol_dir)
+        self.assertEqual(manifest.refreshSymbol("AAA"), [])
+        self.assertNotIn("AAA", manifest)
+
+    def test_file_rewritten_behind_the_manifest_is_rescanned(self):
+        manifest = YfinanceCacheManifest(self.work_dir)
+        version = manifest.getDataVersion()
+        self.assertEqual(manifest.getCoverage("AAA"), (datetime(2024, 1, 1), datetime(2024, 1, 26)))
+
+        # same file name, other candles: only its size and modification time tell
+        file_path = os.path.join(self.symbol_dir, "AAA_from20240101_to20240131_1d_at20250101000000.csv")
+        CacheHandlable._writeDataFrameFile(file_path, make_candles("2024-01-01", 25))
+        reloaded = YfinanceCacheManifest(self.work_dir)
+        self.assertEqual(reloaded.getCoverage("AAA"), (datetime(2024, 1, 1), datetime(2024, 2, 2)))
+        self.assertEqual(reloaded.getEntries("AAA")[0]["rows"], 25)
+        self.assertNotEqual(reloaded.getDataVersion(), version)
+        self.assertTrue(reloaded.is_dirty)
+
+
+if __name__ == "__main__":
+    unittest.main()
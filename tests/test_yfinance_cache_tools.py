@@ -0,0 +1,138 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, "src_python"))
+
+from src_python.CacheHandlable import CacheHandlable
+from src_python.YfinanceCacheTools import (
+    compactCacheTree,
+    extractChangedRows,
+    getCoverageFromFileNames,
+    getMissingDateRanges,
+    listLiveCacheFiles,
+    parseCacheFileName,
+    readLatestSymbolFrame,
+    sliceDateIndexedFrame,
+    toDateIndexedFrame,
+)
+
+
+def make_candles(start: str, n: int) -> pd.DataFrame:
+    close = np.arange(n, dtype=float) + 10.0
+    return pd.DataFrame({
+        "date": pd.bdate_range(start, periods=n),
+        "open": close,
+        "close": close,
+        "volume": np.full(n, 1000.0),
+    })
+
+
+class TestYfinanceCacheTools(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def test_parse_cache_file_name(self):
+        parsed = parseCacheFileName("BRK.B_from20240101_to20240131_1d_at20250101120000_seg.arrow")
+        self.assertEqual(parsed["symbol"], "BRK.B")
+        self.assertEqual(parsed["from"], datetime(2024, 1, 1))
+        self.assertEqual(parsed["to"], datetime(2024, 1, 31))
+        self.assertTrue(parsed["isSegment"])
+        self.assertIsNone(parseCacheFileName("notes.csv"))
+
+    def test_extract_changed_rows(self):
+        """Only appended or re-adjusted rows go into a delta segment."""
+        candles = make_candles("2024-01-01", 15)
+        cached = candles.iloc[:10]
+        fetched = candles.iloc[5:].copy()
+        fetched.loc[5, "close"] += 1.0  # revised value on an already cached day
+        changed = extractChangedRows(cached, fetched)
+        self.assertEqual(list(changed.index), [5, 10, 11, 12, 13, 14])
+
+    def test_date_indexed_slice_matches_masks(self):
+        shuffled = pd.concat([make_candles("2024-01-01", 40), make_candles("2024-01-15", 5)]).sample(frac=1.0, random_state=0)
+        indexed = toDateIndexedFrame(shuffled)
+        self.assertTrue(indexed.index.is_monotonic_increasing and indexed.index.is_unique)
+        self.assertIs(toDateIndexedFrame(indexed), indexed)
+
+        from_date, to_date = datetime(2024, 1, 6), datetime(2024, 2, 1)
+        sliced = sliceDateIndexedFrame(indexed, from_date, to_date)
+        expected = indexed[(indexed["date"] >= from_date) & (indexed["date"] <= to_date)]
+        pd.testing.assert_frame_equal(sliced, expected)
+
+    def test_missing_date_ranges(self):
+        # head and tail missing
+        self.assertEqual(
+            getMissingDateRanges(datetime(2024, 2, 1), datetime(2024, 7, 5), datetime(2024, 3, 1), datetime(2024, 6, 28)),
+            [(datetime(2024, 2, 1), datetime(2024, 2, 29)), (datetime(2024, 6, 29), datetime(2024, 7, 5))],
+        )
+        # only a weekend is missing: nothing to fetch
+        self.assertEqual(getMissingDateRanges(datetime(2024, 3, 1), datetime(2024, 6, 30), datetime(2024, 3, 1), datetime(2024, 6, 28)), [])
+        # intraday tails restart at the day of the last cached bar
+        self.assertEqual(
+            getMissingDateRanges(datetime(2024, 6, 1), datetime(2024, 6, 28), datetime(2024, 6, 1), datetime(2024, 6, 27, 15), interval="1h"),
+            [(datetime(2024, 6, 27), datetime(2024, 6, 28))],
+        )
+
+    def test_segments_merge_lazily_and_report_coverage(self):
+        """Latest full file + newer segments are merged on read; older files are superseded."""
+        symbol_dir = os.path.join(self.work_dir, "AAPL")
+        os.makedirs(symbol_dir)
+        CacheHandlable._writeDataFrameFile(os.path.join(symbol_dir, "AAPL_from20231201_to20231229_1d_at20240101000000.arrow"), make_candles("2023-12-01", 21))
+        CacheHandlable._writeDataFrameFile(os.path.join(symbol_dir, "AAPL_from20240101_to20240112_1d_at20240201000000.arrow"), make_candles("2024-01-01", 10))
+        CacheHandlable._writeDataFrameFile(os.path.join(symbol_dir, "AAPL_from20240115_to20240119_1d_at20240301000000_seg.arrow"), make_candles("2024-01-15", 5))
+
+        live_files = listLiveCacheFiles(symbol_dir)
+        self.assertEqual(len(live_files), 2)
+        merged = readLatestSymbolFrame(symbol_dir)
+        self.assertEqual(len(merged), 15)
+        self.assertTrue(merged["date"].is_monotonic_increasing)
+        self.assertEqual(getCoverageFromFileNames(live_files), [(datetime(2024, 1, 1), datetime(2024, 1, 12)), (datetime(2024, 1, 15), datetime(2024, 1, 19))])
+
+    def test_compact_cache_tree(self):
+        """Overlapping files collapse into one canonical file holding the union, newest rows first."""
+        symbol_dir = os.path.join(self.work_dir, "AAL")
+        os.makedirs(symbol_dir)
+        older = make_candles("2024-01-01", 20)
+        newer = make_candles("2024-01-15", 20)
+        older.to_csv(os.path.join(symbol_dir, "AAL_from20240101_to20240126_1d_at20240201000000.csv"), index=False)
+        newer.to_csv(os.path.join(symbol_dir, "AAL_from20240115_to20240209_1d_at20240301000000.csv"), index=False)
+
+        report = compactCacheTree(self.work_dir, workers=2)
+
+        self.assertEqual(report["files_before"], 2)
+        self.assertEqual(report["files_after"], 1)
+        self.assertGreater(report["bytes_before"], report["bytes_after"])
+        self.assertEqual(os.listdir(symbol_dir), ["AAL_from20240101_to20240209_1d_at20240301000000.csv"])
+        merged = readLatestSymbolFrame(symbol_dir)
+        self.assertEqual(len(merged), 30)
+        self.assertEqual(merged.set_index("date").loc[newer["date"][0], "close"], newer["close"][0])
+
+    def test_compact_failure_is_reported_and_leaves_the_directory(self):
+        symbol_dir = os.path.join(self.work_dir, "BAD")
+        os.makedirs(symbol_dir)
+        make_candles("2024-01-01", 20).to_csv(os.path.join(symbol_dir, "BAD_from20240101_to20240126_1d_at20240201000000.csv"), index=False)
+        with open(os.path.join(symbol_dir, "BAD_from20240115_to20240209_1d_at20240301000000.csv"), "w") as file:
+            file.write("not,a,candle\n1,2,3\n")
+        files = sorted(os.listdir(symbol_dir))
+
+        report = compactCacheTree(self.work_dir, workers=1)
+
+        self.assertEqual(report["failed"], 1)
+        self.assertEqual(sorted(os.listdir(symbol_dir)), files)
+
+
+if __name__ == '__main__':
+    unittest.main()